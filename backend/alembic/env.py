@@ -6,7 +6,7 @@ from sqlalchemy import pool
 from alembic import context
 from app.core.config import settings
 from app.core.database import Base
-from app.models import User, Dog, DogStatusHistory
+from app.models import User, Dog, DogCard, PhotoVariants, DogStatusHistory
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,35 @@
+"""add keyset pagination indexes
+
+Revision ID: 20fdaee477d3
+Revises: e17b2a4ff9eb
+Create Date: 2026-10-18 11:03:27.184529
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20fdaee477d3'
+down_revision = 'e17b2a4ff9eb'
+branch_labels = None
+depends_on = None
+
+
+# Each index ends in (created_at, id) so keyset pages are a single range scan
+INDEXES = {
+    'idx_dogs_created_id': ['created_at', 'id'],
+    'idx_dogs_status_created_id': ['status', 'created_at', 'id'],
+    'idx_dogs_status_province_created_id': ['status', 'province', 'created_at', 'id'],
+    'idx_dogs_publisher_status_created_id': ['publisher_id', 'status', 'created_at', 'id'],
+}
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'dogs', columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name='dogs', if_exists=True)
@@ -0,0 +1,62 @@
+"""add dogs text search
+
+Revision ID: 3b9d6f2c81a4
+Revises: 20fdaee477d3
+Create Date: 2026-10-18 16:42:09.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9d6f2c81a4'
+down_revision = '20fdaee477d3'
+branch_labels = None
+depends_on = None
+
+
+# Name and breed weigh most, then color, then the description (Spanish stemming)
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('spanish', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('spanish', coalesce(breed, '')), 'A') || "
+    "setweight(to_tsvector('spanish', coalesce(color, '')), 'B') || "
+    "setweight(to_tsvector('spanish', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # SQLite searches with LIKE and needs nothing here
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute(
+        "ALTER TABLE dogs ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+    )
+    op.create_index('idx_dogs_search_vector', 'dogs', ['search_vector'], postgresql_using='gin', if_not_exists=True)
+
+    # Fuzzy breed matching, where the server ships pg_trgm
+    has_trigram = bind.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).first()
+    if has_trigram:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            'idx_dogs_breed_trgm',
+            'dogs',
+            ['breed'],
+            postgresql_using='gin',
+            postgresql_ops={'breed': 'gin_trgm_ops'},
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('idx_dogs_breed_trgm', table_name='dogs', if_exists=True)
+    op.drop_index('idx_dogs_search_vector', table_name='dogs', if_exists=True)
+    op.execute("ALTER TABLE dogs DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,57 @@
+"""app writes dog status history
+
+Revision ID: 5d1c7e9a2b64
+Revises: 8e2f4a7c9d15
+Create Date: 2026-10-18 18:05:41.527113
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1c7e9a2b64'
+down_revision = '8e2f4a7c9d15'
+branch_labels = None
+depends_on = None
+
+
+# Databases created from database/init.sql logged status changes with a trigger.
+# The API now inserts the history rows itself, in the same statement or
+# transaction as the change, so the trigger would record every change twice.
+LOG_STATUS_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION log_dog_status_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF OLD.status IS DISTINCT FROM NEW.status THEN
+        INSERT INTO dog_status_history (dog_id, old_status, new_status)
+        VALUES (NEW.id, OLD.status, NEW.status);
+
+        -- Set adopted_at when status changes to adoptado
+        IF NEW.status = 'adoptado' AND OLD.status != 'adoptado' THEN
+            NEW.adopted_at = NOW();
+        END IF;
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql'
+"""
+
+
+def upgrade() -> None:
+    # Only init.sql databases (PostgreSQL) ever had the trigger
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS log_status_change ON dogs")
+    op.execute("DROP FUNCTION IF EXISTS log_dog_status_change()")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(LOG_STATUS_FUNCTION_SQL)
+    op.execute(
+        "CREATE TRIGGER log_status_change BEFORE UPDATE ON dogs "
+        "FOR EACH ROW EXECUTE FUNCTION log_dog_status_change()"
+    )
@@ -0,0 +1,60 @@
+"""tune dog indexes to query shapes
+
+Revision ID: 8e2f4a7c9d15
+Revises: 3b9d6f2c81a4
+Create Date: 2026-10-18 17:35:51.062447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2f4a7c9d15'
+down_revision = '3b9d6f2c81a4'
+branch_labels = None
+depends_on = None
+
+
+# Shapes benchmarks/explain_plans.py showed scanning far more than they return
+INDEXES = {
+    # GET /users/me/dogs without a status filter
+    'idx_dogs_publisher_created_id': ('dogs', ['publisher_id', 'created_at', 'id'], None),
+    # Radius search of the public listing (bounding box over available dogs only)
+    'idx_dogs_available_location': ('dogs', ['latitude', 'longitude'], "status = 'disponible'"),
+    # GET /dogs/{id}/history, newest first
+    'idx_status_history_dog_changed': ('dog_status_history', ['dog_id', 'changed_at'], None),
+}
+
+# Single-column indexes now covered by the prefix of a composite one.
+# Each still costs a write on every insert and status change.
+REDUNDANT_INDEXES = {
+    'idx_dogs_status': ('dogs', ['status']),
+    'idx_dogs_publisher': ('dogs', ['publisher_id']),
+    'idx_dogs_province': ('dogs', ['province']),
+    'idx_dogs_created_at': ('dogs', ['created_at']),
+    'idx_status_history_dog': ('dog_status_history', ['dog_id']),
+}
+
+
+def upgrade() -> None:
+    for name, (table, columns, where) in INDEXES.items():
+        op.create_index(
+            name,
+            table,
+            columns,
+            postgresql_where=sa.text(where) if where else None,
+            sqlite_where=sa.text(where) if where else None,
+            if_not_exists=True
+        )
+
+    for name, (table, _) in REDUNDANT_INDEXES.items():
+        op.drop_index(name, table_name=table, if_exists=True)
+
+
+def downgrade() -> None:
+    for name, (table, columns) in REDUNDANT_INDEXES.items():
+        op.create_index(name, table, columns, if_not_exists=True)
+
+    for name, (table, _, _) in INDEXES.items():
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,88 @@
+"""add dog_cards read model
+
+Revision ID: 9a4e1c7b3f58
+Revises: 5d1c7e9a2b64
+Create Date: 2026-10-18 18:52:17.304866
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4e1c7b3f58'
+down_revision = '5d1c7e9a2b64'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    'idx_dog_cards_status_created_id': (['status', 'created_at', 'id'], None),
+    'idx_dog_cards_status_province_created_id': (['status', 'province', 'created_at', 'id'], None),
+    'idx_dog_cards_available_location': (['latitude', 'longitude'], "status = 'disponible'"),
+    'idx_dog_cards_publisher': (['publisher_id'], None),
+}
+
+# One card per existing dog; the API keeps them current from here on.
+# Only the first photo and the start of the description differ per dialect.
+BACKFILL_SQL = """
+INSERT INTO dog_cards (
+    id, publisher_id, publisher_name, name, breed, size, gender, age_years, age_months,
+    province, status, photo, summary, latitude, longitude, lat_rad, lon_rad, cos_lat,
+    created_at, updated_at
+)
+SELECT
+    d.id, d.publisher_id, u.name, d.name, d.breed, d.size, d.gender, d.age_years, d.age_months,
+    d.province, d.status, {photo}, {summary}, d.latitude, d.longitude,
+    radians(d.latitude), radians(d.longitude), cos(radians(d.latitude)),
+    d.created_at, d.updated_at
+FROM dogs d
+JOIN users u ON u.id = d.publisher_id
+"""
+
+FIRST_PHOTO = {'postgresql': 'd.photos[1]', 'sqlite': "json_extract(d.photos, '$[0]')"}
+SUMMARY = {'postgresql': 'left(d.description, 160)', 'sqlite': 'substr(d.description, 1, 160)'}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'dog_cards',
+        sa.Column('id', postgresql.UUID(as_uuid=True), sa.ForeignKey('dogs.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('publisher_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('publisher_name', sa.String(255), nullable=False),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('breed', sa.String(100), nullable=False),
+        sa.Column('size', sa.String(20), nullable=False),
+        sa.Column('gender', sa.String(10), nullable=False),
+        sa.Column('age_years', sa.Integer(), nullable=False),
+        sa.Column('age_months', sa.Integer(), nullable=True),
+        sa.Column('province', sa.String(50), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('photo', sa.Text(), nullable=True),
+        sa.Column('summary', sa.String(160), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('lat_rad', sa.Float(), nullable=False),
+        sa.Column('lon_rad', sa.Float(), nullable=False),
+        sa.Column('cos_lat', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+
+    dialect = op.get_bind().dialect.name
+    op.execute(BACKFILL_SQL.format(photo=FIRST_PHOTO[dialect], summary=SUMMARY[dialect]))
+
+    # After the backfill, so it doesn't maintain them row by row
+    for name, (columns, where) in INDEXES.items():
+        op.create_index(
+            name,
+            'dog_cards',
+            columns,
+            postgresql_where=sa.text(where) if where else None,
+            sqlite_where=sa.text(where) if where else None
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('dog_cards')
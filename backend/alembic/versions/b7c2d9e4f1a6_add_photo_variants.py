@@ -0,0 +1,33 @@
+"""add photo_variants
+
+Revision ID: b7c2d9e4f1a6
+Revises: 9a4e1c7b3f58
+Create Date: 2026-10-18 21:07:41.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c2d9e4f1a6'
+down_revision = '9a4e1c7b3f58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Starts empty: photos uploaded before this have no stored variants and
+    # are served as their original URL
+    op.create_table(
+        'photo_variants',
+        sa.Column('photo_url', sa.Text(), primary_key=True),
+        sa.Column('thumb', sa.Text(), nullable=False),
+        sa.Column('card', sa.Text(), nullable=False),
+        sa.Column('full', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('photo_variants')
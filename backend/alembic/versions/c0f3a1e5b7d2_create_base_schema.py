@@ -0,0 +1,85 @@
+"""create base schema
+
+Revision ID: c0f3a1e5b7d2
+Revises:
+Create Date: 2026-10-18 13:05:12.418305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c0f3a1e5b7d2'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The tables as first deployed (database/init.sql or create_all at boot).
+    # Databases that already have them only get the revision recorded.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'users' not in existing:
+        op.create_table(
+            'users',
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column('email', sa.String(255), nullable=False),
+            sa.Column('name', sa.String(255), nullable=False),
+            sa.Column('phone', sa.String(20), nullable=False),
+            sa.Column('location', sa.String(255), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+        )
+        op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    if 'dogs' not in existing:
+        op.create_table(
+            'dogs',
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column('name', sa.String(100), nullable=False),
+            sa.Column('age_years', sa.Integer(), nullable=False),
+            sa.Column('age_months', sa.Integer(), nullable=True),
+            sa.Column('breed', sa.String(100), nullable=False),
+            sa.Column('size', sa.String(20), nullable=False),
+            sa.Column('gender', sa.String(10), nullable=False),
+            sa.Column('color', sa.String(100), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('vaccinated', sa.Boolean(), nullable=True),
+            sa.Column('sterilized', sa.Boolean(), nullable=True),
+            sa.Column('dewormed', sa.Boolean(), nullable=True),
+            sa.Column('special_needs', sa.Text(), nullable=True),
+            sa.Column('latitude', sa.Float(), nullable=False),
+            sa.Column('longitude', sa.Float(), nullable=False),
+            sa.Column('address', sa.Text(), nullable=True),
+            sa.Column('province', sa.String(50), nullable=True),
+            sa.Column('contact_phone', sa.String(20), nullable=False),
+            sa.Column('contact_email', sa.String(255), nullable=True),
+            sa.Column('photos', postgresql.ARRAY(sa.Text()).with_variant(sa.JSON(), 'sqlite'), nullable=False),
+            sa.Column('certificate', sa.Text(), nullable=True),
+            sa.Column('status', sa.String(20), nullable=False),
+            sa.Column('publisher_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('adopted_at', sa.DateTime(), nullable=True),
+            sa.CheckConstraint("status IN ('disponible', 'reservado', 'adoptado')", name='valid_status'),
+        )
+        op.create_index('idx_dogs_status', 'dogs', ['status'])
+        op.create_index('idx_dogs_publisher', 'dogs', ['publisher_id'])
+
+    if 'dog_status_history' not in existing:
+        op.create_table(
+            'dog_status_history',
+            sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column('dog_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('dogs.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('old_status', sa.String(20), nullable=True),
+            sa.Column('new_status', sa.String(20), nullable=False),
+            sa.Column('changed_at', sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('dog_status_history')
+    op.drop_table('dogs')
+    op.drop_table('users')
@@ -0,0 +1,30 @@
+"""add dogs location index
+
+Revision ID: e17b2a4ff9eb
+Revises: c0f3a1e5b7d2
+Create Date: 2026-10-18 09:12:41.503117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e17b2a4ff9eb'
+down_revision = 'c0f3a1e5b7d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Supports the bounding-box prefilter of radius searches in GET /dogs
+    op.create_index(
+        'idx_dogs_location',
+        'dogs',
+        ['latitude', 'longitude'],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_dogs_location', table_name='dogs', if_exists=True)
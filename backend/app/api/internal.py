@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from typing import Optional
+import secrets
+
+from ..core.cache import response_cache
+from ..core.config import settings
+from ..core.database import get_pool_stats
+from ..core.metrics import registry
+from ..core.security import token_cache
+from .v1.auth import user_cache
+
+
+def require_internal_token(x_internal_token: Optional[str] = Header(None)):
+    """
+    Guard internal endpoints with INTERNAL_API_TOKEN. Without a token they
+    are only served in DEBUG; otherwise they answer 404 as if absent.
+    """
+    if not settings.INTERNAL_API_TOKEN:
+        if settings.DEBUG:
+            return
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    if not x_internal_token or not secrets.compare_digest(x_internal_token, settings.INTERNAL_API_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid internal token"
+        )
+
+
+router = APIRouter(
+    prefix="/internal",
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_token)]
+)
+
+
+@router.get("/db-pool")
+async def db_pool_stats():
+    """Connection pool counters and current occupancy"""
+    return get_pool_stats()
+
+
+@router.get("/cache")
+async def cache_stats():
+    """Response cache hit rates and memory use"""
+    return response_cache.stats()
+
+
+@router.get("/auth-cache")
+async def auth_cache_stats():
+    """Hit rates of the verified-token and current-user caches"""
+    return {
+        "tokens": token_cache.stats(),
+        "users": user_cache.stats(),
+    }
+
+
+@router.get("/metrics")
+async def metrics():
+    """Request, DB pool and storage metrics in the Prometheus text format"""
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,21 +1,41 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import make_transient_to_detached
 from datetime import timedelta
 from typing import Optional
+from uuid import UUID
 
+from ...core.cache import TTLCache
 from ...core.database import get_db
 from ...core.config import settings
 from ...core.security import create_access_token, verify_token
 from ...models.user import User
 from ...schemas.auth import Token
 from ...schemas.user import UserCreate, UserResponse
+from ...services.dog_cache import invalidate_publisher
+from ...services.dog_cards import rename_publisher
 
 router = APIRouter()
 security = HTTPBearer()
 
+# Detached User snapshots keyed by id, so authenticated requests skip the lookup
+user_cache = TTLCache(max_entries=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL)
 
-def get_supabase_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+
+def cache_user(user: User):
+    """Store a detached copy so later mutations of `user` never leak into the cache"""
+    snapshot = User(**{column.key: getattr(user, column.key) for column in inspect(User).column_attrs})
+    make_transient_to_detached(snapshot)
+    user_cache.set(user.id, snapshot)
+
+
+def invalidate_cached_user(user_id: UUID):
+    user_cache.delete(user_id)
+
+
+async def get_supabase_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Verify Supabase JWT token and extract user info"""
     token = credentials.credentials
     payload = verify_token(token)
@@ -29,20 +49,30 @@ def get_supabase_user(credentials: HTTPAuthorizationCredentials = Depends(securi
     return payload
 
 
-async def get_current_user(
-    db: Session = Depends(get_db),
-    token_data: dict = Depends(get_supabase_user)
-) -> User:
-    """Get current user from database"""
-    user_id = token_data.get("sub")
-
-    if not user_id:
+def parse_subject(token_data: dict) -> UUID:
+    """Extract the user id from the token's 'sub' claim"""
+    try:
+        return UUID(token_data.get("sub"))
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials"
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
+    token_data: dict = Depends(get_supabase_user)
+) -> User:
+    """Get current user, from the user cache when possible"""
+    user_id = parse_subject(token_data)
+
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        # Attach a copy to this session without a SELECT
+        return await db.merge(cached, load=False)
+
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -50,13 +80,14 @@ async def get_current_user(
             detail="User not found"
         )
 
+    cache_user(user)
     return user
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Register a new user in our database.
@@ -64,7 +95,9 @@ async def register_user(
     This endpoint creates the user profile in our database.
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = (await db.execute(
+        select(User).filter(User.email == user_data.email)
+    )).scalar_one_or_none()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -80,8 +113,8 @@ async def register_user(
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
 
@@ -97,23 +130,24 @@ async def get_current_user_profile(
 @router.post("/sync", response_model=UserResponse)
 async def sync_user_from_supabase(
     user_data: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token_data: dict = Depends(get_supabase_user)
 ):
     """
     Sync user from Supabase Auth to our database.
     Called after successful Supabase authentication.
     """
-    user_id = token_data.get("sub")
+    user_id = parse_subject(token_data)
 
     # Check if user exists
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
 
     if user:
         # Update existing user
         user.name = user_data.name
         user.phone = user_data.phone
         user.location = user_data.location
+        await rename_publisher(db, user.id, user.name)
     else:
         # Create new user with Supabase ID
         user = User(
@@ -125,7 +159,11 @@ async def sync_user_from_supabase(
         )
         db.add(user)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_cached_user(user.id)
+
+    # Cached dog responses embed the publisher's name and contact info
+    await invalidate_publisher(user.id)
 
     return user
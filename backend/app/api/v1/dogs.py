@@ -1,41 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import select
+from pydantic import TypeAdapter
+from typing import Dict, List, Literal, Optional, Union
 from datetime import datetime
-import math
-
-from ...core.database import get_db
+from uuid import UUID
+import orjson
+
+from ...core.cache import CacheEntry, response_cache
+from ...core.config import settings
+from ...core.database import SessionLocal, get_db
+from ...core.http_cache import is_conditional, make_etag, not_modified, not_modified_response, validator_headers
+from ...core.pagination import NEXT_CURSOR_HEADER, apply_keyset, decode_cursor, split_page
 from ...models.user import User
 from ...models.dog import Dog
+from ...models.dog_card import DogCard
 from ...models.status_history import DogStatusHistory
 from ...schemas.dog import (
-    DogCreate, DogUpdate, DogResponse, DogWithPublisher,
-    DogStatusUpdate, DogSearchFilters
+    DogCreate, DogUpdate, DogResponse, DogWithPublisher, DogCardResponse,
+    DogStatusUpdate, DogSearchFilters, DogFacets, DogBatchRequest, DogBatchResponse,
+    DogBulkStatusUpdate, DogBulkStatusResult
+)
+from ...services.dog_cache import (
+    detail_cache_key, facets_cache_key, invalidate_dog, invalidate_dogs, list_cache_key, list_entry_meta
 )
+from ...services.dog_cards import delete_card, update_card, update_card_status
+from ...services.dog_export import EXPORT_MEDIA_TYPES, export_dogs
+from ...services.dog_facets import facet_counts
+from ...services.dog_import import import_dogs, import_format, iter_csv, iter_ndjson
+from ...services.dog_search import DogFilters, dog_state, row_state
+from ...services.dog_writes import change_dogs_status, insert_dog
+from ...services.photo_variants import stored_variants
+from ...services.text_search import search_rank
 from .auth import get_current_user
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 50
 
-def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Calculate distance between two points in kilometers using Haversine formula"""
-    R = 6371  # Earth's radius in kilometers
-
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lon = math.radians(lon2 - lon1)
-
-    a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+# Cached listing and detail bodies are rendered by Pydantic's serializer, not FastAPI's encoder
+dog_page_adapter = TypeAdapter(List[DogWithPublisher])
+dog_detail_adapter = TypeAdapter(DogWithPublisher)
+card_page_adapter = TypeAdapter(List[DogCardResponse])
 
-    return R * c
 
-
-@router.get("/", response_model=List[DogWithPublisher])
-async def get_dogs(
-    db: Session = Depends(get_db),
+def get_dog_filters(
     status_filter: Optional[str] = Query("disponible", description="Filter by status"),
     size: Optional[str] = Query(None, description="Filter by size"),
     gender: Optional[str] = Query(None, description="Filter by gender"),
@@ -44,70 +55,180 @@ async def get_dogs(
     province: Optional[str] = Query(None, description="Filter by province"),
     latitude: Optional[float] = Query(None, description="User latitude for radius search"),
     longitude: Optional[float] = Query(None, description="User longitude for radius search"),
-    radius_km: Optional[float] = Query(None, description="Search radius in kilometers"),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100)
-):
-    """Get all dogs with filters"""
-    query = db.query(Dog)
+    radius_km: Optional[float] = Query(None, gt=0, description="Search radius in kilometers"),
+    q: Optional[str] = Query(None, max_length=200, description="Text search over name, breed, color and description")
+) -> DogFilters:
+    """Listing filters from the query string (empty values mean no filter)"""
+    return DogFilters(
+        status=status_filter or None,
+        size=size or None,
+        gender=gender or None,
+        age_min=age_min,
+        age_max=age_max,
+        province=province or None,
+        latitude=latitude,
+        longitude=longitude,
+        radius_km=radius_km,
+        q=(q or "").strip() or None
+    )
 
-    # Status filter
-    if status_filter:
-        query = query.filter(Dog.status == status_filter)
 
-    # Size filter
-    if size:
-        query = query.filter(Dog.size == size)
+def cached_json_response(entry: CacheEntry, cache_state: str) -> Response:
+    return Response(
+        content=entry.body,
+        media_type="application/json",
+        headers={**entry.headers, "X-Cache": cache_state}
+    )
 
-    # Gender filter
-    if gender:
-        query = query.filter(Dog.gender == gender)
 
-    # Age filter
-    if age_min is not None:
-        query = query.filter(Dog.age_years >= age_min)
+def render_json(content) -> bytes:
+    """Encode plain JSON-ready content (dicts, lists, str, numbers) like ORJSONResponse"""
+    return orjson.dumps(content)
 
-    if age_max is not None:
-        query = query.filter(Dog.age_years <= age_max)
 
-    # Province filter
-    if province:
-        query = query.filter(Dog.province == province)
+def paginate_dogs(query, filters: DogFilters, cursor: Optional[str], skip: int, limit: int, model=Dog):
+    # Paginate after filtering so pages are always full
+    if filters.q:
+        # Best matches first; ranked pages use offsets since a cursor would have to carry the rank
+        return query.order_by(
+            search_rank(filters.q).desc(), model.created_at.desc(), model.id.desc()
+        ).offset(skip).limit(limit + 1)
 
-    # Get all dogs
-    dogs = query.order_by(Dog.created_at.desc()).offset(skip).limit(limit).all()
+    query = apply_keyset(query, model.created_at, model.id, cursor, limit)
+    if skip and not cursor:
+        query = query.offset(skip)
+    return query
 
-    # Filter by radius if coordinates provided
-    if latitude is not None and longitude is not None and radius_km is not None:
-        filtered_dogs = []
-        for dog in dogs:
-            distance = calculate_distance(latitude, longitude, dog.latitude, dog.longitude)
-            if distance <= radius_km:
-                filtered_dogs.append(dog)
-        dogs = filtered_dogs
-
-    # Attach publisher info
-    result = []
-    for dog in dogs:
-        dog_dict = DogResponse.model_validate(dog).model_dump()
-        publisher = db.query(User).filter(User.id == dog.publisher_id).first()
-        dog_dict['publisher'] = {
-            'id': str(publisher.id),
-            'name': publisher.name,
-            'email': publisher.email
-        } if publisher else None
-        result.append(dog_dict)
-
-    return result
 
+def dog_page_etag(rows, has_next_page: bool) -> str:
+    """ETag over (id, updated_at, publisher name, publisher email) of each dog on a page"""
+    return make_etag([tuple(row) for row in rows], has_next_page)
 
-@router.get("/{dog_id}", response_model=DogWithPublisher)
-async def get_dog(
-    dog_id: str,
-    db: Session = Depends(get_db)
-):
-    """Get a specific dog by ID"""
-    dog = db.query(Dog).filter(Dog.id == dog_id).first()
+
+def card_page_etag(rows, has_next_page: bool) -> str:
+    """ETag over (id, updated_at, publisher name) of each card on a page"""
+    return make_etag("card", [tuple(row) for row in rows], has_next_page)
+
+
+def dog_detail_etag(dog_id: UUID, updated_at: datetime, publisher: tuple) -> str:
+    return make_etag(dog_id, updated_at, publisher)
+
+
+async def dog_page_version(db: AsyncSession, filters: DogFilters, cursor: Optional[str], skip: int, limit: int) -> str:
+    """ETag of a listing page from a narrow query (no wide columns, no serialization)"""
+    query = filters.apply(
+        select(Dog.id, Dog.created_at, Dog.updated_at, User.name, User.email)
+        .join(User, Dog.publisher_id == User.id)
+    )
+    rows = (await db.execute(paginate_dogs(query, filters, cursor, skip, limit))).all()
+    page, next_cursor = split_page(rows, limit)
+
+    return dog_page_etag(
+        [(row.id, row.updated_at, row.name, row.email) for row in page],
+        next_cursor is not None
+    )
+
+
+def paginate_cards(columns, filters: DogFilters, cursor: Optional[str], skip: int, limit: int):
+    """
+    Listing select of dog_cards columns. Search pages are ranked and paged on
+    dogs, where the text search index is, before their cards are read.
+    """
+    if filters.q:
+        page = paginate_dogs(
+            filters.apply(select(Dog.id, search_rank(filters.q).label("rank"))), filters, cursor, skip, limit
+        ).subquery()
+        return select(*columns).join(page, page.c.id == DogCard.id).order_by(
+            page.c.rank.desc(), DogCard.created_at.desc(), DogCard.id.desc()
+        )
+    return paginate_dogs(filters.apply(select(*columns), DogCard), filters, cursor, skip, limit, DogCard)
+
+
+async def card_page_version(db: AsyncSession, filters: DogFilters, cursor: Optional[str], skip: int, limit: int) -> str:
+    query = paginate_cards((DogCard.id, DogCard.updated_at, DogCard.publisher_name), filters, cursor, skip, limit)
+    rows = (await db.execute(query)).all()
+    page, next_cursor = split_page(rows, limit)
+    return card_page_etag(page, next_cursor is not None)
+
+
+async def load_dog_page(filters: DogFilters, cursor: Optional[str], skip: int, limit: int) -> CacheEntry:
+    """Run the listing query in its own session (it may outlive the request)"""
+    async with SessionLocal() as db:
+        # Publishers load in one IN (...) query per page; the session identity
+        # map dedupes publishers who list many dogs.
+        query = filters.apply(select(Dog)).options(selectinload(Dog.publisher))
+        query = paginate_dogs(query, filters, cursor, skip, limit)
+
+        dogs, next_cursor = split_page((await db.execute(query)).scalars().all(), limit)
+        variants = await stored_variants(db, (photo for dog in dogs for photo in dog.photos))
+
+    has_next_page = next_cursor is not None
+    if filters.q:
+        # Ranked pages continue with skip and cover no (created_at, id) range
+        next_cursor = None
+
+    etag = dog_page_etag(
+        [(dog.id, dog.updated_at, dog.publisher.name, dog.publisher.email) for dog in dogs],
+        has_next_page
+    )
+    headers = validator_headers(etag)
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return CacheEntry(
+        # One pass from ORM rows to JSON bytes, publisher summary included
+        body=dog_page_adapter.dump_json(
+            dog_page_adapter.validate_python(dogs, context={"photo_variants": variants})
+        ),
+        headers=headers,
+        meta=list_entry_meta(
+            filters,
+            cursor=decode_cursor(cursor) if cursor else None,
+            page_end=(dogs[-1].created_at, dogs[-1].id) if next_cursor else None,
+            dog_ids=[dog.id for dog in dogs],
+            publisher_ids=[dog.publisher_id for dog in dogs]
+        )
+    )
+
+
+async def load_card_page(filters: DogFilters, cursor: Optional[str], skip: int, limit: int) -> CacheEntry:
+    """
+    Listing page read from dog_cards: one query over narrow rows that already
+    carry the publisher's name and the first photo, no users join.
+    """
+    async with SessionLocal() as db:
+        query = paginate_cards((DogCard,), filters, cursor, skip, limit)
+        cards, next_cursor = split_page((await db.execute(query)).scalars().all(), limit)
+
+    has_next_page = next_cursor is not None
+    if filters.q:
+        next_cursor = None
+
+    headers = validator_headers(card_page_etag(
+        [(card.id, card.updated_at, card.publisher_name) for card in cards], has_next_page
+    ))
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return CacheEntry(
+        body=card_page_adapter.dump_json(card_page_adapter.validate_python(cards)),
+        headers=headers,
+        meta=list_entry_meta(
+            filters,
+            cursor=decode_cursor(cursor) if cursor else None,
+            page_end=(cards[-1].created_at, cards[-1].id) if next_cursor else None,
+            dog_ids=[card.id for card in cards],
+            publisher_ids=[card.publisher_id for card in cards]
+        )
+    )
+
+
+async def load_dog_detail(dog_id: UUID) -> CacheEntry:
+    async with SessionLocal() as db:
+        dog = (await db.execute(
+            select(Dog).options(joinedload(Dog.publisher)).filter(Dog.id == dog_id)
+        )).scalar_one_or_none()
+        variants = await stored_variants(db, dog.photos) if dog else {}
 
     if not dog:
         raise HTTPException(
@@ -115,56 +236,348 @@ async def get_dog(
             detail="Dog not found"
         )
 
-    # Attach publisher info
-    dog_dict = DogResponse.model_validate(dog).model_dump()
-    publisher = db.query(User).filter(User.id == dog.publisher_id).first()
-    dog_dict['publisher'] = {
-        'id': str(publisher.id),
-        'name': publisher.name,
-        'email': publisher.email,
-        'phone': publisher.phone
-    } if publisher else None
+    return dog_detail_entry(dog, variants)
+
+
+def dog_detail_entry(dog: Dog, variants: Dict[str, Dict[str, str]]) -> CacheEntry:
+    """Detail response for a dog loaded with its publisher, `variants` from stored_variants"""
+    publisher = dog.publisher
+    etag = dog_detail_etag(dog.id, dog.updated_at, (publisher.name, publisher.email, publisher.phone))
+
+    return CacheEntry(
+        body=dog_detail_adapter.dump_json(
+            dog_detail_adapter.validate_python(dog, context={"include_phone": True, "photo_variants": variants})
+        ),
+        headers=validator_headers(etag, dog.updated_at),
+        meta={"dog_id": dog.id, "updated_at": dog.updated_at, "publisher_ids": {dog.publisher_id}}
+    )
+
+
+async def load_dog_batch(dog_ids: List[UUID]) -> Dict[UUID, CacheEntry]:
+    """
+    Detail entries for the given dogs; unknown ids are left out.
+    Fresh cached details are reused, the rest are loaded in three queries
+    (dogs, their publishers, their photos' stored variants) and cached for GET /dogs/{dog_id}.
+    """
+    entries = {}
+    for dog_id in dog_ids:
+        cached = await response_cache.peek(detail_cache_key(dog_id))
+        if cached:
+            entries[dog_id] = cached
+
+    to_load = [dog_id for dog_id in dog_ids if dog_id not in entries]
+    if to_load:
+        generation = response_cache.generation
+        async with SessionLocal() as db:
+            dogs = (await db.execute(
+                select(Dog).options(selectinload(Dog.publisher)).filter(Dog.id.in_(to_load))
+            )).scalars().all()
+            variants = await stored_variants(db, (photo for dog in dogs for photo in dog.photos))
+
+        for dog in dogs:
+            entry = dog_detail_entry(dog, variants)
+            await response_cache.put(detail_cache_key(dog.id), entry, generation)
+            entries[dog.id] = entry
+    return entries
+
+
+async def dog_batch_response(request: Request, dog_ids: List[UUID]) -> Response:
+    dog_ids = list(dict.fromkeys(dog_ids))
+    if len(dog_ids) > settings.DOG_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.DOG_BATCH_MAX_IDS} ids per batch"
+        )
+
+    entries = await load_dog_batch(dog_ids)
+    found = [entries[dog_id] for dog_id in dog_ids if dog_id in entries]
+    missing = [dog_id for dog_id in dog_ids if dog_id not in entries]
+
+    etag = make_etag([entry.headers["ETag"] for entry in found], missing)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+
+    # Cached detail bodies are spliced in as they are, not decoded and re-encoded
+    body = b'{"dogs":[' + b",".join(entry.body for entry in found) + b'],"missing":' + render_json(missing) + b"}"
+    return Response(content=body, media_type="application/json", headers=validator_headers(etag))
+
+
+async def load_dog_facets(filters: DogFilters) -> CacheEntry:
+    async with SessionLocal() as db:
+        facets = await facet_counts(db, filters)
+
+    body = render_json(facets)
+    return CacheEntry(
+        body=body,
+        headers=validator_headers(make_etag(body)),
+        meta={"filters": filters}
+    )
+
+
+# Listing views: page loader and conditional-request version query of each
+LISTING_VIEWS = {"full": load_dog_page, "card": load_card_page}
+PAGE_VERSIONS = {"full": dog_page_version, "card": card_page_version}
+
+
+async def warm_dog_caches():
+    """Readiness: load the landing page of the listing (both views) and its facets before traffic arrives"""
+    filters = DogFilters()
+    for view, load_page in LISTING_VIEWS.items():
+        await response_cache.get_or_load(
+            list_cache_key(filters, None, 0, DEFAULT_PAGE_SIZE, view),
+            lambda: load_page(filters, None, 0, DEFAULT_PAGE_SIZE)
+        )
+    await response_cache.get_or_load(facets_cache_key(filters), lambda: load_dog_facets(filters))
+
+
+@router.get("/", response_model=Union[List[DogWithPublisher], List[DogCardResponse]])
+async def get_dogs(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    filters: DogFilters = Depends(get_dog_filters),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    skip: int = Query(0, ge=0, description="Offset pagination (deprecated, ignored when cursor is given)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    view: Literal["full", "card"] = Query("full", description="full dogs with their publisher, or compact listing cards")
+):
+    """
+    Get all dogs with filters.
+    view=card returns only what a listing card shows (first photo and its
+    thumbnail, start of the description, publisher name), read from the
+    dog_cards table without joining users.
+    Pages are ordered newest first; the X-Next-Cursor response header
+    holds the cursor for the next page and is absent on the last one.
+    Responses are cached and invalidated when matching dogs change, and
+    carry an ETag; If-None-Match revalidations cost one narrow version
+    query (or none while the cached page is fresh).
+    With `q`, results are ordered by relevance and paged with `skip`.
+    """
+    if cursor and filters.q:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search results are paged with skip, not cursor"
+        )
+    if cursor:
+        decode_cursor(cursor)  # reject malformed cursors before touching the cache
+        skip = 0
+
+    key = list_cache_key(filters, cursor, skip, limit, view)
+
+    if is_conditional(request):
+        cached = await response_cache.peek(key)
+        etag = cached.headers["ETag"] if cached else await PAGE_VERSIONS[view](db, filters, cursor, skip, limit)
+        if not_modified(request, etag):
+            return not_modified_response(etag)
+
+    entry, cache_state = await response_cache.get_or_load(
+        key,
+        lambda: LISTING_VIEWS[view](filters, cursor, skip, limit)
+    )
+    return cached_json_response(entry, cache_state)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}}},
+)
+async def export_dogs_stream(
+    request: Request,
+    filters: DogFilters = Depends(get_dog_filters),
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson (one listing object per line) or csv")
+):
+    """
+    Export every dog matching the listing filters in one response, newest first.
+    Rows are streamed from a server-side cursor, so memory stays flat however
+    many dogs match. Gzip-compressed when the client sends Accept-Encoding: gzip.
+    """
+    gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+    headers = {
+        "Content-Disposition": f'attachment; filename="dogs.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        export_dogs(filters, format, gzip=gzip),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers
+    )
+
+
+@router.get("/facets", response_model=DogFacets)
+async def get_dog_facets(
+    request: Request,
+    filters: DogFilters = Depends(get_dog_filters)
+):
+    """
+    Counts per size, gender, province and age bucket of the dogs matching the
+    listing filters, for the search sidebar. Cached like the listing and
+    invalidated when a matching dog is created, edited or changes status.
+    """
+    entry, cache_state = await response_cache.get_or_load(
+        facets_cache_key(filters),
+        lambda: load_dog_facets(filters)
+    )
+    if not_modified(request, entry.headers["ETag"]):
+        return not_modified_response(entry.headers["ETag"])
+    return cached_json_response(entry, cache_state)
+
+
+@router.get("/batch", response_model=DogBatchResponse)
+async def get_dogs_batch(
+    request: Request,
+    ids: str = Query(..., description="Comma-separated dog ids; use POST /dogs/batch for lists too long for a URL")
+):
+    """
+    Several dogs with their publisher, as GET /dogs/{dog_id} returns them,
+    in the requested order. Ids that do not exist are listed in `missing`.
+    """
+    try:
+        # Tolerates spaces after commas and empty items (a trailing comma)
+        dog_ids = [UUID(dog_id) for dog_id in map(str.strip, ids.split(",")) if dog_id]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be comma-separated dog ids"
+        )
+    return await dog_batch_response(request, dog_ids)
+
 
-    return dog_dict
+@router.post("/batch", response_model=DogBatchResponse)
+async def post_dogs_batch(request: Request, batch: DogBatchRequest):
+    """Same as GET /dogs/batch, with the ids in the body"""
+    return await dog_batch_response(request, batch.ids)
+
+
+@router.get("/{dog_id}", response_model=DogWithPublisher)
+async def get_dog(
+    dog_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a specific dog by ID (supports If-None-Match / If-Modified-Since)"""
+    key = detail_cache_key(dog_id)
+
+    if is_conditional(request):
+        cached = await response_cache.peek(key)
+        if cached:
+            etag = cached.headers["ETag"]
+            updated_at = cached.meta["updated_at"]
+        else:
+            version = (await db.execute(
+                select(Dog.updated_at, User.name, User.email, User.phone)
+                .join(User, Dog.publisher_id == User.id)
+                .filter(Dog.id == dog_id)
+            )).first()
+            etag = dog_detail_etag(dog_id, version.updated_at, tuple(version[1:])) if version else None
+            updated_at = version.updated_at if version else None
+
+        if etag and not_modified(request, etag, updated_at):
+            return not_modified_response(etag, updated_at)
+
+    entry, cache_state = await response_cache.get_or_load(
+        key,
+        lambda: load_dog_detail(dog_id)
+    )
+    return cached_json_response(entry, cache_state)
 
 
 @router.post("/", response_model=DogResponse, status_code=status.HTTP_201_CREATED)
 async def create_dog(
     dog_data: DogCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Create a new dog listing"""
-    new_dog = Dog(
-        **dog_data.model_dump(),
-        publisher_id=current_user.id
-    )
+    """Create a new dog listing (one transaction with its initial status history and listing card)"""
+    new_dog = await insert_dog(db, dog_data, current_user.id, current_user.name)
+    await db.commit()
 
-    db.add(new_dog)
-    db.commit()
-    db.refresh(new_dog)
-
-    # Create initial status history
-    status_history = DogStatusHistory(
-        dog_id=new_dog.id,
-        old_status=None,
-        new_status='disponible'
-    )
-    db.add(status_history)
-    db.commit()
+    await invalidate_dog(new_dog["id"], row_state(new_dog))
 
     return new_dog
 
 
+@router.post(
+    "/import",
+    response_model=dict,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_dogs_bulk(
+    request: Request,
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Defaults to the request's Content-Type"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Bulk-create dog listings from a CSV (header row of DogCreate fields,
+    photo URLs separated by '|') or NDJSON (one DogCreate object per line) body.
+    Valid rows are inserted in batches; the response lists the rows that failed.
+    """
+    import_as = import_format(request.headers.get("content-type"), format)
+    if import_as is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson"
+        )
+
+    records = iter_csv(request.stream()) if import_as == "csv" else iter_ndjson(request.stream())
+    report = await import_dogs(db, records, current_user.id, current_user.name)
+    return report.as_dict()
+
+
+@router.patch("/status", response_model=DogBulkStatusResult)
+async def update_dogs_status(
+    status_data: DogBulkStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Change the status of many of your dogs at once (e.g. a shelter's adoption day).
+    Unknown ids, other publishers' dogs and adopted dogs are listed in `rejected`;
+    the rest change together in one transaction, with their status history.
+    """
+    if len(status_data.ids) > settings.STATUS_BULK_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.STATUS_BULK_MAX_IDS} ids per request"
+        )
+
+    change = await change_dogs_status(db, status_data.ids, status_data.status, current_user.id)
+    await db.commit()
+
+    if change.updated:
+        old_states = [{**row_state(row), "status": change.old_status[row["id"]]} for row in change.updated]
+        await invalidate_dogs(
+            (row["id"] for row in change.updated),
+            [*old_states, *(row_state(row) for row in change.updated)]
+        )
+
+    return {
+        "updated": [row["id"] for row in change.updated],
+        "unchanged": change.unchanged,
+        "rejected": change.rejected,
+    }
+
+
 @router.put("/{dog_id}", response_model=DogResponse)
 async def update_dog(
-    dog_id: str,
+    dog_id: UUID,
     dog_data: DogUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update a dog listing"""
-    dog = db.query(Dog).filter(Dog.id == dog_id).first()
+    dog = await db.get(Dog, dog_id)
 
     if not dog:
         raise HTTPException(
@@ -179,26 +592,32 @@ async def update_dog(
             detail="Not authorized to update this dog"
         )
 
+    old_state = dog_state(dog)
+
     # Update fields
     update_data = dog_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(dog, field, value)
 
-    db.commit()
-    db.refresh(dog)
+    await db.flush()
+    await update_card(db, dog)
+    await db.commit()
+    await db.refresh(dog)
+
+    await invalidate_dog(dog.id, old_state, dog_state(dog))
 
     return dog
 
 
 @router.patch("/{dog_id}/status", response_model=DogResponse)
 async def update_dog_status(
-    dog_id: str,
+    dog_id: UUID,
     status_data: DogStatusUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update dog status"""
-    dog = db.query(Dog).filter(Dog.id == dog_id).first()
+    dog = await db.get(Dog, dog_id)
 
     if not dog:
         raise HTTPException(
@@ -220,28 +639,34 @@ async def update_dog_status(
             detail="Cannot change status of adopted dog"
         )
 
-    old_status = dog.status
+    old_state = dog_state(dog)
+    if status_data.status != dog.status:
+        # History is written here, in the same transaction as the change
+        db.add(DogStatusHistory(dog_id=dog.id, old_status=dog.status, new_status=status_data.status))
     dog.status = status_data.status
 
     # Set adopted_at timestamp
     if status_data.status == 'adoptado':
         dog.adopted_at = datetime.utcnow()
 
-    # The trigger will automatically log the status change
-    db.commit()
-    db.refresh(dog)
+    await db.flush()
+    await update_card_status(db, [dog.id], dog.status)
+    await db.commit()
+    await db.refresh(dog)
+
+    await invalidate_dog(dog.id, old_state, dog_state(dog))
 
     return dog
 
 
 @router.delete("/{dog_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_dog(
-    dog_id: str,
-    db: Session = Depends(get_db),
+    dog_id: UUID,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete a dog listing"""
-    dog = db.query(Dog).filter(Dog.id == dog_id).first()
+    dog = await db.get(Dog, dog_id)
 
     if not dog:
         raise HTTPException(
@@ -256,19 +681,24 @@ async def delete_dog(
             detail="Not authorized to delete this dog"
         )
 
-    db.delete(dog)
-    db.commit()
+    old_state = dog_state(dog)
+
+    await delete_card(db, dog_id)
+    await db.delete(dog)
+    await db.commit()
+
+    await invalidate_dog(dog_id, old_state)
 
     return None
 
 
 @router.get("/{dog_id}/history", response_model=List[dict])
 async def get_dog_status_history(
-    dog_id: str,
-    db: Session = Depends(get_db)
+    dog_id: UUID,
+    db: AsyncSession = Depends(get_db)
 ):
     """Get status change history for a dog"""
-    dog = db.query(Dog).filter(Dog.id == dog_id).first()
+    dog = await db.get(Dog, dog_id)
 
     if not dog:
         raise HTTPException(
@@ -276,9 +706,11 @@ async def get_dog_status_history(
             detail="Dog not found"
         )
 
-    history = db.query(DogStatusHistory).filter(
-        DogStatusHistory.dog_id == dog_id
-    ).order_by(DogStatusHistory.changed_at.desc()).all()
+    history = (await db.execute(
+        select(DogStatusHistory).filter(
+            DogStatusHistory.dog_id == dog_id
+        ).order_by(DogStatusHistory.changed_at.desc())
+    )).scalars().all()
 
     return [
         {
@@ -1,35 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status, UploadFile, File
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+import asyncio
+import logging
+import os
 import uuid
 from pathlib import Path
 
 from ...core.config import settings
+from ...core.database import get_db
+from ...models.dog import Dog
 from ...models.user import User
-from ...services.storage import storage_service
+from ...services.images import VARIANT_FORMATS, get_image_pool, render_variants, variant_file_name, variant_urls
+from ...services.dog_cache import invalidate_publisher
+from ...services.photo_variants import forget_variants, record_variants
+from ...services.storage import SpooledFile, StorageExists, content_key, storage_service
+from ...services.upload_stream import IMAGE, PDF, LimitedUploadRoute, open_upload
 from .auth import get_current_user
 
-router = APIRouter()
+logger = logging.getLogger("app.uploads")
+
+router = APIRouter(route_class=LimitedUploadRoute)
 
 
 ALLOWED_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
 ALLOWED_DOCUMENT_EXTENSIONS = {'.pdf'}
 
-
-def validate_file_size(file: UploadFile, max_size: int):
-    """Validate file size"""
-    file.file.seek(0, 2)  # Seek to end
-    file_size = file.file.tell()  # Get position (file size)
-    file.file.seek(0)  # Reset to beginning
-
-    if file_size > max_size:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File size exceeds maximum allowed size of {max_size / (1024 * 1024)}MB"
-        )
+PHOTO_FOLDER = "dogs/photos"
 
 
 def validate_image_file(file: UploadFile):
-    """Validate image file type and size"""
+    """Validate image file name and declared type (content and size are checked while streaming)"""
     # Check file extension
     file_ext = Path(file.filename).suffix.lower()
     if file_ext not in ALLOWED_IMAGE_EXTENSIONS:
@@ -45,12 +48,9 @@ def validate_image_file(file: UploadFile):
             detail=f"Invalid content type. Must be an image."
         )
 
-    # Check file size
-    validate_file_size(file, settings.MAX_UPLOAD_SIZE)
-
 
 def validate_pdf_file(file: UploadFile):
-    """Validate PDF file type and size"""
+    """Validate PDF file name and declared type (content and size are checked while streaming)"""
     # Check file extension
     file_ext = Path(file.filename).suffix.lower()
     if file_ext not in ALLOWED_DOCUMENT_EXTENSIONS:
@@ -66,32 +66,129 @@ def validate_pdf_file(file: UploadFile):
             detail="Invalid content type. Must be a PDF document."
         )
 
-    # Check file size (10MB for PDFs)
-    validate_file_size(file, 10 * 1024 * 1024)
+
+async def store_photo(file: UploadFile, owner: UUID) -> Tuple[Optional[str], Optional[SpooledFile], str, bool]:
+    """
+    Validate, spool and upload one photo under a content-addressed name in the owner's folder.
+    Returns (url, spooled file, filename, created); the spool is kept for the variant task.
+    `created` is False for a re-upload, whose object (and URL) was already stored.
+    """
+    validate_image_file(file)
+
+    # Sniff the real type, then stream to disk (hashing it) and on to storage
+    content_type, chunks = await open_upload(file, IMAGE)
+    spooled = await storage_service.spool(chunks)
+    file_name = content_key(owner, spooled.digest, Path(file.filename).suffix.lower())
+    created = True
+    try:
+        file_url = await storage_service.upload_spooled(
+            spooled,
+            file_name=file_name,
+            content_type=content_type,
+            folder=PHOTO_FOLDER,
+            overwrite=False
+        )
+    except StorageExists:
+        # Same bytes as an earlier upload: its object, under the URL already handed out
+        file_url, created = storage_service.public_url(f"{PHOTO_FOLDER}/{file_name}"), False
+    except BaseException:
+        os.unlink(spooled.path)
+        raise
+
+    return file_url, spooled, file_name, created
+
+
+async def generate_variants(source_path: str, file_name: str, file_url: str, owner: UUID, folder: str = PHOTO_FOLDER):
+    """
+    Background task: render the derivatives of an uploaded photo, store them
+    next to the original and record them, so responses link them from now on.
+    Removes `source_path` when done.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+        variants = await loop.run_in_executor(
+            get_image_pool(),
+            render_variants,
+            source_path,
+            settings.IMAGE_VARIANT_FORMAT,
+            settings.IMAGE_VARIANT_QUALITY,
+        )
+
+        _, content_type = VARIANT_FORMATS[settings.IMAGE_VARIANT_FORMAT]
+        urls = await asyncio.gather(*[
+            storage_service.upload_file(
+                file_content=content,
+                file_name=variant_file_name(file_name, variant),
+                content_type=content_type,
+                folder=folder
+            )
+            for variant, content in variants.items()
+        ])
+        if None in urls:
+            logger.warning("Image variants of %s were not all stored; serving the original", file_url)
+            return
+
+        await record_variants(file_url, dict(zip(variants, urls)))
+        # Cached dog responses of the uploader may list this photo without its variants
+        await invalidate_publisher(owner)
+    except Exception:
+        logger.exception("Error generating image variants of %s", file_url)
+    finally:
+        os.unlink(source_path)
+
+
+def finish_photo(
+    background_tasks: BackgroundTasks,
+    spooled: Optional[SpooledFile],
+    file_name: str,
+    file_url: Optional[str],
+    owner: UUID
+):
+    """Render variants of a kept photo after the response is sent, or drop its spool"""
+    if spooled is None:
+        return
+    if file_url and settings.IMAGE_VARIANTS_ENABLED:
+        background_tasks.add_task(generate_variants, spooled.path, file_name, file_url, owner)
+    else:
+        os.unlink(spooled.path)
+
+
+def photo_variants(file_url: str) -> Optional[dict]:
+    return variant_urls(file_url) if settings.IMAGE_VARIANTS_ENABLED else None
+
+
+def with_variants(file_urls: Iterable[str]) -> List[str]:
+    """Photos and their rendered variants, for deletion (variants that were never rendered are ignored)"""
+    return [url for file_url in file_urls for url in (file_url, *variant_urls(file_url).values())]
+
+
+async def photos_in_use(db: AsyncSession, publisher_id: UUID, file_urls: Iterable[str]) -> Set[str]:
+    """
+    Which of the given photos one of the publisher's dogs shows, compared by
+    storage key so differently spelled URLs of one object match.
+    Photo keys are content-addressed per uploader, so a re-upload returns
+    the URL of a photo their listings may already use.
+    """
+    by_key = {storage_service.key_from_url(file_url): file_url for file_url in file_urls}
+    by_key.pop(None, None)
+    used = set()
+    for photos in (await db.execute(select(Dog.photos).where(Dog.publisher_id == publisher_id))).scalars():
+        for photo in photos:
+            key = storage_service.key_from_url(photo)
+            if key in by_key:
+                used.add(by_key[key])
+    return used
 
 
 @router.post("/photo", response_model=dict)
 async def upload_photo(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user)
 ):
-    """Upload a dog photo"""
-    validate_image_file(file)
-
-    # Generate unique filename
-    file_ext = Path(file.filename).suffix.lower()
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-
-    # Read file content
-    file_content = await file.read()
-
-    # Upload to Supabase Storage
-    file_url = await storage_service.upload_file(
-        file_content=file_content,
-        file_name=unique_filename,
-        content_type=file.content_type,
-        folder="dogs/photos"
-    )
+    """Upload a dog photo; thumb/card/full variants are rendered in the background (their URLs 404 until then)"""
+    file_url, spooled, file_name, _ = await store_photo(file, current_user.id)
+    finish_photo(background_tasks, spooled, file_name, file_url, current_user.id)
 
     if not file_url:
         raise HTTPException(
@@ -101,54 +198,93 @@ async def upload_photo(
 
     return {
         "url": file_url,
-        "filename": unique_filename
+        "filename": file_name,
+        "variants": photo_variants(file_url)
     }
 
 
+async def upload_photo_file(
+    file: UploadFile, owner: UUID, semaphore: asyncio.Semaphore
+) -> Tuple[dict, Optional[SpooledFile], Optional[str], bool]:
+    """
+    Upload one photo of a batch, reporting failure instead of raising;
+    returns (result, spooled file, stored name, created) as store_photo does.
+    """
+    result = {"filename": file.filename, "status": "failed", "url": None, "error": None, "status_code": None}
+
+    async with semaphore:
+        try:
+            file_url, spooled, file_name, created = await store_photo(file, owner)
+        except HTTPException as e:
+            result["error"] = e.detail
+            result["status_code"] = e.status_code
+            return result, None, None, False
+
+    if not file_url:
+        result["error"] = "Failed to upload file"
+        result["status_code"] = status.HTTP_500_INTERNAL_SERVER_ERROR
+        return result, spooled, file_name, False
+
+    result.update(status="uploaded", url=file_url, variants=photo_variants(file_url))
+    return result, spooled, file_name, created
+
+
 @router.post("/photos", response_model=dict)
 async def upload_multiple_photos(
+    background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
+    rollback_on_error: bool = Query(False, description="Delete the batch's uploaded photos if any photo fails"),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Upload multiple dog photos (max 5)"""
+    """
+    Upload multiple dog photos (max 5).
+    Photos are validated and uploaded concurrently; `files` reports each one.
+    A rollback deletes only the photos this request stored: re-uploads of
+    files stored before (whose URLs were already handed out) are kept and
+    reported as "kept" with their URL.
+    """
     if len(files) > settings.MAX_PHOTOS_PER_DOG:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Maximum {settings.MAX_PHOTOS_PER_DOG} photos allowed"
         )
 
-    uploaded_urls = []
-
-    for file in files:
-        validate_image_file(file)
-
-        # Generate unique filename
-        file_ext = Path(file.filename).suffix.lower()
-        unique_filename = f"{uuid.uuid4()}{file_ext}"
-
-        # Read file content
-        file_content = await file.read()
-
-        # Upload to Supabase Storage
-        file_url = await storage_service.upload_file(
-            file_content=file_content,
-            file_name=unique_filename,
-            content_type=file.content_type,
-            folder="dogs/photos"
-        )
-
-        if file_url:
-            uploaded_urls.append(file_url)
-
-    if len(uploaded_urls) == 0:
+    semaphore = asyncio.Semaphore(settings.UPLOAD_CONCURRENCY)
+    outcomes = await asyncio.gather(*[upload_photo_file(file, current_user.id, semaphore) for file in files])
+    results = [result for result, _, _, _ in outcomes]
+
+    uploaded = [result for result in results if result["status"] == "uploaded"]
+    failed = [result for result in results if result["status"] == "failed"]
+
+    if failed and uploaded and rollback_on_error:
+        created = {result["url"] for result, _, _, is_new in outcomes if is_new}
+        to_delete = sorted(created - await photos_in_use(db, current_user.id, created))
+        await forget_variants(db, to_delete)
+        if not to_delete or await storage_service.delete_files(with_variants(to_delete)):
+            for result in uploaded:
+                if result["url"] in to_delete:
+                    result.update(status="rolled_back", url=None, variants=None)
+                else:
+                    # Stored before this request or shown by a listing: still there, URL still valid
+                    result["status"] = "kept"
+            uploaded = []
+
+    for result, spooled, file_name, _ in outcomes:
+        finish_photo(background_tasks, spooled, file_name, result["url"], current_user.id)
+
+    if not uploaded:
+        # Client errors only (bad type, too large) -> 400, anything else -> 500
+        client_error = all(result["status_code"] < 500 for result in failed)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to upload files"
+            status_code=status.HTTP_400_BAD_REQUEST if client_error else status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"message": "Failed to upload files", "files": results}
         )
 
     return {
-        "urls": uploaded_urls,
-        "count": len(uploaded_urls)
+        "urls": [result["url"] for result in uploaded],
+        "count": len(uploaded),
+        "files": results
     }
 
 
@@ -163,14 +299,12 @@ async def upload_certificate(
     # Generate unique filename
     unique_filename = f"{uuid.uuid4()}.pdf"
 
-    # Read file content
-    file_content = await file.read()
-
-    # Upload to Supabase Storage
+    # Sniff the real type, then stream to storage chunk by chunk
+    content_type, chunks = await open_upload(file, PDF)
     file_url = await storage_service.upload_file(
-        file_content=file_content,
+        file_content=chunks,
         file_name=unique_filename,
-        content_type=file.content_type,
+        content_type=content_type,
         folder="dogs/certificates"
     )
 
@@ -189,10 +323,39 @@ async def upload_certificate(
 @router.delete("/file")
 async def delete_file(
     file_url: str,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Delete a file from storage"""
-    success = await storage_service.delete_file(file_url)
+    """
+    Delete a file from storage. Photos can only be deleted by their uploader,
+    take their variants with them, and are kept while one of the uploader's
+    listings shows them.
+    """
+    key = storage_service.key_from_url(file_url)
+    if key is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Not a file stored by this service"
+        )
+
+    # Checked and deleted by canonical key, however the URL spells it
+    file_urls = [storage_service.public_url(key)]
+    if key.startswith(f"{PHOTO_FOLDER}/"):
+        if not key.startswith(f"{PHOTO_FOLDER}/{current_user.id}/"):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to delete this file"
+            )
+        if await photos_in_use(db, current_user.id, file_urls):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Photo is used by one of your dogs"
+            )
+        # Forgotten first: a failed delete leaves the original served, never a missing variant
+        await forget_variants(db, file_urls)
+        file_urls = with_variants(file_urls)
+
+    success = await storage_service.delete_files(file_urls)
 
     if not success:
         raise HTTPException(
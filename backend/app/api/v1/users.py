@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Optional
+from uuid import UUID
 
 from ...core.database import get_db
+from ...core.http_cache import is_conditional, make_etag, not_modified, not_modified_response, validator_headers
+from ...core.pagination import apply_keyset, finish_page, split_page, NEXT_CURSOR_HEADER
 from ...models.user import User
 from ...models.dog import Dog
 from ...schemas.user import UserResponse, UserUpdate
 from ...schemas.dog import DogResponse
-from .auth import get_current_user
+from ...services.dog_cache import invalidate_publisher
+from ...services.dog_cards import rename_publisher
+from .auth import get_current_user, invalidate_cached_user
 
 router = APIRouter()
 
@@ -23,7 +29,7 @@ async def get_my_profile(
 @router.put("/me", response_model=UserResponse)
 async def update_my_profile(
     user_data: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update current user profile"""
@@ -31,37 +37,48 @@ async def update_my_profile(
 
     for field, value in update_data.items():
         setattr(current_user, field, value)
+    if "name" in update_data:
+        await rename_publisher(db, current_user.id, current_user.name)
 
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
+    invalidate_cached_user(current_user.id)
+
+    # Cached dog responses embed the publisher's name and contact info
+    await invalidate_publisher(current_user.id)
 
     return current_user
 
 
 @router.get("/me/dogs", response_model=List[DogResponse])
 async def get_my_dogs(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
-    status_filter: str = None
+    status_filter: str = None,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    limit: int = Query(50, ge=1, le=100)
 ):
-    """Get all dogs published by current user"""
-    query = db.query(Dog).filter(Dog.publisher_id == current_user.id)
+    """Get dogs published by current user, newest first"""
+    query = select(Dog).filter(Dog.publisher_id == current_user.id)
 
     if status_filter:
         query = query.filter(Dog.status == status_filter)
 
-    dogs = query.order_by(Dog.created_at.desc()).all()
+    query = apply_keyset(query, Dog.created_at, Dog.id, cursor, limit)
 
-    return dogs
+    return finish_page((await db.execute(query)).scalars().all(), limit, response)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user_profile(
-    user_id: str,
-    db: Session = Depends(get_db)
+    user_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get user profile by ID (public info only)"""
-    user = db.query(User).filter(User.id == user_id).first()
+    """Get user profile by ID (public info only, supports If-None-Match)"""
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -69,16 +86,28 @@ async def get_user_profile(
             detail="User not found"
         )
 
+    etag = make_etag(user.id, user.email, user.name, user.phone, user.location, user.created_at)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+
+    response.headers.update(validator_headers(etag))
     return user
 
 
 @router.get("/{user_id}/dogs", response_model=List[DogResponse])
 async def get_user_dogs(
-    user_id: str,
-    db: Session = Depends(get_db)
+    user_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    limit: int = Query(50, ge=1, le=100)
 ):
-    """Get all available dogs published by a specific user"""
-    user = db.query(User).filter(User.id == user_id).first()
+    """
+    Get available dogs published by a specific user, newest first.
+    Revalidations with If-None-Match only run a narrow (id, updated_at) query.
+    """
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -87,9 +116,23 @@ async def get_user_dogs(
         )
 
     # Only show available dogs for other users
-    dogs = db.query(Dog).filter(
-        Dog.publisher_id == user_id,
-        Dog.status == 'disponible'
-    ).order_by(Dog.created_at.desc()).all()
+    criteria = (Dog.publisher_id == user_id, Dog.status == 'disponible')
+
+    if is_conditional(request):
+        version_query = select(Dog.id, Dog.created_at, Dog.updated_at).filter(*criteria)
+        rows = (await db.execute(apply_keyset(version_query, Dog.created_at, Dog.id, cursor, limit))).all()
+        page, next_cursor = split_page(rows, limit)
+
+        etag = make_etag([(row.id, row.updated_at) for row in page], next_cursor is not None)
+        if not_modified(request, etag):
+            return not_modified_response(etag)
+
+    query = apply_keyset(select(Dog).filter(*criteria), Dog.created_at, Dog.id, cursor, limit)
+    dogs, next_cursor = split_page((await db.execute(query)).scalars().all(), limit)
+
+    etag = make_etag([(dog.id, dog.updated_at) for dog in dogs], next_cursor is not None)
+    response.headers.update(validator_headers(etag))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
     return dogs
@@ -0,0 +1,319 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import threading
+import time
+
+from .config import settings
+
+# Rough per-entry bookkeeping cost counted against the memory cap
+ENTRY_OVERHEAD_BYTES = 512
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU map whose entries expire individually.
+    Used for hot-path lookups (auth) where a full ResponseCache is overkill.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or item[0] <= time.monotonic():
+                if item is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body plus what invalidation needs to know about it"""
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    meta: Dict[str, Any] = field(default_factory=dict)
+    fresh_until: float = 0.0
+    stale_until: float = 0.0
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + ENTRY_OVERHEAD_BYTES
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cache entries.
+    The in-process backend is the default; a shared backend (e.g. Redis)
+    only has to implement these methods.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def delete_matching(self, predicate: Callable[[str, CacheEntry], bool]) -> int:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """LRU cache bounded by entry count and total body size"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.stale_until <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def delete(self, key: str) -> bool:
+        return self._remove(key)
+
+    async def delete_matching(self, predicate: Callable[[str, CacheEntry], bool]) -> int:
+        keys = [key for key, entry in self._entries.items() if predicate(key, entry)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        return True
+
+
+Loader = Callable[[], Awaitable[CacheEntry]]
+
+
+class ResponseCache:
+    """
+    Read-through cache with stale-while-revalidate.
+
+    Fresh entries are served directly. Stale entries are served while a
+    single background task reloads them. Concurrent misses on one key
+    share a single load, so a cold key never stampedes the database; a
+    request that arrives after an invalidation does not join a load that
+    started before it, so writers read their own writes.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, stale_ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.enabled = enabled
+        # Loads in progress by (key, generation they started in)
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+        # Bumped on every invalidation; loads that started before one are neither
+        # stored nor joined by later requests
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get_or_load(self, key: str, loader: Loader) -> Tuple[CacheEntry, str]:
+        """Return (entry, state) where state is HIT, STALE or MISS"""
+        if not self.enabled:
+            return await loader(), "MISS"
+
+        entry = await self.backend.get(key)
+        if entry is not None:
+            if entry.fresh_until > time.monotonic():
+                self.hits += 1
+                return entry, "HIT"
+
+            self.stale_hits += 1
+            if (key, self._generation) not in self._inflight:
+                self._start_load(key, loader).add_done_callback(_consume_exception)
+            return entry, "STALE"
+
+        self.misses += 1
+        future = self._inflight.get((key, self._generation)) or self._start_load(key, loader)
+        return await asyncio.shield(future), "MISS"
+
+    async def peek(self, key: str) -> Optional[CacheEntry]:
+        """Fresh entry for `key`, without loading or refreshing anything"""
+        if not self.enabled:
+            return None
+
+        entry = await self.backend.get(key)
+        if entry is None or entry.fresh_until <= time.monotonic():
+            return None
+
+        self.hits += 1
+        return entry
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    async def put(self, key: str, entry: CacheEntry, generation: int) -> None:
+        """
+        Store an entry loaded outside get_or_load (several keys from one query).
+        Read `generation` before loading: the entry is dropped if something was
+        invalidated in the meantime, like loads that race an invalidation.
+        """
+        if not self.enabled:
+            return
+
+        self._stamp(entry)
+        if generation == self._generation:
+            await self.backend.set(key, entry)
+
+    def _stamp(self, entry: CacheEntry) -> None:
+        now = time.monotonic()
+        entry.fresh_until = now + self.ttl
+        entry.stale_until = now + self.ttl + self.stale_ttl
+
+    def _start_load(self, key: str, loader: Loader) -> asyncio.Future:
+        generation = self._generation
+        future = asyncio.ensure_future(self._load(key, loader, generation))
+        self._inflight[(key, generation)] = future
+        return future
+
+    async def _load(self, key: str, loader: Loader, generation: int) -> CacheEntry:
+        try:
+            entry = await loader()
+            self._stamp(entry)
+            if generation == self._generation:
+                await self.backend.set(key, entry)
+            return entry
+        finally:
+            self._inflight.pop((key, generation), None)
+
+    async def invalidate(self, key: str) -> None:
+        self._generation += 1
+        if await self.backend.delete(key):
+            self.invalidations += 1
+
+    async def invalidate_matching(self, predicate: Callable[[str, CacheEntry], bool]) -> None:
+        self._generation += 1
+        self.invalidations += await self.backend.delete_matching(predicate)
+
+    async def clear(self) -> None:
+        self._generation += 1
+        await self.backend.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "inflight": len(self._inflight),
+            **self.backend.stats(),
+        }
+
+
+def _consume_exception(future: asyncio.Future):
+    # Background refreshes keep serving the stale entry when they fail
+    if not future.cancelled():
+        future.exception()
+
+
+response_cache = ResponseCache(
+    MemoryCacheBackend(
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ),
+    ttl=settings.RESPONSE_CACHE_TTL,
+    stale_ttl=settings.RESPONSE_CACHE_STALE_TTL,
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+)
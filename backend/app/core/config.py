@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
-from typing import List, Union
+from typing import List, Literal, Optional, Union
 import os
 
 
@@ -12,6 +12,59 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: bool = True  # open DB_POOL_SIZE connections at startup
+    # Boot-time schema handling: 'verify' fails unless the DB is at the Alembic head,
+    # 'create' runs create_all and stamps the head (local databases, tests), 'off' skips
+    DB_SCHEMA_CHECK: Literal["verify", "create", "off"] = "verify"
+
+    # Response cache for public dog listings
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL: float = 30  # seconds an entry is served as fresh
+    RESPONSE_CACHE_STALE_TTL: float = 60  # extra seconds served stale while reloading
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64MB
+    RESPONSE_CACHE_WARMUP: bool = True  # load the landing listing page and facets at startup
+
+    # Bulk dog import (POST /dogs/import)
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_ROWS: int = 100_000
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
+    # Batch fetch (GET/POST /dogs/batch)
+    DOG_BATCH_MAX_IDS: int = 300
+
+    # Bulk status change (PATCH /dogs/status)
+    STATUS_BULK_MAX_IDS: int = 500
+
+    # Streaming export (GET /dogs/export)
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched per server-side cursor round trip
+    EXPORT_GZIP_LEVEL: int = 6
+
+    # Auth caches (decoded tokens never outlive their 'exp')
+    AUTH_TOKEN_CACHE_SIZE: int = 4096
+    AUTH_TOKEN_CACHE_TTL: float = 300
+    AUTH_USER_CACHE_SIZE: int = 4096
+    AUTH_USER_CACHE_TTL: float = 30
+
+    # Internal endpoints (/internal/*); when unset they are only served in DEBUG
+    INTERNAL_API_TOKEN: Optional[str] = None
+
+    # Per-route request metrics, scraped from /internal/metrics
+    METRICS_ENABLED: bool = True
+
+    # Per-request SQL stats: optional log line per request, Server-Timing header
+    # (in DEBUG or with SQL_SERVER_TIMING), and in DEBUG a warning when one
+    # statement shape runs more than the limit (N+1)
+    DEBUG: bool = False
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SQL_SERVER_TIMING: bool = False
+    SQL_LOG_REQUESTS: bool = False
+    SQL_REPEATED_QUERY_LIMIT: int = 5
 
     # Supabase
     SUPABASE_URL: str
@@ -33,12 +86,26 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(',')]
         return v
 
-    # Storage
+    # Storage: "supabase" (Storage REST API) or "local" (files served at STORAGE_LOCAL_BASE_URL)
+    STORAGE_BACKEND: Literal["supabase", "local"] = "supabase"
     SUPABASE_STORAGE_BUCKET: str = "dog-photos"
+    STORAGE_HTTP_MAX_CONNECTIONS: int = 20
+    STORAGE_HTTP_TIMEOUT: float = 30
+    STORAGE_LOCAL_ROOT: str = "./storage"
+    STORAGE_LOCAL_BASE_URL: str = "/media"
     MAX_UPLOAD_SIZE: int = 5 * 1024 * 1024  # 5MB
+    MAX_CERTIFICATE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    UPLOAD_CONCURRENCY: int = 5  # files uploaded in parallel per request
     ALLOWED_IMAGE_TYPES: List[str] = ["image/jpeg", "image/png"]
     MAX_PHOTOS_PER_DOG: int = 5
 
+    # Photo derivatives (thumb/card/full), rendered in a process pool after upload
+    IMAGE_VARIANTS_ENABLED: bool = True
+    IMAGE_VARIANT_FORMAT: Literal["WEBP", "JPEG"] = "WEBP"
+    IMAGE_VARIANT_QUALITY: int = 80
+    IMAGE_WORKERS: Optional[int] = None  # defaults to the CPU count
+
     class Config:
         # Don't load .env file - use only environment variables
         # This prevents Railway from using local .env values
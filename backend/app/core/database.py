@@ -1,17 +1,245 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from contextvars import ContextVar
+from typing import List, Optional
+import asyncio
+import threading
+import time
 from .config import settings
+from .metrics import Counter, Gauge, Histogram, Metric, registry
+from .query_stats import instrument_engine
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async driver for each sync URL scheme we may receive (Railway, Supabase, local)
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Translate DATABASE_URL to its async driver (asyncpg / aiosqlite)"""
+    url = make_url(database_url)
+    url = url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+    # asyncpg takes 'ssl' instead of libpq's 'sslmode'
+    if url.drivername == "postgresql+asyncpg" and "sslmode" in url.query:
+        query = dict(url.query)
+        query["ssl"] = query.pop("sslmode")
+        url = url.set(query=query)
+
+    return url.render_as_string(hide_password=False)
+
+
+class PoolStats:
+    """Counters fed by the connection pool; read through /internal/db-pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.overflow_connects = 0
+            self.timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool=None) -> dict:
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "overflow_connects": self.overflow_connects,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            })
+        return stats
+
+
+pool_stats = PoolStats()
+
+pool_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+))
+
+
+# Seconds the current checkout spent opening a connection rather than queueing; None
+# outside a checkout. A context variable, not a thread-local: checkouts of concurrent
+# requests run in greenlets on the event loop thread, each with its own context.
+_checkout_connecting: ContextVar[Optional[List[float]]] = ContextVar("checkout_connecting", default=None)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait and when overflow kicks in"""
+
+    def _do_get(self):
+        if _checkout_connecting.get() is not None:
+            # QueuePool retries by calling _do_get again: still the same checkout
+            return super()._do_get()
+
+        connecting = [0.0]
+        token = _checkout_connecting.set(connecting)
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record_wait(time.perf_counter() - start - connecting[0], timed_out=True)
+            raise
+        finally:
+            _checkout_connecting.reset(token)
+        # Queueing only: opening an overflow connection is connect latency, not wait
+        waited = time.perf_counter() - start - connecting[0]
+        pool_stats.record_wait(waited)
+        pool_wait.observe((), waited)
+        return connection
+
+    def _inc_overflow(self) -> bool:
+        start = time.perf_counter()
+        created = super()._inc_overflow()
+        self._add_connecting(time.perf_counter() - start)
+        # _overflow counts connections beyond pool_size, starting at -pool_size
+        if created and self._overflow > 0:
+            pool_stats.increment("overflow_connects")
+        return created
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            self._add_connecting(time.perf_counter() - start)
+
+    @staticmethod
+    def _add_connecting(seconds: float):
+        connecting = _checkout_connecting.get()
+        if connecting is not None:
+            connecting[0] += seconds
+
+
+def create_engine_from_settings():
+    url = get_async_database_url(settings.DATABASE_URL)
+
+    # SQLite (local tests) keeps SQLAlchemy's default pool
+    if make_url(url).get_backend_name() == "sqlite":
+        return create_async_engine(url)
+
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+    pool_events = engine.sync_engine.pool
+    event.listen(pool_events, "checkout", lambda *args: pool_stats.increment("checkouts"))
+    event.listen(pool_events, "connect", lambda *args: pool_stats.increment("connects"))
+    event.listen(pool_events, "invalidate", lambda *args: pool_stats.increment("invalidations"))
+    event.listen(pool_events, "soft_invalidate", lambda *args: pool_stats.increment("invalidations"))
+    return engine
+
+
+_engine: Optional[AsyncEngine] = None
+
+
+def get_engine() -> AsyncEngine:
+    """The app's engine, created on first use so importing the app opens nothing"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine_from_settings()
+        instrument_engine(_engine)
+    return _engine
+
+
+class LazyEngine:
+    """Stands in for the AsyncEngine at import time; any attribute access creates it"""
+
+    def __getattr__(self, name):
+        return getattr(get_engine(), name)
+
+
+class LazySessionmaker(async_sessionmaker):
+    """async_sessionmaker bound to the app's engine when the first session is made"""
+
+    def __call__(self, **local_kw) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+engine = LazyEngine()
+SessionLocal = LazySessionmaker(autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def get_pool_stats() -> dict:
+    return pool_stats.snapshot(_engine.sync_engine.pool if _engine is not None else None)
+
+
+def pool_metrics() -> List[Metric]:
+    """Pool counters and occupancy for /internal/metrics, read at scrape time"""
+    stats = get_pool_stats()
+    metrics = []
+    for counter in ("checkouts", "connects", "invalidations", "overflow_connects", "timeouts"):
+        metric = Counter(f"db_pool_{counter}_total", f"Connection pool {counter.replace('_', ' ')}")
+        metric.inc((), stats[counter])
+        metrics.append(metric)
+    for gauge in ("size", "checked_in", "checked_out", "overflow"):
+        if gauge in stats:
+            metric = Gauge(f"db_pool_{gauge}", f"Connection pool {gauge.replace('_', ' ')}")
+            metric.set((), stats[gauge])
+            metrics.append(metric)
+    return metrics
+
+
+registry.add_collector(pool_metrics)
+
+
+async def warm_up_pool(connections: Optional[int] = None):
+    """Open pool connections up front so early requests skip connection setup"""
+    connections = connections or settings.DB_POOL_SIZE
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Hold all connections at once, otherwise the pool would reuse one
+    await asyncio.gather(*[ping() for _ in range(connections)])
@@ -0,0 +1,68 @@
+from fastapi import Request, Response, status
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+import hashlib
+
+# Clients may keep responses but must revalidate them on every use
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the values that determine a representation"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def _http_date(value: datetime) -> str:
+    # Timestamps are stored as naive UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+    return headers
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since (RFC 9110 13.2.2).
+    If-None-Match wins when both are present.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: W/ prefixes are ignored
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    modified = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have second precision
+    return modified.replace(microsecond=0) <= since
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, last_modified)
+    )
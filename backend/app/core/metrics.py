@@ -0,0 +1,221 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+import time
+
+from .config import settings
+
+# Seconds; request and storage latencies
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bytes; from a 304 to a large export page
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+STATUS_CLASSES = {code: f"{code // 100}xx" for code in range(100, 600)}
+UNMATCHED_ROUTE = "<unmatched>"
+# Clients choose the method token; anything else is one "OTHER" series, not one per verb
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    """
+    A metric family keyed by label values (positional tuples, no kwargs, to keep
+    updates cheap). Updates happen on the event loop thread, so no locking.
+    """
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.values: Dict[Labels, object] = {}
+
+    def samples(self) -> Iterator[str]:
+        for key, value in self.values.items():
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}", *self.samples()]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, key: Labels = (), amount: float = 1):
+        self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, key: Labels, value: float):
+        self.values[key] = value
+
+    def inc(self, key: Labels = (), amount: float = 1):
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, key: Labels = (), amount: float = 1):
+        self.values[key] = self.values.get(key, 0) - amount
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, key: Labels, value: float):
+        # [count per bucket (last one is +Inf), sum]; cumulated when rendered
+        state = self.values.get(key)
+        if state is None:
+            state = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def samples(self) -> Iterator[str]:
+        bounds = [*self.buckets, float("inf")]
+        for key, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        # Called at scrape time for values read from elsewhere (e.g. pool occupancy)
+        self.collectors: List[Callable[[], List[Metric]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[Metric]]):
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in [*self.metrics, *[m for collector in self.collectors for m in collector()]]:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status class", ("method", "route", "status")
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time until the response was fully sent", ("method", "route")
+))
+http_response_size = registry.register(Histogram(
+    "http_response_size_bytes", "Response body size", ("method", "route"), buckets=SIZE_BUCKETS
+))
+http_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "Requests being handled", ("method",)
+))
+storage_duration = registry.register(Histogram(
+    "storage_operation_duration_seconds", "Storage backend call latency", ("operation", "outcome")
+))
+
+
+@contextmanager
+def time_storage(operation: str):
+    """
+    Observe a storage backend call; raised exceptions count as outcome="error",
+    or as their `metric_outcome` when they are expected answers rather than failures.
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except Exception as e:
+        outcome = getattr(e, "metric_outcome", "error")
+        raise
+    finally:
+        storage_duration.observe((operation, outcome), time.perf_counter() - start)
+
+
+def route_template(scope) -> str:
+    """The matched route's path template, so /dogs/{dog_id} is one series, not one per dog"""
+    route = scope.get("route")
+    if route is not None:
+        return route.path_format
+    if "endpoint" in scope:
+        # Mounted app (e.g. /media static files): its mount path
+        return f"{scope.get('root_path', '')}/{{path}}"
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route request counts, latency, response
+    size and in-flight requests. Routing fills scope["route"] on the way in,
+    so the template is read after the app returns. Mounted at the outside
+    of the stack so CORS and error responses are counted too.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+        status_code = 500
+        size = 0
+        sent_at = None
+
+        async def send_with_metrics(message):
+            nonlocal status_code, size, sent_at
+            if message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                await send(message)
+                if not message.get("more_body", False):
+                    sent_at = time.perf_counter()
+                return
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight_key = (method,)
+        http_in_flight.inc(in_flight_key)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            # Background tasks run after the last body message; they are not the client's latency
+            elapsed = (sent_at or time.perf_counter()) - start
+            http_in_flight.dec(in_flight_key)
+            route = route_template(scope)
+            key = (method, route)
+            http_request_duration.observe(key, elapsed)
+            http_response_size.observe(key, size)
+            http_requests.inc((method, route, STATUS_CLASSES.get(status_code, "other")))
+
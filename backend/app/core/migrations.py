@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Set
+
+from sqlalchemy.engine import Connection
+
+from .config import settings
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database is not at the Alembic head this code expects"""
+
+
+def _script_directory():
+    # Alembic is only needed at boot, so it is imported here rather than with the app
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return ScriptDirectory.from_config(config)
+
+
+def head_revisions() -> Set[str]:
+    return set(_script_directory().get_heads())
+
+
+def current_revisions(conn: Connection) -> Set[str]:
+    from alembic.runtime.migration import MigrationContext
+
+    return set(MigrationContext.configure(conn).get_current_heads())
+
+
+def verify_schema(conn: Connection) -> None:
+    """Fail boot when migrations are missing (or newer than this code); run with conn.run_sync"""
+    current, heads = current_revisions(conn), head_revisions()
+    if current != heads:
+        raise SchemaOutOfDate(
+            f"Database is at revision {', '.join(sorted(current)) or 'none'}, "
+            f"code expects {', '.join(sorted(heads))}. Run `alembic upgrade head` before starting workers."
+        )
+
+
+def create_schema(conn: Connection) -> None:
+    """Local databases and tests: create the tables from the models and mark them as migrated"""
+    from alembic.runtime.migration import MigrationContext
+
+    from .database import Base
+
+    Base.metadata.create_all(conn)
+    MigrationContext.configure(conn).stamp(_script_directory(), "heads")
+
+
+def prepare_schema(conn: Connection) -> None:
+    """DB_SCHEMA_CHECK: 'verify' (default) checks the Alembic revision, 'create' builds it, 'off' skips"""
+    if settings.DB_SCHEMA_CHECK == "verify":
+        verify_schema(conn)
+    elif settings.DB_SCHEMA_CHECK == "create":
+        create_schema(conn)
@@ -0,0 +1,57 @@
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+from uuid import UUID
+import base64
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Build an opaque cursor from the last row of a page"""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Parse a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def apply_keyset(query, created_column, id_column, cursor: Optional[str], limit: int):
+    """
+    Order newest first and continue after `cursor`.
+    Fetches one extra row so the caller can tell whether a next page exists.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(created_column, id_column) < tuple_(created_at, row_id))
+
+    return query.order_by(created_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def split_page(rows: Sequence, limit: int) -> Tuple[Sequence, Optional[str]]:
+    """Trim the look-ahead row; returns the page and the next cursor (None on the last page)"""
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+def finish_page(rows: Sequence, limit: int, response: Response) -> Sequence:
+    """Trim the look-ahead row and expose the next cursor as a response header"""
+    rows, next_cursor = split_page(rows, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
@@ -0,0 +1,166 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+import json
+import logging
+import re
+import time
+
+from sqlalchemy import event
+
+from .config import settings
+
+logger = logging.getLogger("app.sql")
+
+# Placeholder lists ($1, $2, ... / ?, ?, ...) collapse so IN clauses of any length share one shape
+PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\$\d+|\?|%\(\w+\)s)(?:\s*,\s*(?:\$\d+|\?|%\(\w+\)s))*\s*\)")
+WHITESPACE = re.compile(r"\s+")
+SLOWEST_REPORTED = 3
+STATEMENT_PREVIEW = 200
+
+
+def statement_shape(statement: str) -> str:
+    return PLACEHOLDER_LIST.sub("(?)", WHITESPACE.sub(" ", statement).strip())
+
+
+@dataclass
+class QueryStats:
+    """SQL executed while a request (or a capture_queries block) was active"""
+    parent: Optional["QueryStats"] = None
+    count: int = 0
+    seconds: float = 0.0
+    statements: List[Tuple[float, str]] = field(default_factory=list)
+
+    def record(self, statement: str, seconds: float):
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            stats.statements.append((seconds, statement))
+            stats = stats.parent
+
+    def slowest(self, limit: int = SLOWEST_REPORTED) -> List[Tuple[float, str]]:
+        return sorted(self.statements, key=lambda item: item[0], reverse=True)[:limit]
+
+    def repeated(self, limit: int) -> Dict[str, int]:
+        """Statement shapes executed more than `limit` times: the N+1 pattern"""
+        shapes: Dict[str, int] = {}
+        for _, statement in self.statements:
+            shape = statement_shape(statement)
+            shapes[shape] = shapes.get(shape, 0) + 1
+        return {shape: count for shape, count in shapes.items() if count > limit}
+
+
+current_queries: ContextVar[Optional[QueryStats]] = ContextVar("current_queries", default=None)
+
+
+def instrument_engine(engine):
+    """
+    Attribute every statement to the active QueryStats. Sync events run in the
+    greenlet SQLAlchemy spawns for the awaiting task, which carries the task's
+    context, so the request's context variable is visible here.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        stats = current_queries.get()
+        if stats is not None:
+            stats.record(statement, time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+        if starts:
+            starts.pop()
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """
+    Collect the queries run inside the block, including those of in-process
+    requests (their own stats report up to this one). For query budgets:
+
+        with capture_queries() as queries:
+            client.get("/api/v1/dogs/")
+        assert queries.count <= 3
+    """
+    stats = QueryStats(parent=current_queries.get())
+    token = current_queries.set(stats)
+    try:
+        yield stats
+    finally:
+        current_queries.reset(token)
+
+
+def server_timing(stats: QueryStats) -> bytes:
+    return f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries"'.encode()
+
+
+def report(scope, status_code: int, stats: QueryStats):
+    """Structured log line per request, and a warning for repeated statement shapes in debug mode"""
+    if settings.DEBUG:
+        repeated = stats.repeated(settings.SQL_REPEATED_QUERY_LIMIT)
+        if repeated:
+            logger.warning(json.dumps({
+                "event": "repeated_queries",
+                "method": scope["method"],
+                "path": scope["path"],
+                "limit": settings.SQL_REPEATED_QUERY_LIMIT,
+                "statements": [{"count": count, "statement": shape[:STATEMENT_PREVIEW]} for shape, count in repeated.items()],
+            }, ensure_ascii=False))
+
+    if settings.SQL_LOG_REQUESTS and stats.count:
+        logger.info(json.dumps({
+            "event": "request_queries",
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "queries": stats.count,
+            "db_ms": round(stats.seconds * 1000, 2),
+            "slowest": [
+                {"ms": round(seconds * 1000, 2), "statement": WHITESPACE.sub(" ", statement)[:STATEMENT_PREVIEW]}
+                for seconds, statement in stats.slowest()
+            ],
+        }, ensure_ascii=False))
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the SQL each request runs and reports it as a log line with
+    SQL_LOG_REQUESTS (all of its queries), as a Server-Timing header in DEBUG
+    or with SQL_SERVER_TIMING (queries executed before the response started),
+    and in DEBUG warns about repeated statement shapes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.SQL_INSTRUMENTATION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        # Query counts and DB time are not for every client to see
+        with_timing = settings.DEBUG or settings.SQL_SERVER_TIMING
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if with_timing:
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", server_timing(stats))]
+            await send(message)
+
+        with capture_queries() as stats:
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                report(scope, status_code, stats)
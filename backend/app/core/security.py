@@ -2,6 +2,8 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt
 from passlib.context import CryptContext
+import time
+from .cache import TTLCache
 from .config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -26,9 +28,20 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+# Decoded payloads of valid tokens; invalid tokens are never cached
+token_cache = TTLCache(max_entries=settings.AUTH_TOKEN_CACHE_SIZE, ttl=settings.AUTH_TOKEN_CACHE_TTL)
+
+
 def verify_token(token: str) -> Optional[dict]:
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except jwt.JWTError:
         return None
+
+    expires_at = payload.get("exp")
+    token_cache.set(token, payload, ttl=expires_at - time.time() if expires_at is not None else None)
+    return payload
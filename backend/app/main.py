@@ -1,25 +1,57 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+import os
+from .api.v1.dogs import warm_dog_caches
+from .core.cache import response_cache
 from .core.config import settings
-from .core.database import Base, engine
+from .core.database import engine, warm_up_pool
+from .core.metrics import MetricsMiddleware
+from .core.migrations import prepare_schema
+from .core.query_stats import QueryStatsMiddleware
+from .core.pagination import NEXT_CURSOR_HEADER
+from .services.images import shutdown_image_pool
+from .services.storage import storage_service
+from .services.text_search import detect_search_features
+
+
+async def warm_up():
+    """
+    Readiness phase. Uvicorn accepts connections only once lifespan startup
+    returns, so whatever is warmed here is never paid for by a request.
+    """
+    if settings.DB_POOL_WARMUP:
+        await warm_up_pool()
+    if settings.RESPONSE_CACHE_WARMUP and response_cache.enabled:
+        await warm_dog_caches()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create database tables
-    print("🚀 Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created")
+    # Startup: migrations run once per deploy (alembic upgrade head), workers only check them
+    print("🚀 Checking database schema...")
+    async with engine.begin() as conn:
+        await conn.run_sync(prepare_schema)
+        await detect_search_features(conn)
+    print("✅ Database schema is up to date")
+    print("🔥 Warming up...")
+    await warm_up()
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: close pooled connections
     print("👋 Shutting down...")
+    shutdown_image_pool()
+    await storage_service.close()
+    await engine.dispose()
 
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -30,8 +62,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+app.add_middleware(QueryStatsMiddleware)
+# Added last so it wraps CORS: every response is timed and counted
+app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/")
 async def root():
@@ -49,4 +86,11 @@ async def health():
 
 # Include routers
 from .api.v1 import api_router
+from .api import internal
 app.include_router(api_router, prefix=settings.API_V1_STR)
+app.include_router(internal.router)
+
+# Local storage backend: serve stored files from the same app
+if settings.STORAGE_BACKEND == "local":
+    os.makedirs(settings.STORAGE_LOCAL_ROOT, exist_ok=True)
+    app.mount(urlsplit(settings.STORAGE_LOCAL_BASE_URL).path, StaticFiles(directory=settings.STORAGE_LOCAL_ROOT), name="media")
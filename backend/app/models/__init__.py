@@ -1,5 +1,7 @@
 from .user import User
 from .dog import Dog
+from .dog_card import DogCard
+from .photo_variants import PhotoVariants
 from .status_history import DogStatusHistory
 
-__all__ = ["User", "Dog", "DogStatusHistory"]
+__all__ = ["User", "Dog", "DogCard", "PhotoVariants", "DogStatusHistory"]
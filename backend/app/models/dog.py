@@ -1,10 +1,20 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, Text, DateTime, ForeignKey, CheckConstraint, Index
+from sqlalchemy import Column, String, Integer, Float, Boolean, Text, DateTime, ForeignKey, CheckConstraint, Index, JSON, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
 from ..core.database import Base
 
+SEARCH_CONFIG = "spanish"
+
+# Text searched by `q`: name and breed weigh most, then color, then the description
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('spanish', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('spanish', coalesce(breed, '')), 'A') || "
+    "setweight(to_tsvector('spanish', coalesce(color, '')), 'B') || "
+    "setweight(to_tsvector('spanish', coalesce(description, '')), 'C')"
+)
+
 
 class Dog(Base):
     __tablename__ = "dogs"
@@ -38,7 +48,7 @@ class Dog(Base):
     contact_email = Column(String(255), nullable=True)
 
     # Media
-    photos = Column(ARRAY(Text), nullable=False)
+    photos = Column(ARRAY(Text).with_variant(JSON, "sqlite"), nullable=False)  # JSON on SQLite for local tests
     certificate = Column(Text, nullable=True)
 
     # Status
@@ -59,6 +69,27 @@ class Dog(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint("status IN ('disponible', 'reservado', 'adoptado')", name='valid_status'),
-        Index('idx_dogs_status', 'status'),
-        Index('idx_dogs_publisher', 'publisher_id'),
+        Index('idx_dogs_location', 'latitude', 'longitude'),
+        # Radius searches of the public listing only look at available dogs
+        Index(
+            'idx_dogs_available_location', 'latitude', 'longitude',
+            postgresql_where=text("status = 'disponible'"),
+            sqlite_where=text("status = 'disponible'")
+        ),
+        # Keyset pagination: (created_at, id) after each filter combination.
+        # These also serve plain status / publisher lookups through their prefix.
+        Index('idx_dogs_created_id', 'created_at', 'id'),
+        Index('idx_dogs_status_created_id', 'status', 'created_at', 'id'),
+        Index('idx_dogs_status_province_created_id', 'status', 'province', 'created_at', 'id'),
+        Index('idx_dogs_publisher_created_id', 'publisher_id', 'created_at', 'id'),
+        Index('idx_dogs_publisher_status_created_id', 'publisher_id', 'status', 'created_at', 'id'),
     )
+
+
+# Full-text search column (Postgres only; SQLite falls back to LIKE).
+# Generated by the database and left unmapped so ORM loads never fetch it.
+for statement in (
+    f"ALTER TABLE dogs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED",
+    "CREATE INDEX IF NOT EXISTS idx_dogs_search_vector ON dogs USING gin (search_vector)",
+):
+    event.listen(Dog.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
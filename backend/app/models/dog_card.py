@@ -0,0 +1,64 @@
+from sqlalchemy import Column, String, Integer, Float, Text, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from ..core.database import Base
+
+
+class DogCard(Base):
+    """
+    Listing read model: one row per dog with only what a listing card shows,
+    the publisher's name and precomputed geo keys. Kept current by the
+    dog and profile writes (app/services/dog_cards.py), never refreshed in full.
+    """
+    __tablename__ = "dog_cards"
+
+    id = Column(UUID(as_uuid=True), ForeignKey('dogs.id', ondelete='CASCADE'), primary_key=True)
+    publisher_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    publisher_name = Column(String(255), nullable=False)
+
+    name = Column(String(100), nullable=False)
+    breed = Column(String(100), nullable=False)
+    size = Column(String(20), nullable=False)
+    gender = Column(String(10), nullable=False)
+    age_years = Column(Integer, nullable=False)
+    age_months = Column(Integer, default=0)
+    province = Column(String(50), nullable=True)
+    status = Column(String(20), nullable=False)
+    photo = Column(Text, nullable=True)  # first photo
+    summary = Column(String(160), nullable=True)  # start of the description
+
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    # Haversine inputs, so radius searches don't call radians()/cos() per row
+    lat_rad = Column(Float, nullable=False)
+    lon_rad = Column(Float, nullable=False)
+    cos_lat = Column(Float, nullable=False)
+
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    # Joined into the card query, so a page stays one statement
+    photo_variants = relationship(
+        "PhotoVariants",
+        primaryjoin="foreign(DogCard.photo) == PhotoVariants.photo_url",
+        viewonly=True,
+        uselist=False,
+        lazy="joined"
+    )
+
+    @property
+    def thumbnail(self):
+        """Stored thumb variant of `photo`, or the photo itself when none was stored"""
+        return self.photo_variants.thumb if self.photo_variants else self.photo
+
+    __table_args__ = (
+        # Same keyset and radius shapes as the dogs indexes the full listing uses
+        Index('idx_dog_cards_status_created_id', 'status', 'created_at', 'id'),
+        Index('idx_dog_cards_status_province_created_id', 'status', 'province', 'created_at', 'id'),
+        Index(
+            'idx_dog_cards_available_location', 'latitude', 'longitude',
+            postgresql_where=text("status = 'disponible'"),
+            sqlite_where=text("status = 'disponible'")
+        ),
+        Index('idx_dog_cards_publisher', 'publisher_id'),
+    )
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Text, DateTime
+from datetime import datetime
+from ..core.database import Base
+
+
+class PhotoVariants(Base):
+    """
+    Variants of an uploaded photo that were rendered and stored. Photos
+    without a row (older uploads, external URLs, renders pending or failed)
+    have no variants.
+    """
+    __tablename__ = "photo_variants"
+
+    photo_url = Column(Text, primary_key=True)
+    thumb = Column(Text, nullable=False)
+    card = Column(Text, nullable=False)
+    full = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def urls(self) -> dict:
+        return {"thumb": self.thumb, "card": self.card, "full": self.full}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -17,3 +17,8 @@ class DogStatusHistory(Base):
 
     # Relationships
     dog = relationship("Dog", back_populates="status_history")
+
+    __table_args__ = (
+        # GET /dogs/{id}/history: one dog's changes, newest first
+        Index('idx_status_history_dog_changed', 'dog_id', 'changed_at'),
+    )
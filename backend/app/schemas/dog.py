@@ -1,8 +1,16 @@
-from pydantic import BaseModel, EmailStr, field_validator
-from typing import Optional, List, Literal
+from pydantic import BaseModel, EmailStr, Field, ValidationInfo, WithJsonSchema, field_validator
+from typing import Annotated, Dict, Optional, List, Literal
 from datetime import datetime
 from uuid import UUID
 
+from ..core.config import settings
+from ..services.images import VARIANT_SIZES
+
+
+# Emails read back from the database were validated on the way in; responses document
+# them as EmailStr does without running the email validator for every row
+StoredEmail = Annotated[str, WithJsonSchema({'type': 'string', 'format': 'email'})]
+
 
 class DogBase(BaseModel):
     name: str
@@ -73,6 +81,21 @@ class DogStatusUpdate(BaseModel):
     status: Literal['disponible', 'reservado', 'adoptado']
 
 
+class DogBulkStatusUpdate(DogStatusUpdate):
+    ids: List[UUID]
+
+
+class DogStatusRejection(BaseModel):
+    id: UUID
+    detail: str
+
+
+class DogBulkStatusResult(BaseModel):
+    updated: List[UUID]
+    unchanged: List[UUID]  # already had the requested status
+    rejected: List[DogStatusRejection]
+
+
 class DogResponse(DogBase):
     id: UUID
     photos: List[str]
@@ -82,6 +105,22 @@ class DogResponse(DogBase):
     created_at: datetime
     updated_at: datetime
     adopted_at: Optional[datetime] = None
+    contact_email: Optional[StoredEmail] = None
+    # thumb/card/full URLs for each photo, in the same order as `photos`
+    photo_variants: List[Dict[str, str]] = Field(default_factory=list, validate_default=True)
+
+    @field_validator('photo_variants', mode='after')
+    @classmethod
+    def link_stored_variants(cls, v, info: ValidationInfo):
+        """
+        Only variants recorded as stored are linked, passed as
+        context={"photo_variants": stored_variants(...)}; other photos (and
+        every photo without that context) map each variant to the original.
+        """
+        if v or not settings.IMAGE_VARIANTS_ENABLED:
+            return v
+        stored = (info.context or {}).get('photo_variants', {})
+        return [stored.get(photo) or dict.fromkeys(VARIANT_SIZES, photo) for photo in info.data.get('photos', [])]
 
     class Config:
         from_attributes = True
@@ -90,6 +129,80 @@ class DogResponse(DogBase):
 class DogWithPublisher(DogResponse):
     publisher: Optional[dict] = None
 
+    @field_validator('publisher', mode='before')
+    @classmethod
+    def summarize_publisher(cls, v, info: ValidationInfo):
+        """
+        Validated straight from ORM rows: the User becomes its public summary.
+        The phone is only included with context={"include_phone": True} (detail page).
+        """
+        if v is None or isinstance(v, dict):
+            return v
+        summary = {'id': str(v.id), 'name': v.name, 'email': v.email}
+        if info.context and info.context.get('include_phone'):
+            summary['phone'] = v.phone
+        return summary
+
+
+class DogCardResponse(BaseModel):
+    """A listing card (GET /dogs/?view=card), read from the dog_cards table"""
+    id: UUID
+    name: str
+    breed: str
+    size: str
+    gender: str
+    age_years: int
+    age_months: int
+    province: Optional[str] = None
+    status: str
+    photo: Optional[str] = None  # first photo
+    summary: Optional[str] = None  # first characters of the description
+    latitude: float
+    longitude: float
+    publisher_id: UUID
+    publisher_name: str
+    created_at: datetime
+    updated_at: datetime
+    # Stored thumb variant of `photo`, else the photo itself
+    thumbnail: Optional[str] = Field(None, validate_default=True)
+
+    @field_validator('thumbnail', mode='after')
+    @classmethod
+    def thumbnail_or_photo(cls, v, info: ValidationInfo):
+        if not settings.IMAGE_VARIANTS_ENABLED:
+            return info.data.get('photo')
+        return v or info.data.get('photo')
+
+    class Config:
+        from_attributes = True
+
+
+class DogBatchRequest(BaseModel):
+    ids: List[UUID]
+
+
+class DogBatchResponse(BaseModel):
+    dogs: List[DogWithPublisher]  # in request order, duplicates collapsed
+    missing: List[UUID]  # requested ids that do not exist
+
+
+class FacetCount(BaseModel):
+    value: Optional[str] = None
+    count: int
+
+
+class AgeFacetCount(FacetCount):
+    age_min: int
+    age_max: Optional[int] = None
+
+
+class DogFacets(BaseModel):
+    total: int
+    size: List[FacetCount]
+    gender: List[FacetCount]
+    province: List[FacetCount]
+    age: List[AgeFacetCount]
+
 
 class DogSearchFilters(BaseModel):
     size: Optional[Literal['pequeño', 'mediano', 'grande']] = None
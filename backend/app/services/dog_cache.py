@@ -0,0 +1,110 @@
+from typing import Iterable, Optional, Tuple
+from uuid import UUID
+
+from ..core.cache import CacheEntry, response_cache
+from .dog_search import DogFilters
+
+LIST_PREFIX = "dogs:list:"
+DETAIL_PREFIX = "dogs:detail:"
+FACETS_PREFIX = "dogs:facets:"
+
+
+def list_cache_key(filters: DogFilters, cursor: Optional[str], skip: int, limit: int, view: str = "full") -> str:
+    return f"{LIST_PREFIX}{filters.cache_key()}|cursor={cursor or ''}|skip={skip}|limit={limit}|view={view}"
+
+
+def detail_cache_key(dog_id: UUID) -> str:
+    return f"{DETAIL_PREFIX}{dog_id}"
+
+
+def facets_cache_key(filters: DogFilters) -> str:
+    return f"{FACETS_PREFIX}{filters.cache_key()}"
+
+
+def list_entry_meta(
+    filters: DogFilters,
+    cursor: Optional[Tuple],
+    page_end: Optional[Tuple],
+    dog_ids: Iterable[UUID],
+    publisher_ids: Iterable[UUID]
+) -> dict:
+    """
+    What invalidation needs to know about a cached page:
+    its filters, the (created_at, id) range it covers and who is on it.
+    page_end is None when the page is the last one.
+    """
+    return {
+        "filters": filters,
+        "cursor": cursor,
+        "page_end": page_end,
+        "dog_ids": set(dog_ids),
+        "publisher_ids": set(publisher_ids),
+    }
+
+
+def _page_affected(meta: dict, dog: dict) -> bool:
+    """Whether a dog in the given state falls inside (or before, for offset pages) a cached page"""
+    if not meta["filters"].matches(dog):
+        return False
+
+    key = (dog["created_at"], dog["id"])
+    # Keyset pages only hold rows older than their cursor
+    if meta["cursor"] is not None and key >= meta["cursor"]:
+        return False
+    # Rows older than a full page's last row belong to later pages
+    if meta["page_end"] is not None and key < meta["page_end"]:
+        return False
+    return True
+
+
+async def invalidate_dog(dog_id: UUID, *states: Optional[dict]) -> None:
+    """
+    Drop cache entries a dog change can affect.
+    `states` are the dog_state() snapshots before and/or after the change.
+    """
+    states = [s for s in states if s is not None]
+
+    def affected(key: str, entry: CacheEntry) -> bool:
+        if key.startswith(DETAIL_PREFIX):
+            return key == detail_cache_key(dog_id)
+        if key.startswith(FACETS_PREFIX):
+            return any(entry.meta["filters"].matches(state) for state in states)
+        if not key.startswith(LIST_PREFIX):
+            return False
+        if dog_id in entry.meta["dog_ids"]:
+            return True
+        return any(_page_affected(entry.meta, state) for state in states)
+
+    await response_cache.invalidate_matching(affected)
+
+
+async def invalidate_publisher(publisher_id: UUID) -> None:
+    """Drop entries that embed a publisher's profile (after a profile change)"""
+    await response_cache.invalidate_matching(
+        lambda key, entry: publisher_id in entry.meta.get("publisher_ids", ())
+    )
+
+
+# Past this many changed dogs, checking every cached page costs more than refilling them
+BULK_INVALIDATION_THRESHOLD = 50
+
+
+async def invalidate_dogs(dog_ids: Iterable[UUID], states: Iterable[dict]) -> None:
+    """invalidate_dog for many dogs in one pass over the cache (bulk writes)"""
+    dog_ids = set(dog_ids)
+    detail_keys = {detail_cache_key(dog_id) for dog_id in dog_ids}
+    states = list(states)
+    drop_all_lists = len(states) > BULK_INVALIDATION_THRESHOLD
+
+    def affected(key: str, entry: CacheEntry) -> bool:
+        if key.startswith(DETAIL_PREFIX):
+            return key in detail_keys
+        if key.startswith(FACETS_PREFIX):
+            return drop_all_lists or any(entry.meta["filters"].matches(state) for state in states)
+        if not key.startswith(LIST_PREFIX):
+            return False
+        if drop_all_lists or not entry.meta["dog_ids"].isdisjoint(dog_ids):
+            return True
+        return any(_page_affected(entry.meta, state) for state in states)
+
+    await response_cache.invalidate_matching(affected)
@@ -0,0 +1,87 @@
+from typing import Iterable, Mapping
+from uuid import UUID
+import math
+
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.dog import Dog
+from ..models.dog_card import DogCard
+
+SUMMARY_LENGTH = 160
+
+# dogs columns copied to the card as they are
+CARD_COLUMNS = (
+    "name", "breed", "size", "gender", "age_years", "age_months", "province", "status",
+    "latitude", "longitude", "created_at", "updated_at",
+)
+
+
+def geo_keys(latitude: float, longitude: float) -> dict:
+    lat_rad = math.radians(latitude)
+    return {"lat_rad": lat_rad, "lon_rad": math.radians(longitude), "cos_lat": math.cos(lat_rad)}
+
+
+def card_values(dog: Mapping) -> dict:
+    """Card columns derived from a dogs row (the publisher's name aside)"""
+    photos = dog["photos"] or []
+    description = dog["description"]
+    return {
+        **{column: dog[column] for column in CARD_COLUMNS},
+        "photo": photos[0] if photos else None,
+        "summary": description[:SUMMARY_LENGTH] if description else None,
+        **geo_keys(dog["latitude"], dog["longitude"]),
+    }
+
+
+def card_row(dog: Mapping, publisher_name: str) -> dict:
+    """dog_cards row for a new dogs row"""
+    return {
+        "id": dog["id"],
+        "publisher_id": dog["publisher_id"],
+        "publisher_name": publisher_name,
+        **card_values(dog),
+    }
+
+
+def dog_values(dog: Dog) -> dict:
+    return {column.key: getattr(dog, column.key) for column in Dog.__table__.c}
+
+
+# Writes below run in the caller's transaction, after the dogs change they
+# mirror. updated_at is copied from the dogs row (UPDATE ... FROM dogs), since
+# databases created from init.sql set it with a trigger.
+
+async def update_card(db: AsyncSession, dog: Dog) -> None:
+    """After editing a dog (flushed)"""
+    values = card_values(dog_values(dog))
+    values["updated_at"] = Dog.updated_at
+    await db.execute(
+        update(DogCard)
+        .where(DogCard.id == Dog.id, Dog.id == dog.id)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def update_card_status(db: AsyncSession, dog_ids: Iterable[UUID], status: str) -> None:
+    await db.execute(
+        update(DogCard)
+        .where(DogCard.id == Dog.id, Dog.id.in_(list(dog_ids)))
+        .values(status=status, updated_at=Dog.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def delete_card(db: AsyncSession, dog_id: UUID) -> None:
+    # The foreign key cascades on PostgreSQL; SQLite doesn't enforce it
+    await db.execute(delete(DogCard).where(DogCard.id == dog_id))
+
+
+async def rename_publisher(db: AsyncSession, publisher_id: UUID, name: str) -> None:
+    await db.execute(
+        update(DogCard)
+        .where(DogCard.publisher_id == publisher_id, DogCard.publisher_name != name)
+        .values(publisher_name=name)
+        .execution_options(synchronize_session=False)
+    )
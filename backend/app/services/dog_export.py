@@ -0,0 +1,101 @@
+from sqlalchemy import select
+from datetime import datetime
+from typing import AsyncIterator
+from uuid import UUID
+import csv
+import io
+import json
+import zlib
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.dog import Dog
+from ..models.user import User
+from .dog_search import DogFilters
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+DOG_COLUMNS = [column.name for column in Dog.__table__.columns]
+# Same public publisher info as the listing (no phone)
+PUBLISHER_COLUMNS = ["publisher_name", "publisher_email"]
+CSV_COLUMNS = DOG_COLUMNS + PUBLISHER_COLUMNS
+
+# Matches the import format, so an export can be re-imported
+CSV_PHOTO_SEPARATOR = "|"
+
+
+def export_query(filters: DogFilters):
+    """Listing query as flat columns, newest first like GET /dogs"""
+    query = filters.apply(
+        select(*Dog.__table__.columns, User.name.label("publisher_name"), User.email.label("publisher_email"))
+        .join(User, Dog.publisher_id == User.id)
+    )
+    return query.order_by(Dog.created_at.desc(), Dog.id.desc())
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def ndjson_lines(rows) -> str:
+    lines = []
+    for row in rows:
+        record = {column: row[column] for column in DOG_COLUMNS}
+        record["publisher"] = {
+            "id": row["publisher_id"],
+            "name": row["publisher_name"],
+            "email": row["publisher_email"],
+        }
+        lines.append(json.dumps(record, ensure_ascii=False, default=_json_default, separators=(",", ":")))
+        lines.append("\n")
+    return "".join(lines)
+
+
+def csv_lines(rows, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    for row in rows:
+        writer.writerow([
+            CSV_PHOTO_SEPARATOR.join(row[column]) if column == "photos" else row[column]
+            for column in CSV_COLUMNS
+        ])
+    return buffer.getvalue()
+
+
+async def export_dogs(filters: DogFilters, format: str, gzip: bool = False) -> AsyncIterator[bytes]:
+    """
+    Stream every dog matching `filters` as NDJSON or CSV.
+    Rows come from a server-side cursor EXPORT_BATCH_SIZE at a time and are
+    encoded one batch per chunk, so memory does not grow with the result.
+    Runs in its own session because the response outlives the request's.
+    """
+    # wbits 16 + MAX_WBITS: gzip container rather than raw zlib
+    compressor = zlib.compressobj(settings.EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if gzip else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    if format == "csv":
+        yield encode(csv_lines([], header=True))
+
+    async with SessionLocal() as db:
+        result = await db.stream(
+            export_query(filters).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.mappings().partitions():
+            chunk = encode(ndjson_lines(rows) if format == "ndjson" else csv_lines(rows))
+            if chunk:
+                yield chunk
+
+    if compressor:
+        yield compressor.flush()
@@ -0,0 +1,109 @@
+from sqlalchemy import case, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
+
+from ..models.dog import Dog
+from .dog_search import DogFilters
+
+FACETS = ("size", "gender", "province", "age")
+
+# (label, age_min, age_max); bounds match the age_min / age_max listing filters
+AGE_BUCKETS = (
+    ("0-1", 0, 1),
+    ("2-3", 2, 3),
+    ("4-7", 4, 7),
+    ("8+", 8, None),
+)
+
+age_bucket = case(
+    *[(Dog.age_years <= age_max, label) for label, _, age_max in AGE_BUCKETS if age_max is not None],
+    else_=AGE_BUCKETS[-1][0]
+)
+
+FACET_COLUMNS = {
+    "size": Dog.size,
+    "gender": Dog.gender,
+    "province": Dog.province,
+    "age": age_bucket,
+}
+
+
+def _empty_counts() -> Dict[str, Dict[Optional[str], int]]:
+    return {facet: {} for facet in FACETS}
+
+
+def _add(counts: dict, facet: str, value: Optional[str], count: int):
+    counts[facet][value] = counts[facet].get(value, 0) + count
+
+
+def _facet_rows(filters: DogFilters):
+    """Matching dogs reduced to their facet values (the age bucket is computed once here)"""
+    return filters.apply(
+        select(*[column.label(facet) for facet, column in FACET_COLUMNS.items()])
+    ).subquery("facet_rows")
+
+
+async def _grouping_sets_counts(db: AsyncSession, filters: DogFilters):
+    """Postgres: one scan returning each facet's groups plus the total"""
+    rows = _facet_rows(filters)
+    columns = [rows.c[facet] for facet in FACETS]
+    # grouping() sets a column's bit (first column = highest bit) when the row did not group by it
+    query = select(
+        *columns,
+        func.grouping(*columns).label("grouping"),
+        func.count().label("count")
+    ).group_by(func.grouping_sets(*[tuple_(column) for column in columns], tuple_()))
+
+    total = 0
+    counts = _empty_counts()
+    all_columns = (1 << len(columns)) - 1
+    for row in (await db.execute(query)).all():
+        if row.grouping == all_columns:
+            total = row.count
+            continue
+        for position, facet in enumerate(FACETS):
+            if not row.grouping & (1 << (len(columns) - 1 - position)):
+                _add(counts, facet, getattr(row, facet), row.count)
+    return total, counts
+
+
+async def _combined_group_counts(db: AsyncSession, filters: DogFilters):
+    """Portable fallback: group by every facet at once and add up each facet's share"""
+    rows = _facet_rows(filters)
+    columns = [rows.c[facet] for facet in FACETS]
+    query = select(*columns, func.count().label("count")).group_by(*columns)
+
+    total = 0
+    counts = _empty_counts()
+    for row in (await db.execute(query)).all():
+        total += row.count
+        for facet in FACETS:
+            _add(counts, facet, getattr(row, facet), row.count)
+    return total, counts
+
+
+async def facet_counts(db: AsyncSession, filters: DogFilters) -> dict:
+    """
+    Counts of dogs matching `filters` per size, gender, province and age bucket.
+    Every value of a facet is counted within the full filter set, so picking
+    one narrows the others.
+    """
+    if db.bind.dialect.name == "postgresql":
+        total, counts = await _grouping_sets_counts(db, filters)
+    else:
+        total, counts = await _combined_group_counts(db, filters)
+
+    def ordered(facet: str) -> list:
+        values = sorted(counts[facet].items(), key=lambda item: (-item[1], item[0] or ""))
+        return [{"value": value, "count": count} for value, count in values]
+
+    return {
+        "total": total,
+        "size": ordered("size"),
+        "gender": ordered("gender"),
+        "province": ordered("province"),
+        "age": [
+            {"value": label, "age_min": age_min, "age_max": age_max, "count": counts["age"].get(label, 0)}
+            for label, age_min, age_max in AGE_BUCKETS
+        ],
+    }
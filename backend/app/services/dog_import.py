@@ -0,0 +1,227 @@
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple, Union
+from uuid import UUID
+import codecs
+import csv
+import json
+
+from ..core.config import settings
+from ..models.dog import Dog
+from ..models.dog_card import DogCard
+from ..models.status_history import DogStatusHistory
+from ..schemas.dog import DogCreate
+from .dog_cache import invalidate_dogs
+from .dog_cards import card_row
+from .dog_search import row_state
+from .dog_writes import history_row, new_dog_row
+
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json-lines": "ndjson",
+}
+
+# Separator for several photo URLs in one CSV cell
+CSV_PHOTO_SEPARATOR = "|"
+
+# (row number, parsed record or the reason it could not be parsed)
+Record = Tuple[int, Union[dict, str]]
+
+_dog_batch = TypeAdapter(List[DogCreate])
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[dict] = field(default_factory=list)
+
+    def add_error(self, row: int, errors: List[dict]):
+        self.failed += 1
+        if len(self.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a UTF-8 byte stream (optional BOM) into lines without buffering the whole body"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in stream:
+        lines = (pending + decoder.decode(chunk)).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_ndjson(stream: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    row = 0
+    async for line in iter_lines(stream):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row, f"Invalid JSON: {e.msg}"
+            continue
+        yield row, record if isinstance(record, dict) else "Each line must be a JSON object"
+
+
+async def iter_csv_records(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Join physical lines into CSV records (quoted fields may contain newlines)"""
+    record = None
+    async for line in iter_lines(stream):
+        record = line if record is None else f"{record}\n{line}"
+        # Quotes come in pairs ("" escapes one) once the record is complete
+        if record.count('"') % 2 == 0:
+            yield record
+            record = None
+
+    if record is not None:
+        yield record
+
+
+async def iter_csv(stream: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """
+    CSV with a header row naming DogCreate fields.
+    Empty cells are treated as missing; `photos` holds URLs separated by '|'.
+    """
+    header = None
+    row = 0
+    async for text in iter_csv_records(stream):
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+
+        row += 1
+        if len(values) != len(header):
+            yield row, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+
+        record = {name: value for name, value in zip(header, values) if value != ""}
+        if "photos" in record:
+            record["photos"] = [url.strip() for url in record["photos"].split(CSV_PHOTO_SEPARATOR) if url.strip()]
+        yield row, record
+
+
+def validate_batch(records: List[Tuple[int, dict]], report: ImportReport) -> List[DogCreate]:
+    """
+    Validate a batch in one pass; only batches with errors are re-validated
+    row by row to tell which rows failed.
+    """
+    try:
+        return _dog_batch.validate_python([record for _, record in records])
+    except ValidationError:
+        pass
+
+    dogs = []
+    for row, record in records:
+        try:
+            dogs.append(DogCreate.model_validate(record))
+        except ValidationError as e:
+            report.add_error(row, [
+                {"loc": list(error["loc"]), "msg": error["msg"]}
+                for error in e.errors(include_url=False, include_context=False, include_input=False)
+            ])
+    return dogs
+
+
+async def insert_batch(db: AsyncSession, dogs: List[DogCreate], publisher_id: UUID, publisher_name: str) -> List[dict]:
+    """
+    Insert dogs, their initial status history and their listing cards in the
+    current transaction. Uses COPY on asyncpg, multi-row INSERT elsewhere.
+    Returns the inserted rows.
+    """
+    now = datetime.utcnow()
+    dog_rows = [new_dog_row(dog, publisher_id, now) for dog in dogs]
+    history_rows = [history_row(row["id"], None, row["status"], now) for row in dog_rows]
+    card_rows = [card_row(row, publisher_name) for row in dog_rows]
+
+    connection = await db.connection()
+    if connection.dialect.driver == "asyncpg":
+        raw = (await connection.get_raw_connection()).driver_connection
+        tables = ((Dog.__table__, dog_rows), (DogStatusHistory.__table__, history_rows), (DogCard.__table__, card_rows))
+        for table, rows in tables:
+            columns = list(rows[0])
+            await raw.copy_records_to_table(
+                table.name,
+                records=[tuple(row[column] for column in columns) for row in rows],
+                columns=columns,
+            )
+    else:
+        await db.execute(insert(Dog), dog_rows)
+        await db.execute(insert(DogStatusHistory), history_rows)
+        await db.execute(insert(DogCard), card_rows)
+
+    return dog_rows
+
+
+async def import_dogs(
+    db: AsyncSession, records: AsyncIterator[Record], publisher_id: UUID, publisher_name: str
+) -> ImportReport:
+    """
+    Validate and insert records in batches of IMPORT_BATCH_SIZE.
+    Each batch commits on its own, so a late failure keeps earlier batches.
+    """
+    report = ImportReport()
+    batch: List[Tuple[int, dict]] = []
+
+    async def flush():
+        dogs = validate_batch(batch, report)
+        batch.clear()
+        if not dogs:
+            return
+
+        rows = await insert_batch(db, dogs, publisher_id, publisher_name)
+        await db.commit()
+        report.inserted += len(rows)
+        await invalidate_dogs((row["id"] for row in rows), (row_state(row) for row in rows))
+
+    async for row, record in records:
+        if report.rows >= settings.IMPORT_MAX_ROWS:
+            report.add_error(row, [{"loc": [], "msg": f"Import is limited to {settings.IMPORT_MAX_ROWS} rows"}])
+            break
+
+        report.rows += 1
+        if isinstance(record, str):
+            report.add_error(row, [{"loc": [], "msg": record}])
+            continue
+
+        batch.append((row, record))
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+            await flush()
+
+    if batch:
+        await flush()
+
+    return report
+
+
+def import_format(content_type: Optional[str], requested: Optional[str]) -> Optional[str]:
+    """Format from the explicit parameter, else from the Content-Type header"""
+    if requested:
+        return requested
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return IMPORT_FORMATS.get(media_type)
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from ..models.dog import Dog
+from ..models.dog_card import DogCard
+from .geo import calculate_distance, radius_filter
+from .text_search import search_condition
+
+
+@dataclass(frozen=True)
+class DogFilters:
+    """Normalized listing filters shared by the query, cache keys and invalidation"""
+    status: Optional[str] = "disponible"
+    size: Optional[str] = None
+    gender: Optional[str] = None
+    age_min: Optional[int] = None
+    age_max: Optional[int] = None
+    province: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    radius_km: Optional[float] = None
+    q: Optional[str] = None
+
+    @property
+    def has_radius(self) -> bool:
+        return self.latitude is not None and self.longitude is not None and self.radius_km is not None
+
+    def apply(self, query, model=Dog):
+        """
+        Add the WHERE clauses for these filters to a select() of `model`:
+        Dog, or DogCard for the card listing (without `q`, which searches dogs).
+        """
+        if self.status:
+            query = query.filter(model.status == self.status)
+        if self.size:
+            query = query.filter(model.size == self.size)
+        if self.gender:
+            query = query.filter(model.gender == self.gender)
+        if self.age_min is not None:
+            query = query.filter(model.age_years >= self.age_min)
+        if self.age_max is not None:
+            query = query.filter(model.age_years <= self.age_max)
+        if self.province:
+            query = query.filter(model.province == self.province)
+
+        # Radius filter (bounding box on the lat/lon index, then exact distance)
+        if self.has_radius:
+            geo_keys = (model.lat_rad, model.lon_rad, model.cos_lat) if model is DogCard else None
+            query = query.filter(*radius_filter(
+                model.latitude, model.longitude, self.latitude, self.longitude, self.radius_km, geo_keys
+            ))
+
+        if self.q:
+            query = query.filter(search_condition(self.q))
+
+        return query
+
+    def matches(self, dog: dict) -> bool:
+        """
+        Whether a dog (as returned by dog_state) would be selected by these filters.
+        The text search `q` is not checked, so search results err on the side of a match.
+        """
+        if self.status and dog["status"] != self.status:
+            return False
+        if self.size and dog["size"] != self.size:
+            return False
+        if self.gender and dog["gender"] != self.gender:
+            return False
+        if self.age_min is not None and dog["age_years"] < self.age_min:
+            return False
+        if self.age_max is not None and dog["age_years"] > self.age_max:
+            return False
+        if self.province and dog["province"] != self.province:
+            return False
+        if self.has_radius:
+            distance = calculate_distance(self.latitude, self.longitude, dog["latitude"], dog["longitude"])
+            if distance > self.radius_km:
+                return False
+        return True
+
+    def cache_key(self) -> str:
+        return "&".join(
+            f"{name}={value}"
+            for name, value in sorted(vars(self).items())
+            if value is not None
+        )
+
+
+# Fields listing filters and pagination look at
+STATE_FIELDS = (
+    "id", "status", "size", "gender", "age_years", "province",
+    "latitude", "longitude", "created_at", "publisher_id",
+)
+
+
+def dog_state(dog: Dog) -> dict:
+    """Snapshot of the fields listing filters and pagination look at"""
+    return {field: getattr(dog, field) for field in STATE_FIELDS}
+
+
+def row_state(row: dict) -> dict:
+    """dog_state for a dogs row given as a dict (bulk writes)"""
+    return {field: row[field] for field in STATE_FIELDS}
@@ -0,0 +1,133 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+import uuid
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.dog import Dog
+from ..models.dog_card import DogCard
+from ..models.status_history import DogStatusHistory
+from ..schemas.dog import DogCreate
+from .dog_cards import card_row, update_card_status
+
+DOG_COLUMNS = list(Dog.__table__.c)
+
+# Why a dog was left out of a bulk status change (same wording as the single-dog endpoint)
+NOT_FOUND = "Dog not found"
+NOT_OWNER = "Not authorized to update this dog"
+ADOPTED = "Cannot change status of adopted dog"
+
+
+def new_dog_row(dog: DogCreate, publisher_id: UUID, now: datetime) -> dict:
+    """dogs row for a new listing, ids and timestamps included so it can be written in one statement"""
+    return {
+        **dog.model_dump(),
+        "id": uuid.uuid4(),
+        "status": "disponible",
+        "publisher_id": publisher_id,
+        "created_at": now,
+        "updated_at": now,
+        "adopted_at": None,
+    }
+
+
+def history_row(dog_id: UUID, old_status: Optional[str], new_status: str, now: datetime) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "dog_id": dog_id,
+        "old_status": old_status,
+        "new_status": new_status,
+        "changed_at": now,
+    }
+
+
+async def insert_dog(db: AsyncSession, dog: DogCreate, publisher_id: UUID, publisher_name: str) -> dict:
+    """
+    Insert a dog, its initial status history and its listing card in the
+    current transaction. On PostgreSQL that is one statement, INSERT ...
+    RETURNING with the other inserts as CTEs; other drivers run one INSERT
+    per table, three statements (benchmarks/query_budgets.py budgets both).
+    Returns the stored dogs row.
+    """
+    row = new_dog_row(dog, publisher_id, datetime.utcnow())
+    history = history_row(row["id"], None, row["status"], row["created_at"])
+    card = card_row(row, publisher_name)
+
+    connection = await db.connection()
+    if connection.dialect.name == "postgresql":
+        new_dog = insert(Dog).values(row).returning(*DOG_COLUMNS).cte("new_dog")
+        log_status = insert(DogStatusHistory).values(history).cte("log_status")
+        new_card = insert(DogCard).values(card).cte("new_card")
+        return dict((await db.execute(select(new_dog).add_cte(log_status, new_card))).one()._mapping)
+
+    created = dict((await db.execute(insert(Dog).values(row).returning(*DOG_COLUMNS))).one()._mapping)
+    await db.execute(insert(DogStatusHistory).values(history))
+    await db.execute(insert(DogCard).values(card))
+    return created
+
+
+@dataclass
+class StatusChange:
+    updated: List[dict] = field(default_factory=list)  # dogs rows after the change
+    old_status: Dict[UUID, str] = field(default_factory=dict)
+    unchanged: List[UUID] = field(default_factory=list)  # already in the requested status
+    rejected: List[dict] = field(default_factory=list)  # {"id", "detail"}
+
+
+async def change_dogs_status(db: AsyncSession, dog_ids: List[UUID], new_status: str, publisher_id: UUID) -> StatusChange:
+    """
+    Move a publisher's dogs to `new_status` in the current transaction: a
+    locking SELECT sorts the ids, one UPDATE ... RETURNING changes the dogs,
+    one multi-row INSERT logs their history and one UPDATE their cards.
+    Unknown ids, other publishers' dogs and adopted dogs are rejected.
+    """
+    dog_ids = list(dict.fromkeys(dog_ids))
+    current = {
+        row.id: row
+        for row in await db.execute(
+            select(Dog.id, Dog.status, Dog.publisher_id).where(Dog.id.in_(dog_ids)).with_for_update()
+        )
+    }
+
+    change = StatusChange()
+    for dog_id in dog_ids:
+        row = current.get(dog_id)
+        if row is None:
+            change.rejected.append({"id": dog_id, "detail": NOT_FOUND})
+        elif row.publisher_id != publisher_id:
+            change.rejected.append({"id": dog_id, "detail": NOT_OWNER})
+        elif row.status == "adoptado":
+            change.rejected.append({"id": dog_id, "detail": ADOPTED})
+        elif row.status == new_status:
+            change.unchanged.append(dog_id)
+        else:
+            change.old_status[dog_id] = row.status
+
+    if not change.old_status:
+        return change
+
+    now = datetime.utcnow()
+    values = {"status": new_status, "updated_at": now}
+    if new_status == "adoptado":
+        values["adopted_at"] = now
+
+    # Ownership and the adoptado rule are part of the statement too, not only of the checks above
+    updated = await db.execute(
+        update(Dog)
+        .where(Dog.id.in_(list(change.old_status)), Dog.publisher_id == publisher_id, Dog.status != "adoptado")
+        .values(values)
+        .returning(*DOG_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    rows = {row.id: dict(row._mapping) for row in updated}
+    # RETURNING order is unspecified; report in request order
+    change.updated = [rows[dog_id] for dog_id in change.old_status if dog_id in rows]
+
+    await db.execute(insert(DogStatusHistory), [
+        history_row(row["id"], change.old_status[row["id"]], new_status, now) for row in change.updated
+    ])
+    await update_card_status(db, (row["id"] for row in change.updated), new_status)
+    return change
@@ -0,0 +1,92 @@
+from sqlalchemy import func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import GenericFunction
+from typing import Tuple
+import math
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+
+class least(GenericFunction):
+    """LEAST() that also compiles on SQLite, which spells it min()"""
+    inherit_cache = True
+
+
+@compiles(least, "sqlite")
+def _compile_least_sqlite(element, compiler, **kw):
+    return f"min({compiler.process(element.clauses, **kw)})"
+
+
+def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Calculate distance between two points in kilometers using Haversine formula"""
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Return (min_lat, max_lat, min_lon, max_lon) enclosing the search circle.
+    The box is a cheap index-friendly prefilter; the exact distance check
+    still has to run on the rows it returns.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE_LAT
+    min_lat = max(latitude - delta_lat, -90.0)
+    max_lat = min(latitude + delta_lat, 90.0)
+
+    # Near the poles (or for huge radii) the longitude span covers everything
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat <= 1e-9 or delta_lat / cos_lat >= 180:
+        return min_lat, max_lat, -180.0, 180.0
+
+    delta_lon = delta_lat / cos_lat
+    return min_lat, max_lat, longitude - delta_lon, longitude + delta_lon
+
+
+def distance_expression(lat_column, lon_column, latitude: float, longitude: float, geo_keys=None):
+    """
+    SQL expression computing the Haversine distance in kilometers to a point.
+    geo_keys: (lat_rad, lon_rad, cos_lat) columns stored per row, used instead
+    of computing them from lat_column/lon_column.
+    """
+    if geo_keys is not None:
+        row_lat_rad, row_lon_rad, row_cos_lat = geo_keys
+    else:
+        row_lat_rad, row_lon_rad = func.radians(lat_column), func.radians(lon_column)
+        row_cos_lat = func.cos(row_lat_rad)
+
+    lat_rad = math.radians(latitude)
+    half_dlat = (row_lat_rad - lat_rad) / 2
+    half_dlon = (row_lon_rad - math.radians(longitude)) / 2
+
+    a = (
+        func.power(func.sin(half_dlat), 2)
+        + math.cos(lat_rad) * row_cos_lat * func.power(func.sin(half_dlon), 2)
+    )
+    # least() guards asin against rounding slightly above 1
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(least(a, 1.0)))
+
+
+def radius_filter(lat_column, lon_column, latitude: float, longitude: float, radius_km: float, geo_keys=None) -> list:
+    """Filter clauses restricting rows to a radius: bounding box first, then exact distance"""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+
+    clauses = [lat_column.between(min_lat, max_lat)]
+
+    # Longitude window may wrap around the antimeridian
+    if min_lon < -180:
+        clauses.append((lon_column >= min_lon + 360) | (lon_column <= max_lon))
+    elif max_lon > 180:
+        clauses.append((lon_column >= min_lon) | (lon_column <= max_lon - 360))
+    elif min_lon > -180 or max_lon < 180:
+        clauses.append(lon_column.between(min_lon, max_lon))
+
+    clauses.append(distance_expression(lat_column, lon_column, latitude, longitude, geo_keys) <= radius_km)
+    return clauses
@@ -0,0 +1,87 @@
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+import math
+import os
+import posixpath
+
+from PIL import Image, ImageOps
+
+from ..core.config import settings
+
+# Longest edge in pixels for each derivative; images are never upscaled
+VARIANT_SIZES = {
+    "thumb": 160,
+    "card": 480,
+    "full": 1600,
+}
+
+VARIANT_FORMATS = {
+    "WEBP": ("webp", "image/webp"),
+    "JPEG": ("jpg", "image/jpeg"),
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def variant_file_name(file_name: str, variant: str) -> str:
+    """photo.jpg -> photo_card.webp (owner/photo.jpg -> owner/photo_card.webp)"""
+    extension, _ = VARIANT_FORMATS[settings.IMAGE_VARIANT_FORMAT]
+    path = PurePosixPath(file_name)
+    return str(path.with_name(f"{path.stem}_{variant}.{extension}"))
+
+
+def variant_urls(photo_url: str) -> Dict[str, str]:
+    # Runs for every photo of every dog in a listing: one split per photo and
+    # string operations rather than PurePosixPath
+    parts = urlsplit(photo_url)
+    directory, separator, name = parts.path.rpartition("/")
+    prefix = f"{directory}{separator}{posixpath.splitext(name)[0]}"
+    extension, _ = VARIANT_FORMATS[settings.IMAGE_VARIANT_FORMAT]
+    return {
+        variant: urlunsplit(parts._replace(path=f"{prefix}_{variant}.{extension}"))
+        for variant in VARIANT_SIZES
+    }
+
+
+def render_variants(source_path: str, image_format: str = "WEBP", quality: int = 80) -> Dict[str, bytes]:
+    """
+    Decode an image once and encode every variant.
+    EXIF orientation is applied to the pixels and no metadata is written.
+    Runs in worker processes, so it only takes and returns picklable values.
+    """
+    with Image.open(source_path) as image:
+        # Let the JPEG decoder downscale (1/2, 1/4, 1/8) as far as the largest variant allows
+        largest = max(VARIANT_SIZES.values())
+        scale = min(1.0, largest / max(image.size))
+        image.draft("RGB", (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+        image = ImageOps.exif_transpose(image)
+
+        keep_alpha = image_format == "WEBP" and image.mode in ("RGBA", "LA", "P")
+        image = image.convert("RGBA" if keep_alpha else "RGB")
+
+        variants = {}
+        # Largest first so each step resizes the previous, smaller result
+        for variant, size in sorted(VARIANT_SIZES.items(), key=lambda item: -item[1]):
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            buffer = BytesIO()
+            image.save(buffer, format=image_format, quality=quality, method=4 if image_format == "WEBP" else 0)
+            variants[variant] = buffer.getvalue()
+
+    return variants
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS or os.cpu_count())
+    return _pool
+
+
+def shutdown_image_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,36 @@
+from typing import Dict, Iterable
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.photo_variants import PhotoVariants
+
+
+async def stored_variants(db: AsyncSession, photo_urls: Iterable[str]) -> Dict[str, Dict[str, str]]:
+    """
+    thumb/card/full URLs of the given photos that have stored variants, by photo URL.
+    Passed to DogResponse validation as context={"photo_variants": ...}.
+    """
+    photo_urls = set(photo_urls)
+    if not photo_urls or not settings.IMAGE_VARIANTS_ENABLED:
+        return {}
+    rows = await db.execute(select(PhotoVariants).where(PhotoVariants.photo_url.in_(photo_urls)))
+    return {row.photo_url: row.urls() for row in rows.scalars()}
+
+
+async def record_variants(photo_url: str, urls: Dict[str, str]) -> None:
+    """After every variant of a photo was stored (runs in a background task, so in its own session)"""
+    async with SessionLocal() as db:
+        # Content-addressed photos can be rendered again on re-upload
+        await db.merge(PhotoVariants(photo_url=photo_url, **urls))
+        await db.commit()
+
+
+async def forget_variants(db: AsyncSession, photo_urls: Iterable[str]) -> None:
+    photo_urls = list(photo_urls)
+    if not photo_urls:
+        return
+    await db.execute(delete(PhotoVariants).where(PhotoVariants.photo_url.in_(photo_urls)))
+    await db.commit()
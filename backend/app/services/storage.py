@@ -1,54 +1,336 @@
-from supabase import create_client, Client
-from ..core.config import settings
-from typing import Optional
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Union
+from urllib.parse import quote, unquote, urlsplit
+from uuid import UUID
+import hashlib
 import os
+import posixpath
+import shutil
+import tempfile
+
+import anyio
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+from ..core.metrics import time_storage
+
+# Raw bytes or an async stream of chunks
+Content = Union[bytes, AsyncIterator[bytes]]
+
+
+class StorageError(Exception):
+    """A storage backend could not complete an operation"""
+
+
+class StorageNotFound(StorageError):
+    pass
+
+
+class StorageExists(StorageError):
+    """A put with overwrite=False found the key already stored"""
+    metric_outcome = "exists"
+
+
+@dataclass
+class SpooledFile:
+    """An upload written to local disk, with its size and SHA-256 computed on the way"""
+    path: str
+    size: int
+    digest: str
+
+
+def content_key(owner: UUID, digest: str, extension: str) -> str:
+    """
+    Content-addressed file name under the uploader's prefix: a user's
+    re-uploads share one object, other users' identical files do not.
+    """
+    return f"{owner}/{digest}{extension}"
+
+
+def canonical_key(key: str) -> Optional[str]:
+    """
+    `key` if it names exactly one object, else None. Keys with empty, "." or
+    ".." segments are rejected: backends resolve them, so a key that passes
+    a prefix check could still address another folder.
+    """
+    if any(segment in ("", ".", "..") for segment in key.split("/")) or posixpath.normpath(key) != key:
+        return None
+    return key
+
+
+async def read_chunks(path: str, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    async with await anyio.open_file(path, "rb") as file:
+        while chunk := await file.read(chunk_size):
+            yield chunk
+
+
+async def iter_content(content: Content) -> AsyncIterator[bytes]:
+    if isinstance(content, bytes):
+        yield content
+    else:
+        async for chunk in content:
+            yield chunk
+
+
+class StorageBackend(ABC):
+    """
+    Object storage addressed by slash-separated keys.
+    Backends raise StorageError; errors raised by a content stream
+    (e.g. upload size limits) propagate unchanged.
+    """
+
+    @abstractmethod
+    async def put(
+        self, key: str, content: Content, content_type: str, size: Optional[int] = None, overwrite: bool = True
+    ) -> str:
+        """
+        Store `content` under `key` and return its public URL. With
+        overwrite=False an existing object is kept and StorageExists raised.
+        """
+
+    async def put_file(self, key: str, path: str, content_type: str, overwrite: bool = True) -> str:
+        """Store a local file; backends may override with something cheaper than streaming"""
+        return await self.put(key, read_chunks(path), content_type, size=os.path.getsize(path), overwrite=overwrite)
+
+    @abstractmethod
+    def get(self, key: str) -> AsyncIterator[bytes]:
+        """Stream an object's bytes"""
+
+    @abstractmethod
+    async def delete(self, keys: List[str]) -> None:
+        """Delete several objects; missing keys are ignored"""
+
+    @abstractmethod
+    def public_url(self, key: str) -> str:
+        ...
+
+    @abstractmethod
+    def key_from_url(self, url: str) -> Optional[str]:
+        """Inverse of public_url (see canonical_key); None for URLs this backend did not produce"""
+
+    async def close(self) -> None:
+        pass
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Objects as files under `root`, served by the app at `base_url`.
+    For development, tests and load tests without network access.
+    """
+
+    def __init__(self, root: str, base_url: str = "/media"):
+        self.root = Path(root).resolve()
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if path == self.root or not path.is_relative_to(self.root):
+            raise StorageError(f"Invalid key: {key}")
+        return path
+
+    @staticmethod
+    def _publish(partial, target: Path, key: str, overwrite: bool):
+        """Move a fully written file into place; a hard link fails atomically if the target exists"""
+        if overwrite:
+            os.replace(partial, target)
+            return
+        try:
+            os.link(partial, target)
+        except FileExistsError:
+            raise StorageExists(key) from None
+
+    async def put(
+        self, key: str, content: Content, content_type: str, size: Optional[int] = None, overwrite: bool = True
+    ) -> str:
+        path = self._path(key)
+
+        # Write next to the target and rename, so readers never see partial files
+        partial = anyio.Path(path.with_name(f".{path.name}.{os.urandom(4).hex()}.partial"))
+        try:
+            await partial.parent.mkdir(parents=True, exist_ok=True)
+            async with await anyio.open_file(partial, "wb") as file:
+                async for chunk in iter_content(content):
+                    await file.write(chunk)
+            await run_in_threadpool(self._publish, partial, path, key, overwrite)
+        except OSError as e:
+            raise StorageError(f"Upload of {key} failed: {e}") from e
+        finally:
+            await partial.unlink(missing_ok=True)
+
+        return self.public_url(key)
+
+    async def put_file(self, key: str, path: str, content_type: str, overwrite: bool = True) -> str:
+        target = self._path(key)
+        partial = target.with_name(f".{target.name}.{os.urandom(4).hex()}.partial")
+
+        def copy():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                shutil.copyfile(path, partial)
+                self._publish(partial, target, key, overwrite)
+            finally:
+                partial.unlink(missing_ok=True)
+
+        # One thread hop for the whole copy instead of one per chunk
+        try:
+            await run_in_threadpool(copy)
+        except OSError as e:
+            raise StorageError(f"Upload of {key} failed: {e}") from e
+        return self.public_url(key)
+
+    async def get(self, key: str) -> AsyncIterator[bytes]:
+        path = self._path(key)
+        if not await anyio.Path(path).is_file():
+            raise StorageNotFound(key)
+        async for chunk in read_chunks(str(path)):
+            yield chunk
+
+    async def delete(self, keys: List[str]) -> None:
+        try:
+            for key in keys:
+                await anyio.Path(self._path(key)).unlink(missing_ok=True)
+        except OSError as e:
+            raise StorageError(f"Delete failed: {e}") from e
+
+    def public_url(self, key: str) -> str:
+        return f"{self.base_url}/{quote(key)}"
+
+    def key_from_url(self, url: str) -> Optional[str]:
+        prefix = urlsplit(self.base_url).path + "/"
+        path = urlsplit(url).path
+        if not path.startswith(prefix):
+            return None
+        return canonical_key(unquote(path[len(prefix):]))
+
+
+def create_storage_backend() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageBackend(settings.STORAGE_LOCAL_ROOT, settings.STORAGE_LOCAL_BASE_URL)
+
+    # Imported here: httpx adds a noticeable share of the app's import time
+    from .storage_supabase import SupabaseStorageBackend
+
+    return SupabaseStorageBackend(
+        settings.SUPABASE_URL,
+        settings.SUPABASE_KEY,
+        settings.SUPABASE_STORAGE_BUCKET,
+        max_connections=settings.STORAGE_HTTP_MAX_CONNECTIONS,
+        timeout=settings.STORAGE_HTTP_TIMEOUT,
+    )
 
 
 class StorageService:
-    def __init__(self):
-        self.supabase: Client = create_client(
-            settings.SUPABASE_URL,
-            settings.SUPABASE_KEY
-        )
-        self.bucket = settings.SUPABASE_STORAGE_BUCKET
+    """Upload helpers used by the API on top of the configured backend"""
+
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        self._backend = backend
+
+    @property
+    def backend(self) -> StorageBackend:
+        # Built on first use, so importing the app creates no HTTP client
+        if self._backend is None:
+            self._backend = create_storage_backend()
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: StorageBackend):
+        self._backend = backend
 
     async def upload_file(
         self,
-        file_content: bytes,
+        file_content: Content,
         file_name: str,
         content_type: str,
-        folder: str = "dogs"
+        folder: str = "dogs",
+        size: Optional[int] = None
     ) -> Optional[str]:
-        """Upload a file to Supabase Storage"""
+        """
+        Upload bytes or a chunk stream; returns the public URL, or None if storage failed.
+        Errors raised by the stream itself (e.g. size limits) propagate to the caller.
+        """
         try:
-            file_path = f"{folder}/{file_name}"
-
-            result = self.supabase.storage.from_(self.bucket).upload(
-                path=file_path,
-                file=file_content,
-                file_options={"content-type": content_type}
-            )
+            with time_storage("put"):
+                return await self.backend.put(f"{folder}/{file_name}", file_content, content_type, size)
+        except StorageError as e:
+            print(f"Error uploading file: {e}")
+            return None
 
-            # Get public URL
-            public_url = self.supabase.storage.from_(self.bucket).get_public_url(file_path)
-            return public_url
+    async def spool(self, chunks: AsyncIterator[bytes]) -> SpooledFile:
+        """Write chunks to a temporary file, hashing them on the way; the caller removes it"""
+        spool = tempfile.NamedTemporaryFile(prefix="upload-", delete=False)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            # Chunk-sized writes land in the page cache; a thread hop per chunk would cost more
+            with spool:
+                async for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    spool.write(chunk)
+        except BaseException:
+            os.unlink(spool.name)
+            raise
+        return SpooledFile(path=spool.name, size=size, digest=digest.hexdigest())
 
-        except Exception as e:
+    async def upload_spooled(
+        self,
+        spooled: SpooledFile,
+        file_name: str,
+        content_type: str,
+        folder: str = "dogs",
+        overwrite: bool = True
+    ) -> Optional[str]:
+        """
+        Upload a spooled file, streaming it from disk.
+        With overwrite=False, StorageExists propagates when the file is already stored.
+        """
+        try:
+            with time_storage("put_file"):
+                return await self.backend.put_file(f"{folder}/{file_name}", spooled.path, content_type, overwrite)
+        except StorageExists:
+            raise
+        except StorageError as e:
             print(f"Error uploading file: {e}")
             return None
 
+    def key_from_url(self, file_url: str) -> Optional[str]:
+        return self.backend.key_from_url(file_url)
+
+    def public_url(self, key: str) -> str:
+        return self.backend.public_url(key)
+
+    def stream_file(self, file_url: str) -> AsyncIterator[bytes]:
+        """Stream a stored file by its public URL"""
+        key = self.backend.key_from_url(file_url)
+        if key is None:
+            raise StorageNotFound(file_url)
+        return self.backend.get(key)
+
     async def delete_file(self, file_url: str) -> bool:
-        """Delete a file from Supabase Storage"""
-        try:
-            # Extract path from URL
-            file_path = file_url.split(f"{self.bucket}/")[-1]
+        """Delete a file from storage"""
+        return await self.delete_files([file_url])
 
-            self.supabase.storage.from_(self.bucket).remove([file_path])
-            return True
+    async def delete_files(self, file_urls: List[str]) -> bool:
+        """Delete several files in one backend call"""
+        keys = [self.backend.key_from_url(file_url) for file_url in file_urls]
+        if None in keys:
+            print(f"Error deleting files: not stored by this backend: {file_urls}")
+            return False
 
-        except Exception as e:
-            print(f"Error deleting file: {e}")
+        try:
+            with time_storage("delete"):
+                await self.backend.delete(keys)
+            return True
+        except StorageError as e:
+            print(f"Error deleting files: {e}")
             return False
 
+    async def close(self):
+        if self._backend is not None:
+            await self._backend.close()
+
 
 storage_service = StorageService()
@@ -0,0 +1,73 @@
+from sqlalchemy import and_, case, func, literal, literal_column, or_, text, true
+from sqlalchemy.ext.asyncio import AsyncConnection
+from typing import List
+import re
+
+from ..core.database import engine
+from ..models.dog import SEARCH_CONFIG, Dog
+
+# Generated column (Postgres only), not mapped so ORM loads skip it
+search_vector = literal_column("dogs.search_vector")
+
+# Fallback (SQLite): per-column weights, mirroring the tsvector weights
+FALLBACK_WEIGHTS = ((Dog.name, 4), (Dog.breed, 4), (Dog.color, 2), (Dog.description, 1))
+
+
+class SearchFeatures:
+    """What the connected database supports; set at startup by detect_search_features"""
+    trigram: bool = False
+
+
+search_features = SearchFeatures()
+
+
+def is_postgres() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+async def detect_search_features(conn: AsyncConnection) -> None:
+    """Enable fuzzy breed matching when the pg_trgm extension is installed"""
+    if conn.dialect.name != "postgresql":
+        return
+    installed = await conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+    search_features.trigram = installed.first() is not None
+
+
+def search_terms(q: str) -> List[str]:
+    return re.findall(r"\w+", q.lower())
+
+
+def _fallback_term(term: str):
+    pattern = f"%{term}%"
+    return [(column.ilike(pattern), weight) for column, weight in FALLBACK_WEIGHTS]
+
+
+def search_condition(q: str):
+    """WHERE clause for a text search"""
+    if not is_postgres():
+        # Every term must appear in at least one column
+        return and_(true(), *[
+            or_(*[match for match, _ in _fallback_term(term)]) for term in search_terms(q)
+        ])
+
+    condition = search_vector.op("@@")(func.websearch_to_tsquery(SEARCH_CONFIG, q))
+    if search_features.trigram:
+        # `q <% breed`: word_similarity above pg_trgm.word_similarity_threshold,
+        # answered by the trigram index on breed
+        condition = or_(condition, literal(q).op("<%")(Dog.breed))
+    return condition
+
+
+def search_rank(q: str):
+    """Relevance of a matching dog, higher first"""
+    if not is_postgres():
+        rank = literal(0)
+        for term in search_terms(q):
+            for match, weight in _fallback_term(term):
+                rank = rank + case((match, weight), else_=0)
+        return rank
+
+    rank = func.ts_rank_cd(search_vector, func.websearch_to_tsquery(SEARCH_CONFIG, q))
+    if search_features.trigram:
+        rank = rank + func.word_similarity(q, Dog.breed)
+    return rank
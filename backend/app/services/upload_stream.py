@@ -0,0 +1,120 @@
+from fastapi import HTTPException, Request, Response, UploadFile, status
+from fastapi.routing import APIRoute
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Optional, Sequence, Tuple
+
+from ..core.config import settings
+
+# Enough of the first chunk to recognise every signature below
+SNIFF_BYTES = 16
+
+# Room for multipart boundaries, part headers and small form fields
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+@dataclass(frozen=True)
+class FileKind:
+    """What an upload slot accepts: magic-byte signatures per content type and a size cap"""
+    label: str
+    signatures: Dict[bytes, str]
+    content_types: Sequence[str]
+    max_size: int
+
+    def sniff(self, head: bytes) -> Optional[str]:
+        for signature, content_type in self.signatures.items():
+            if head.startswith(signature):
+                return content_type
+        return None
+
+
+IMAGE = FileKind(
+    label="image",
+    signatures={
+        b"\xff\xd8\xff": "image/jpeg",
+        b"\x89PNG\r\n\x1a\n": "image/png",
+    },
+    content_types=settings.ALLOWED_IMAGE_TYPES,
+    max_size=settings.MAX_UPLOAD_SIZE,
+)
+
+PDF = FileKind(
+    label="PDF document",
+    signatures={b"%PDF-": "application/pdf"},
+    content_types=["application/pdf"],
+    max_size=settings.MAX_CERTIFICATE_SIZE,
+)
+
+
+def too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File size exceeds maximum allowed size of {max_size / (1024 * 1024)}MB"
+    )
+
+
+async def open_upload(file: UploadFile, kind: FileKind) -> Tuple[str, AsyncIterator[bytes]]:
+    """
+    Sniff the file type from its first bytes and return (content_type, chunks).
+    The chunk iterator raises 413 as soon as the running size passes kind.max_size,
+    so callers never hold more than one chunk of the file in memory.
+    """
+    head = await file.read(settings.UPLOAD_CHUNK_SIZE)
+    while len(head) < SNIFF_BYTES:
+        more = await file.read(settings.UPLOAD_CHUNK_SIZE)
+        if not more:
+            break
+        head += more
+
+    content_type = kind.sniff(head)
+    if content_type not in kind.content_types:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid file content. Must be a valid {kind.label}."
+        )
+
+    async def chunks() -> AsyncIterator[bytes]:
+        chunk = head
+        received = 0
+        while chunk:
+            received += len(chunk)
+            if received > kind.max_size:
+                raise too_large(kind.max_size)
+            yield chunk
+            chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+
+    return content_type, chunks()
+
+
+class LimitedUploadRoute(APIRoute):
+    """
+    Route that rejects oversized request bodies while they are being received.
+    Form parsing happens before the endpoint runs, so without this a client
+    could push an arbitrarily large body to disk before any size check.
+    """
+
+    max_body_size = settings.MAX_PHOTOS_PER_DOG * settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        max_body_size = self.max_body_size
+
+        async def limited_handler(request: Request) -> Response:
+            content_length = request.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > max_body_size:
+                raise too_large(max_body_size)
+
+            receive = request.receive
+            received = 0
+
+            async def limited_receive():
+                nonlocal received
+                message = await receive()
+                if message["type"] == "http.request":
+                    received += len(message.get("body", b""))
+                    if received > max_body_size:
+                        raise too_large(max_body_size)
+                return message
+
+            return await handler(Request(request.scope, limited_receive))
+
+        return limited_handler
@@ -0,0 +1,85 @@
+"""
+Authentication dependency microbenchmark.
+
+Times the work every authenticated request does before reaching its
+handler (JWT verification + current-user lookup) with the token/user
+caches cleared on each call versus warm.
+
+Usage (from backend/, DATABASE_URL pointing to a disposable database):
+    python -m benchmarks.bench_auth --iterations 2000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api.v1.auth import get_current_user, get_supabase_user, user_cache
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token, token_cache
+from app.models import User
+
+
+async def authenticate(credentials: HTTPAuthorizationCredentials):
+    async with SessionLocal() as db:
+        payload = await get_supabase_user(credentials)
+        return await get_current_user(db, payload)
+
+
+async def measure(credentials: HTTPAuthorizationCredentials, iterations: int, cold: bool) -> dict:
+    samples = []
+    for _ in range(iterations):
+        if cold:
+            token_cache.clear()
+            user_cache.clear()
+        start = time.perf_counter()
+        await authenticate(credentials)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+
+    samples.sort()
+    return {
+        "median_us": round(statistics.median(samples), 1),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1], 1),
+        "per_sec": round(1_000_000 / statistics.mean(samples)),
+    }
+
+
+async def run(iterations: int) -> dict:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    user_id = uuid.uuid4()
+    async with SessionLocal() as db:
+        db.add(User(id=user_id, email="bench@example.com", name="Bench", phone="0000-0000"))
+        await db.commit()
+
+    token = create_access_token({"sub": str(user_id)})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    # Warm the connection pool before measuring
+    await measure(credentials, 50, cold=True)
+
+    results = {
+        "cold": await measure(credentials, iterations, cold=True),
+        "cached": await measure(credentials, iterations, cold=False),
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+    }
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.iterations)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
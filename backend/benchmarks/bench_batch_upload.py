@@ -0,0 +1,87 @@
+"""
+Multi-photo upload wall-time benchmark.
+
+Calls the POST /uploads/photos handler with a batch of photos and with a
+single photo, for several UPLOAD_CONCURRENCY values. Photos go to the local
+storage backend with a simulated round-trip latency per object, so the
+numbers show how much of the batch overlaps.
+
+Usage (from backend/):
+    python -m benchmarks.bench_batch_upload --photos 5 --latency-ms 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from tempfile import SpooledTemporaryFile
+from types import SimpleNamespace
+
+from fastapi import BackgroundTasks
+from starlette.datastructures import Headers, UploadFile
+
+from app.api.v1.uploads import upload_multiple_photos
+from app.core.config import settings
+from app.services.storage import LocalStorageBackend, storage_service
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * (512 * 1024)
+
+
+def make_upload(index: int) -> UploadFile:
+    spool = SpooledTemporaryFile(max_size=1024 * 1024)
+    # Distinct bytes per photo, otherwise content addressing stores one object
+    spool.write(PNG + index.to_bytes(4, "big"))
+    spool.seek(0)
+    return UploadFile(spool, size=len(PNG), filename="photo.png", headers=Headers({"content-type": "image/png"}))
+
+
+class SlowLocalStorage(LocalStorageBackend):
+    def __init__(self, root: str, latency: float):
+        super().__init__(root)
+        self.latency = latency
+
+    async def put_file(self, key, path, content_type, overwrite=True):
+        await asyncio.sleep(self.latency)
+        return await super().put_file(key, path, content_type, overwrite)
+
+
+async def timed_batch(photos: int) -> float:
+    files = [make_upload(index) for index in range(photos)]
+    background_tasks = BackgroundTasks()
+    start = time.perf_counter()
+    # No rollback, so the handler never touches the database
+    await upload_multiple_photos(
+        background_tasks, files=files, rollback_on_error=False, db=None, current_user=SimpleNamespace(id=uuid.uuid4())
+    )
+    elapsed = round((time.perf_counter() - start) * 1000, 1)
+
+    # Variants are not part of the request; just release the spools
+    for task in background_tasks.tasks:
+        os.unlink(task.args[0])
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--photos", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 5])
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        storage_service.backend = SlowLocalStorage(root, args.latency_ms / 1000)
+        for concurrency in args.concurrency:
+            settings.UPLOAD_CONCURRENCY = concurrency
+            results.append({
+                "concurrency": concurrency,
+                "single_ms": asyncio.run(timed_batch(1)),
+                "batch_ms": asyncio.run(timed_batch(args.photos)),
+            })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
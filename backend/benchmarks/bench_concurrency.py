@@ -0,0 +1,76 @@
+"""
+Concurrency benchmark against a running API server.
+
+Spawns N concurrent clients that hit the listing and detail endpoints
+for a fixed duration and reports requests per second and latency.
+
+Usage (server already running and seeded):
+    python -m benchmarks.bench_concurrency --url http://localhost:8000 --clients 50 --duration 15
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+async def client_loop(client: httpx.AsyncClient, paths: list, deadline: float, samples: list, errors: list):
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        samples.append((time.perf_counter() - start) * 1000)
+
+
+async def run(url: str, clients: int, duration: float) -> dict:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        first_page = (await client.get("/api/v1/dogs/", params={"limit": 20})).json()
+        paths = [
+            "/api/v1/dogs/?limit=50",
+            "/api/v1/dogs/?province=San%20José&limit=50",
+            "/api/v1/dogs/?latitude=9.93&longitude=-84.09&radius_km=25",
+        ] + [f"/api/v1/dogs/{dog['id']}" for dog in first_page[:5]]
+
+        samples, errors = [], []
+        deadline = time.perf_counter() + duration
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            client_loop(client, paths[i:] + paths[:i], deadline, samples, errors)
+            for i in range(clients)
+        ])
+        elapsed = time.perf_counter() - start
+
+    samples.sort()
+    return {
+        "clients": clients,
+        "requests": len(samples),
+        "errors": len(errors),
+        "rps": round(len(samples) / elapsed, 1),
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+        "p99_ms": round(samples[int(len(samples) * 0.99) - 1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.url, args.clients, args.duration))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Full-dataset export benchmark: GET /dogs/export versus scraping GET /dogs.
+
+Seeds a synthetic dataset, then pulls every listing once through the
+streaming export and once the way partners used to, 100 rows per page with
+offset pagination. Reports wall time, rows per second and Python peak
+memory for each. Requests run in-process against the ASGI app with the
+response body discarded as it is sent, and the response cache is disabled
+so every page hits the database.
+
+Usage (from backend/, DATABASE_URL pointing to a disposable database):
+    python -m benchmarks.bench_export --dogs 50000
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, text
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import Base, engine
+from app.main import app
+from benchmarks.synthetic import seed
+
+PAGE_SIZE = 100
+
+
+async def get(path: str, query: str = "", headers: dict = None) -> dict:
+    """
+    Call the app directly and count body bytes and lines as they are sent.
+    httpx's ASGITransport buffers whole responses, which would hide whether
+    the server streams.
+    """
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "server": ("bench", 80), "client": ("127.0.0.1", 1),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+    }
+    state = {"status": None, "bytes": 0, "lines": 0, "body": []}
+    request_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Streaming responses listen for a disconnect while they send
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            state["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            state["bytes"] += len(body)
+            state["lines"] += body.count(b"\n")
+            if path == "/api/v1/dogs/":
+                state["body"].append(body)
+
+    await app(scope, receive, send)
+    disconnected.set()
+    if state["status"] != 200:
+        raise RuntimeError(f"GET {path}?{query} returned {state['status']}")
+    return state
+
+
+async def export(format: str, gzip: bool) -> int:
+    headers = {"Accept-Encoding": "gzip" if gzip else "identity"}
+    state = await get("/api/v1/dogs/export", f"format={format}", headers)
+    if gzip:
+        return state["bytes"]
+    # CSV has a header line
+    return state["lines"] - (1 if format == "csv" else 0)
+
+
+async def scrape() -> int:
+    rows = 0
+    skip = 0
+    while True:
+        state = await get("/api/v1/dogs/", f"skip={skip}&limit={PAGE_SIZE}")
+        page = json.loads(b"".join(state["body"]))
+        rows += len(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        skip += PAGE_SIZE
+
+
+async def measure(name: str, run, rows: int) -> dict:
+    start = time.perf_counter()
+    result = await run()
+    elapsed = time.perf_counter() - start
+
+    # Separate pass: tracemalloc slows allocation-heavy code several times over
+    tracemalloc.start()
+    await run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mode": name,
+        "rows": rows,
+        "received": result,  # rows, or compressed bytes for gzip
+        "seconds": round(elapsed, 2),
+        "rows_per_sec": round(rows / elapsed),
+        "python_peak_mb": round(peak / (1024 * 1024), 1),
+    }
+
+
+async def run_all(skip_scrape: bool) -> list:
+    async with engine.connect() as conn:
+        rows = (await conn.execute(text("SELECT count(*) FROM dogs WHERE status = 'disponible'"))).scalar()
+
+    results = [
+        await measure("export ndjson", lambda: export("ndjson", gzip=False), rows),
+        await measure("export ndjson gzip", lambda: export("ndjson", gzip=True), rows),
+        await measure("export csv", lambda: export("csv", gzip=False), rows),
+    ]
+    if not skip_scrape:
+        results.append(await measure(f"GET /dogs offset x{PAGE_SIZE}", scrape, rows))
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dogs", type=int, default=50_000)
+    parser.add_argument("--skip-scrape", action="store_true", help="Only time the export")
+    args = parser.parse_args()
+
+    sync_engine = create_engine(settings.DATABASE_URL)
+    Base.metadata.drop_all(sync_engine)
+    Base.metadata.create_all(sync_engine)
+    with sync_engine.begin() as conn:
+        seed(conn, dogs=args.dogs)
+        conn.execute(text("ANALYZE dogs"))
+
+    response_cache.enabled = False
+    for result in asyncio.run(run_all(args.skip_scrape)):
+        print(json.dumps(result))
+
+    Base.metadata.drop_all(sync_engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Facet counting benchmark for GET /dogs/facets.
+
+Times the three ways to count every facet of a filtered listing:
+GROUPING SETS (what Postgres uses), one GROUP BY over all facets folded in
+Python (the portable fallback), and one GROUP BY query per facet.
+
+Usage (from backend/, DATABASE_URL pointing to a disposable database):
+    python -m benchmarks.bench_facets --dogs 200000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from sqlalchemy import create_engine, func, select, text
+
+from app.core.config import settings
+from app.core.database import Base, SessionLocal, engine
+from app.services.dog_facets import FACETS, _combined_group_counts, _facet_rows, _grouping_sets_counts
+from app.services.dog_search import DogFilters
+from benchmarks.synthetic import seed
+
+FILTER_SETS = {
+    "available": DogFilters(),
+    "available_grande": DogFilters(size="grande"),
+    "radius_50km": DogFilters(latitude=9.93, longitude=-84.08, radius_km=50),
+}
+
+
+async def per_facet_queries(db, filters: DogFilters):
+    rows = _facet_rows(filters)
+    for facet in FACETS:
+        await db.execute(select(rows.c[facet], func.count()).group_by(rows.c[facet]))
+
+
+async def timed(fn, filters: DogFilters, repeat: int) -> float:
+    samples = []
+    async with SessionLocal() as db:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await fn(db, filters)
+            samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+async def run(repeat: int) -> list:
+    strategies = {"fallback_ms": _combined_group_counts, "per_facet_ms": per_facet_queries}
+    if engine.dialect.name == "postgresql":
+        strategies = {"grouping_sets_ms": _grouping_sets_counts, **strategies}
+
+    results = []
+    for name, filters in FILTER_SETS.items():
+        result = {"filters": name}
+        for strategy, fn in strategies.items():
+            result[strategy] = await timed(fn, filters, repeat)
+        results.append(result)
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dogs", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    sync_engine = create_engine(settings.DATABASE_URL)
+    Base.metadata.drop_all(sync_engine)
+    Base.metadata.create_all(sync_engine)
+    with sync_engine.begin() as conn:
+        seed(conn, dogs=args.dogs)
+    if sync_engine.dialect.name == "postgresql":
+        with sync_engine.begin() as conn:
+            conn.execute(text("ANALYZE dogs"))
+
+    for result in asyncio.run(run(args.repeat)):
+        print(json.dumps(result, ensure_ascii=False))
+
+    Base.metadata.drop_all(sync_engine)
+
+
+if __name__ == "__main__":
+    main()
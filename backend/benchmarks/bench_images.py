@@ -0,0 +1,88 @@
+"""
+Image derivative throughput benchmark.
+
+Renders the thumb/card/full variants of synthetic camera-sized JPEGs with
+render_variants, first in one process and then across the process pool,
+and reports images per second and per core.
+
+Usage (from backend/):
+    python -m benchmarks.bench_images --images 40 --width 4000 --height 3000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from app.core.config import settings
+from app.services.images import render_variants
+
+
+def make_photo(path: str, width: int, height: int, seed: int):
+    """Noisy shapes so the encoder has realistic work to do"""
+    rng = random.Random(seed)
+    image = Image.effect_noise((width, height), 40).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for _ in range(60):
+        x, y = rng.randrange(width), rng.randrange(height)
+        radius = rng.randrange(50, width // 4)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=color)
+    image = image.filter(ImageFilter.GaussianBlur(2))
+    exif = image.getexif()
+    exif[0x0112] = 6  # rotated 90 degrees, like a phone held upright
+    image.save(path, "JPEG", quality=90, exif=exif)
+
+
+def throughput(paths, workers: int) -> float:
+    start = time.perf_counter()
+    if workers == 1:
+        for path in paths:
+            render_variants(path, settings.IMAGE_VARIANT_FORMAT, settings.IMAGE_VARIANT_QUALITY)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(
+                render_variants,
+                paths,
+                [settings.IMAGE_VARIANT_FORMAT] * len(paths),
+                [settings.IMAGE_VARIANT_QUALITY] * len(paths),
+            ))
+    return len(paths) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=40)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--workers", type=int, default=settings.IMAGE_WORKERS or os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(args.images):
+            path = os.path.join(directory, f"photo-{index}.jpg")
+            make_photo(path, args.width, args.height, index)
+            paths.append(path)
+
+        variants = render_variants(paths[0], settings.IMAGE_VARIANT_FORMAT, settings.IMAGE_VARIANT_QUALITY)
+        single = throughput(paths, 1)
+        pooled = throughput(paths, args.workers)
+
+        print(json.dumps({
+            "format": settings.IMAGE_VARIANT_FORMAT,
+            "source": f"{args.width}x{args.height} JPEG, {os.path.getsize(paths[0]) // 1024} KB",
+            "variant_kb": {name: round(len(data) / 1024, 1) for name, data in variants.items()},
+            "single_process_images_per_sec": round(single, 2),
+            "pool_workers": args.workers,
+            "pool_images_per_sec": round(pooled, 2),
+            "pool_images_per_sec_per_core": round(pooled / args.workers, 2),
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Bulk import throughput benchmark for POST /dogs/import.
+
+Generates a synthetic file (NDJSON and/or CSV), streams it to the app
+in-process and reports sustained rows per second end to end (parsing,
+validation, COPY / multi-row INSERT and status history).
+
+Usage (from backend/, DATABASE_URL pointing to a disposable database):
+    python -m benchmarks.bench_import --rows 50000 --formats ndjson csv
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import random
+import time
+import uuid
+
+import httpx
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models import User
+from benchmarks.synthetic import make_dogs
+
+IMPORT_FIELDS = [
+    "name", "age_years", "age_months", "breed", "size", "gender", "color", "description",
+    "latitude", "longitude", "province", "contact_phone", "photos",
+]
+STREAM_CHUNK = 64 * 1024
+
+
+def make_rows(count: int):
+    rng = random.Random(7)
+    for dog in make_dogs(count, [uuid.uuid4()], rng):
+        yield {field: dog[field] for field in IMPORT_FIELDS}
+
+
+def encode_ndjson(rows) -> bytes:
+    return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode()
+
+
+def encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=IMPORT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({**row, "photos": "|".join(row["photos"])})
+    return buffer.getvalue().encode()
+
+
+async def stream(body: bytes):
+    for start in range(0, len(body), STREAM_CHUNK):
+        yield body[start:start + STREAM_CHUNK]
+
+
+async def run(rows: int, formats) -> list:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    user_id = uuid.uuid4()
+    async with SessionLocal() as db:
+        db.add(User(id=user_id, email="shelter@example.com", name="Refugio", phone="0000-0000"))
+        await db.commit()
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    data = list(make_rows(rows))
+    encoders = {"ndjson": (encode_ndjson, "application/x-ndjson"), "csv": (encode_csv, "text/csv")}
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name in formats:
+            encode, content_type = encoders[name]
+            body = encode(data)
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/v1/dogs/import",
+                content=stream(body),
+                headers={**headers, "Content-Type": content_type},
+            )
+            elapsed = time.perf_counter() - start
+            response.raise_for_status()
+            report = response.json()
+            results.append({
+                "format": name,
+                "rows": report["rows"],
+                "inserted": report["inserted"],
+                "failed": report["failed"],
+                "body_mb": round(len(body) / (1024 * 1024), 2),
+                "seconds": round(elapsed, 2),
+                "rows_per_sec": round(report["inserted"] / elapsed),
+            })
+
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--formats", nargs="+", choices=["ndjson", "csv"], default=["ndjson", "csv"])
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.rows, args.formats)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
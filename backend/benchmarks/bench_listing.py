@@ -0,0 +1,72 @@
+"""
+Listing page cost: full dogs vs dog_cards.
+
+Loads the same pages through both loaders of GET /dogs, with no response
+cache in front:
+- full: load_dog_page, wide dogs rows plus their publishers (users), their
+  photos' stored variants and the DogWithPublisher body
+- card: load_card_page, one query over the dog_cards read model and the
+  DogCardResponse body
+and reports the median time per page, the queries it ran and the body size.
+
+Usage (from backend/, database seeded with benchmarks.synthetic):
+    python -m benchmarks.bench_listing --runs 50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from app.api.v1.dogs import load_card_page, load_dog_page
+from app.core.query_stats import capture_queries
+from app.services.dog_search import DogFilters
+
+PAGE_SIZE = 50
+
+PAGES = {
+    "landing": DogFilters(),
+    "filtered": DogFilters(province="Cartago", size="grande"),
+    "radius": DogFilters(latitude=9.93, longitude=-84.08, radius_km=25),
+    "search": DogFilters(q="labrador"),
+}
+
+LOADERS = {"full": load_dog_page, "card": load_card_page}
+
+
+async def measure(load, filters: DogFilters, runs: int) -> dict:
+    entry = await load(filters, None, 0, PAGE_SIZE)
+    with capture_queries() as queries:
+        await load(filters, None, 0, PAGE_SIZE)
+
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await load(filters, None, 0, PAGE_SIZE)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": round(statistics.median(samples), 2),
+        "queries": queries.count,
+        "db_ms": round(queries.seconds * 1000, 2),
+        "bytes": len(entry.body),
+        "dogs": len(json.loads(entry.body)),
+    }
+
+
+async def run(runs: int) -> None:
+    for page, filters in PAGES.items():
+        results = {view: await measure(load, filters, runs) for view, load in LOADERS.items()}
+        assert results["full"]["dogs"] == results["card"]["dogs"], f"{page}: views return different pages"
+        for view, result in results.items():
+            print(json.dumps({"page": page, "view": view, **result}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.runs))
+
+
+if __name__ == "__main__":
+    main()
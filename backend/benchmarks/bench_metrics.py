@@ -0,0 +1,85 @@
+"""
+Per-request overhead of MetricsMiddleware.
+
+Calls a minimal ASGI app (one start and one body message, with a matched
+route in the scope like FastAPI's router leaves it) many times, bare and
+wrapped in the middleware, and reports the added cost per request. Also
+times one /internal/metrics render with the resulting series.
+
+Usage (from backend/):
+    python -m benchmarks.bench_metrics --requests 200000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from app.core.metrics import MetricsMiddleware, registry
+
+ROUTES = [f"/api/v1/route{i}/{{item_id}}" for i in range(20)]
+
+
+class Route:
+    def __init__(self, path_format: str):
+        self.path_format = path_format
+
+
+async def endpoint(scope, receive, send):
+    scope["route"] = scope["bench_route"]
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b'{"ok":true}'})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def timed(app, requests: int) -> float:
+    routes = [Route(path) for path in ROUTES]
+    scopes = [{"type": "http", "method": "GET", "bench_route": routes[i % len(routes)]} for i in range(requests)]
+    start = time.perf_counter()
+    for scope in scopes:
+        await app(scope, receive, send)
+    return time.perf_counter() - start
+
+
+async def run(requests: int, repeat: int) -> dict:
+    wrapped = MetricsMiddleware(endpoint)
+    await timed(wrapped, 1000)
+
+    bare_runs, wrapped_runs = [], []
+    for _ in range(repeat):
+        bare_runs.append(await timed(endpoint, requests))
+        wrapped_runs.append(await timed(wrapped, requests))
+    bare, instrumented = min(bare_runs), min(wrapped_runs)
+
+    start = time.perf_counter()
+    body = registry.render()
+    render_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "requests": requests,
+        "bare_us": round(bare / requests * 1e6, 3),
+        "instrumented_us": round(instrumented / requests * 1e6, 3),
+        "overhead_us": round((instrumented - bare) / requests * 1e6, 3),
+        "routes": len(ROUTES),
+        "render_ms": round(render_ms, 2),
+        "render_kb": round(len(body) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.requests, args.repeat))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Offset vs keyset pagination benchmark for GET /dogs.
+
+Walks to increasingly deep pages with both modes and times the page
+query at each depth.
+
+Usage (from backend/, DATABASE_URL pointing to a disposable database):
+    python -m benchmarks.bench_pagination --dogs 200000 --depths 1 100 1000 3000
+"""
+import argparse
+import json
+import statistics
+import time
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import Base
+from app.core.pagination import apply_keyset, encode_cursor
+from app.models import Dog
+from benchmarks.synthetic import seed
+
+PAGE_SIZE = 50
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dogs", type=int, default=200_000)
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 100, 1000, 3000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        seed(conn, dogs=args.dogs)
+        conn.execute(text("ANALYZE dogs"))
+
+    with Session(engine) as db:
+        base = db.query(Dog).filter(Dog.status == "disponible")
+
+        for depth in args.depths:
+            skip = (depth - 1) * PAGE_SIZE
+
+            # Cursor pointing at the row just before the page being fetched
+            last = None
+            if skip:
+                last = db.execute(
+                    select(Dog.created_at, Dog.id)
+                    .filter(Dog.status == "disponible")
+                    .order_by(Dog.created_at.desc(), Dog.id.desc())
+                    .offset(skip - 1)
+                    .limit(1)
+                ).first()
+            if skip and last is None:
+                break
+            cursor = encode_cursor(last.created_at, last.id) if last else None
+
+            offset_ms = timed(
+                lambda: base.order_by(Dog.created_at.desc(), Dog.id.desc()).offset(skip).limit(PAGE_SIZE).all(),
+                args.repeat
+            )
+            keyset_ms = timed(
+                lambda: apply_keyset(base, Dog.created_at, Dog.id, cursor, PAGE_SIZE).all(),
+                args.repeat
+            )
+            print(json.dumps({"page": depth, "offset_p50_ms": offset_ms, "keyset_p50_ms": keyset_ms}))
+
+    Base.metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Radius search benchmark for GET /dogs.
+
+Seeds a scratch database at each size and times the radius query the
+endpoint runs against the old approach (page first, filter in Python).
+Every table at DATABASE_URL is dropped and recreated for each size, and
+dropped again at the end; 1M dogs take about five minutes to seed.
+
+Usage (from backend/, DATABASE_URL pointing to a disposable database):
+    python -m benchmarks.bench_radius_search --sizes 10000 100000 1000000
+"""
+import argparse
+import json
+import statistics
+import time
+
+from sqlalchemy import create_engine, select, text
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import Dog
+from app.services.geo import calculate_distance, radius_filter
+from benchmarks.synthetic import seed
+
+# San José, 25km radius
+CENTER = (9.9281, -84.0907)
+RADIUS_KM = 25
+PAGE_SIZE = 50
+
+
+def time_query(conn, fn, repeat: int) -> dict:
+    samples = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = fn(conn)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+        "rows": rows,
+    }
+
+
+def indexed_query(conn) -> int:
+    stmt = (
+        select(Dog)
+        .filter(Dog.status == "disponible")
+        .filter(*radius_filter(Dog.latitude, Dog.longitude, CENTER[0], CENTER[1], RADIUS_KM))
+        .order_by(Dog.created_at.desc())
+        .limit(PAGE_SIZE)
+    )
+    return len(conn.execute(stmt).all())
+
+
+def legacy_query(conn) -> int:
+    stmt = (
+        select(Dog)
+        .filter(Dog.status == "disponible")
+        .order_by(Dog.created_at.desc())
+        .limit(PAGE_SIZE)
+    )
+    dogs = conn.execute(stmt).all()
+    return len([
+        d for d in dogs
+        if calculate_distance(CENTER[0], CENTER[1], d.latitude, d.longitude) <= RADIUS_KM
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    results = []
+
+    for size in args.sizes:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            seed(conn, dogs=size)
+            conn.execute(text("ANALYZE dogs"))
+
+        with engine.connect() as conn:
+            results.append({
+                "dogs": size,
+                "radius_query": time_query(conn, indexed_query, args.repeat),
+                "legacy_query": time_query(conn, legacy_query, args.repeat),
+            })
+        print(json.dumps(results[-1]))
+
+    Base.metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    main()
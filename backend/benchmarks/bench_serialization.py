@@ -0,0 +1,125 @@
+"""
+Serialization cost of one 100-dog listing page.
+
+Builds dogs with their publisher in memory (no database) and renders the
+page body the way each version of the endpoint does:
+- legacy: model_validate + model_dump per dog, publisher dict attached,
+  jsonable_encoder, json.dumps
+- response_model: what FastAPI does for a route that returns the dicts and
+  lets response_model validate, encode and JSONResponse render them
+- single_pass: TypeAdapter(List[DogWithPublisher]) validating the ORM rows
+  and dump_json straight to bytes, as load_dog_page does now
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization --dogs 100 --runs 200
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.api.v1.dogs import dog_page_adapter
+from app.models.dog import Dog
+from app.models.user import User
+from app.schemas.dog import DogResponse, DogWithPublisher
+
+response_model_adapter = TypeAdapter(List[DogWithPublisher])
+
+
+def build_page(size: int) -> list:
+    rng = random.Random(42)
+    publishers = [
+        User(id=uuid.uuid4(), name=f"Usuario {i}", email=f"user{i}@example.com", phone="88888888")
+        for i in range(10)
+    ]
+    now = datetime(2025, 1, 1)
+    dogs = []
+    for i in range(size):
+        publisher = rng.choice(publishers)
+        dogs.append(Dog(
+            id=uuid.uuid4(), name=f"Firulais {i}", age_years=rng.randint(0, 12), age_months=rng.randint(0, 11),
+            breed="Pastor Alemán", size=rng.choice(["pequeño", "mediano", "grande"]),
+            gender=rng.choice(["macho", "hembra"]), color="Café",
+            description="Muy juguetón, se lleva bien con niños y otros perros. " * 3,
+            vaccinated=True, sterilized=rng.random() < 0.5, dewormed=True, special_needs=None,
+            latitude=9.93 + rng.random(), longitude=-84.08 + rng.random(), address=None, province="San José",
+            contact_phone="88888888", contact_email=publisher.email, certificate=None,
+            photos=[f"dogs/photos/{uuid.uuid4().hex}.webp" for _ in range(3)],
+            status="disponible", publisher_id=publisher.id, publisher=publisher,
+            created_at=now - timedelta(minutes=i), updated_at=now - timedelta(minutes=i),
+        ))
+    return dogs
+
+
+def publisher_dict(publisher: User) -> dict:
+    return {"id": str(publisher.id), "name": publisher.name, "email": publisher.email}
+
+
+def legacy_dicts(dogs: list) -> list:
+    result = []
+    for dog in dogs:
+        dog_dict = DogResponse.model_validate(dog).model_dump()
+        dog_dict["publisher"] = publisher_dict(dog.publisher)
+        result.append(dog_dict)
+    return result
+
+
+def legacy(dogs: list) -> bytes:
+    return json.dumps(
+        jsonable_encoder(legacy_dicts(dogs)), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def response_model(dogs: list) -> bytes:
+    validated = response_model_adapter.validate_python(legacy_dicts(dogs))
+    content = jsonable_encoder(response_model_adapter.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def single_pass(dogs: list) -> bytes:
+    return dog_page_adapter.dump_json(dog_page_adapter.validate_python(dogs))
+
+
+PATHS = {"legacy": legacy, "response_model": response_model, "single_pass": single_pass}
+
+
+def timed(render, dogs: list, runs: int) -> float:
+    render(dogs)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        render(dogs)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dogs", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    dogs = build_page(args.dogs)
+    reference = json.loads(legacy(dogs))
+    for name, render in PATHS.items():
+        body = render(dogs)
+        assert json.loads(body) == reference, f"{name} renders a different page"
+        median = timed(render, dogs, args.runs)
+        print(json.dumps({
+            "path": name,
+            "dogs": args.dogs,
+            "page_us": round(median * 1e6, 1),
+            "per_dog_us": round(median / args.dogs * 1e6, 2),
+            "bytes": len(body),
+        }))
+
+
+if __name__ == "__main__":
+    main()
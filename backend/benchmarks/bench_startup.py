@@ -0,0 +1,90 @@
+"""
+Import-time and cold-start benchmark.
+
+Each sample is a fresh interpreter, like a worker booting on a new
+container. It reports:
+- import_ms: importing app.main, and whether that created the engine or
+  the storage client (it should not)
+- startup_ms: lifespan startup, i.e. schema check plus warm-up, after
+  which uvicorn would accept traffic
+- first_request_ms: the first GET /api/v1/dogs/ served afterwards
+
+Variants cover the boot-time schema handling (verify vs create) and the
+readiness warm-up on or off.
+
+Usage (from backend/, DATABASE_URL pointing to a migrated, seeded database):
+    python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+WORKER = r"""
+import asyncio, json, time
+start = time.perf_counter()
+import app.main
+import_ms = (time.perf_counter() - start) * 1000
+
+from app.core import database
+from app.services.storage import storage_service
+side_effects = {"engine": database._engine is not None, "storage_client": storage_service._backend is not None}
+
+async def boot():
+    import httpx
+    lifespan = app.main.app.router.lifespan_context(app.main.app)
+    start = time.perf_counter()
+    await lifespan.__aenter__()
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    transport = httpx.ASGITransport(app=app.main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        response = await client.get("/api/v1/dogs/")
+        first_request_ms = (time.perf_counter() - start) * 1000
+    await lifespan.__aexit__(None, None, None)
+    return startup_ms, first_request_ms, response.status_code
+
+startup_ms, first_request_ms, status = asyncio.run(boot())
+print(json.dumps({
+    "import_ms": import_ms, "startup_ms": startup_ms, "first_request_ms": first_request_ms,
+    "status": status, "import_side_effects": side_effects,
+}))
+"""
+
+VARIANTS = {
+    "verify_warm": {"DB_SCHEMA_CHECK": "verify", "DB_POOL_WARMUP": "true", "RESPONSE_CACHE_WARMUP": "true"},
+    "verify_cold": {"DB_SCHEMA_CHECK": "verify", "DB_POOL_WARMUP": "false", "RESPONSE_CACHE_WARMUP": "false"},
+    "create_all_cold": {"DB_SCHEMA_CHECK": "create", "DB_POOL_WARMUP": "false", "RESPONSE_CACHE_WARMUP": "false"},
+}
+
+
+def sample(env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", WORKER],
+        env={**os.environ, **env}, capture_output=True, text=True, check=True
+    ).stdout
+    # Lifespan prints its progress; the report is the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS))
+    args = parser.parse_args()
+
+    for name in args.variants:
+        samples = [sample(VARIANTS[name]) for _ in range(args.runs)]
+        result = {"variant": name, "runs": args.runs}
+        for key in ("import_ms", "startup_ms", "first_request_ms"):
+            result[key] = round(statistics.median(s[key] for s in samples), 1)
+        result["import_side_effects"] = samples[0]["import_side_effects"]
+        result["statuses"] = sorted({s["status"] for s in samples})
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Upload memory benchmark.
+
+Pushes N concurrent photo uploads through the upload pipeline and reports
+peak memory for the old whole-file read versus chunked streaming.
+Uploads are built the way Starlette's form parser builds them (spooled
+to disk past 1MB) and stored with the local storage backend in a
+temporary directory, so no network is involved.
+
+Each mode runs in its own process so peak RSS is not shared between them.
+
+Usage (from backend/):
+    python -m benchmarks.bench_uploads --uploads 20 --size-mb 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from tempfile import SpooledTemporaryFile
+
+from starlette.datastructures import Headers, UploadFile
+
+from app.api.v1.uploads import store_photo
+from app.services.storage import LocalStorageBackend, storage_service
+
+# Starlette's MultiPartParser.max_file_size
+SPOOL_MAX_SIZE = 1024 * 1024
+JPEG_HEADER = b"\xff\xd8\xff\xe0"
+
+
+def make_upload(size: int) -> UploadFile:
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    spool.write(JPEG_HEADER)
+    block = os.urandom(64 * 1024)
+    remaining = size - len(JPEG_HEADER)
+    while remaining > 0:
+        spool.write(block[:remaining])
+        remaining -= len(block)
+    spool.seek(0)
+    return UploadFile(spool, size=size, filename="photo.jpg", headers=Headers({"content-type": "image/jpeg"}))
+
+
+async def whole_file(upload: UploadFile):
+    file_content = await upload.read()
+    return await storage_service.upload_file(file_content, "whole.jpg", "image/jpeg")
+
+
+async def streamed(upload: UploadFile):
+    file_url, spooled, _, _ = await store_photo(upload, uuid.uuid4())
+    os.unlink(spooled.path)
+    return file_url
+
+
+async def run(mode: str, uploads: int, size: int, root: str) -> dict:
+    storage_service.backend = LocalStorageBackend(root)
+    files = [make_upload(size) for _ in range(uploads)]
+    handler = whole_file if mode == "whole" else streamed
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    await asyncio.gather(*[handler(upload) for upload in files])
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mode": mode,
+        "uploads": uploads,
+        "size_mb": size / (1024 * 1024),
+        "seconds": round(elapsed, 3),
+        "python_peak_mb": round(peak / (1024 * 1024), 2),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--size-mb", type=float, default=5)
+    parser.add_argument("--mode", choices=["whole", "streamed"])
+    args = parser.parse_args()
+
+    size = int(args.size_mb * 1024 * 1024)
+    if args.mode:
+        with tempfile.TemporaryDirectory() as root:
+            print(json.dumps(asyncio.run(run(args.mode, args.uploads, size, root))))
+        return
+
+    results = []
+    for mode in ("whole", "streamed"):
+        output = subprocess.check_output([
+            sys.executable, "-m", "benchmarks.bench_uploads",
+            "--mode", mode, "--uploads", str(args.uploads), "--size-mb", str(args.size_mb),
+        ])
+        results.append(json.loads(output))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
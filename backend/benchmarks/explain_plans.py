@@ -0,0 +1,160 @@
+"""
+EXPLAIN ANALYZE capture for every listing query shape.
+
+Seeds a synthetic dataset (unless --no-seed), builds each endpoint's query
+the way the endpoint does, and records its plan. A one-line summary per
+query goes to stdout: execution time, buffers hit/read and the scans used.
+Full text plans are written to --out, one file per query shape, so runs
+before and after an index change can be diffed.
+
+Usage (from backend/, DATABASE_URL pointing to a disposable Postgres database):
+    python -m benchmarks.explain_plans --dogs 200000 --out /tmp/plans
+"""
+import argparse
+import json
+import os
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.engine import Connection
+
+from app.api.v1.dogs import paginate_dogs
+from app.core.config import settings
+from app.core.database import Base
+from app.core.pagination import apply_keyset, encode_cursor
+from app.models import Dog, DogStatusHistory, User
+from app.services.dog_export import export_query
+from app.services.dog_search import DogFilters
+from benchmarks.synthetic import seed
+
+PAGE_SIZE = 50
+
+LISTING_FILTERS = {
+    "list_default": DogFilters(),
+    "list_all_statuses": DogFilters(status=None),
+    "list_size": DogFilters(size="grande"),
+    "list_size_gender": DogFilters(size="pequeño", gender="hembra"),
+    "list_age_range": DogFilters(age_min=1, age_max=3),
+    "list_province": DogFilters(province="Cartago"),
+    "list_province_size": DogFilters(province="Heredia", size="mediano"),
+    "list_all_filters": DogFilters(size="grande", gender="macho", age_min=2, age_max=8, province="Alajuela"),
+    "list_adopted_province": DogFilters(status="adoptado", province="Limón"),
+    "list_radius_25km": DogFilters(latitude=9.93, longitude=-84.08, radius_km=25),
+    "list_radius_province_size": DogFilters(latitude=9.93, longitude=-84.08, radius_km=50, size="pequeño"),
+    "list_text_search": DogFilters(q="labrador dorado"),
+}
+
+
+def listing_queries(sample: dict):
+    """GET /dogs shapes: the page query, a deep keyset page, an offset page and the ETag version query"""
+    for name, filters in LISTING_FILTERS.items():
+        yield name, paginate_dogs(filters.apply(select(Dog)), filters, None, 0, PAGE_SIZE)
+
+    filters = LISTING_FILTERS["list_default"]
+    cursor = encode_cursor(sample["cursor_created_at"], sample["cursor_id"])
+    yield "list_default_keyset_deep", paginate_dogs(filters.apply(select(Dog)), filters, cursor, 0, PAGE_SIZE)
+    yield "list_default_offset_deep", paginate_dogs(filters.apply(select(Dog)), filters, None, 5000, PAGE_SIZE)
+
+    filters = LISTING_FILTERS["list_province_size"]
+    version = filters.apply(
+        select(Dog.id, Dog.created_at, Dog.updated_at, User.name, User.email).join(User, Dog.publisher_id == User.id)
+    )
+    yield "list_version_query", paginate_dogs(version, filters, None, 0, PAGE_SIZE)
+
+
+def user_queries(sample: dict):
+    """GET /users/me/dogs and GET /users/{id}/dogs"""
+    publisher_id = sample["publisher_id"]
+    mine = select(Dog).filter(Dog.publisher_id == publisher_id)
+    yield "my_dogs", apply_keyset(mine, Dog.created_at, Dog.id, None, PAGE_SIZE)
+    yield "my_dogs_status", apply_keyset(mine.filter(Dog.status == "reservado"), Dog.created_at, Dog.id, None, PAGE_SIZE)
+
+    public = select(Dog).filter(Dog.publisher_id == publisher_id, Dog.status == "disponible")
+    yield "user_public_dogs", apply_keyset(public, Dog.created_at, Dog.id, None, PAGE_SIZE)
+
+
+def other_queries(sample: dict):
+    yield "dog_history", (
+        select(DogStatusHistory)
+        .filter(DogStatusHistory.dog_id == sample["dog_id"])
+        .order_by(DogStatusHistory.changed_at.desc())
+    )
+    yield "export_province", export_query(DogFilters(province="Puntarenas"))
+
+
+def pick_sample(conn: Connection) -> dict:
+    """Real ids to plug into the queries: a busy publisher, a dog with history, a deep cursor"""
+    publisher_id = conn.execute(text(
+        "SELECT publisher_id FROM dogs GROUP BY publisher_id ORDER BY count(*) DESC LIMIT 1"
+    )).scalar()
+    deep = conn.execute(text(
+        "SELECT created_at, id FROM dogs WHERE status = 'disponible' "
+        "ORDER BY created_at DESC, id DESC OFFSET 5000 LIMIT 1"
+    )).first()
+    dog_id = conn.execute(text("SELECT dog_id FROM dog_status_history LIMIT 1")).scalar()
+    return {
+        "publisher_id": publisher_id,
+        "cursor_created_at": deep.created_at,
+        "cursor_id": deep.id,
+        "dog_id": dog_id,
+    }
+
+
+def summarize(plan: dict) -> dict:
+    scans = []
+
+    def walk(node):
+        node_type = node["Node Type"]
+        if "Scan" in node_type:
+            scans.append(f"{node_type} {node.get('Index Name', node.get('Relation Name', ''))}".strip())
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan["Plan"])
+    return {
+        "execution_ms": round(plan["Execution Time"], 3),
+        "planning_ms": round(plan["Planning Time"], 3),
+        "shared_hit": plan["Plan"].get("Shared Hit Blocks", 0),
+        "shared_read": plan["Plan"].get("Shared Read Blocks", 0),
+        "scans": scans,
+    }
+
+
+def explain(conn: Connection, query, analyze_format: str):
+    compiled = query.compile(dialect=conn.dialect)
+    sql = str(compiled)
+    return conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT {analyze_format}) {sql}", compiled.params).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dogs", type=int, default=200_000)
+    parser.add_argument("--no-seed", action="store_true", help="Reuse the data already in the database")
+    parser.add_argument("--out", default="explain-plans", help="Directory for the full text plans")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    if engine.dialect.name != "postgresql":
+        parser.error("EXPLAIN ANALYZE plans need a Postgres DATABASE_URL")
+
+    if not args.no_seed:
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            seed(conn, dogs=args.dogs)
+            conn.execute(text("ANALYZE"))
+
+    os.makedirs(args.out, exist_ok=True)
+    with engine.connect() as conn:
+        sample = pick_sample(conn)
+        shapes = [*listing_queries(sample), *user_queries(sample), *other_queries(sample)]
+        for name, query in shapes:
+            # Warm run first so timings compare cached plans, not cold buffers
+            explain(conn, query, "JSON")
+            plan = explain(conn, query, "JSON")[0][0][0]
+            with open(os.path.join(args.out, f"{name}.txt"), "w") as file:
+                file.write("\n".join(row[0] for row in explain(conn, query, "TEXT")) + "\n")
+            print(json.dumps({"query": name, **summarize(plan)}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
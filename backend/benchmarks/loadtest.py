@@ -0,0 +1,346 @@
+"""
+In-process load test for the key endpoints.
+
+Drives the ASGI app directly (no server, no network) against an already
+seeded database: filtered listings (full and card view), radius search,
+detail, a favorites list fetched in one batch, create, status change and
+photo uploads to the local storage backend in a temporary directory. Each
+scenario runs `--requests` requests from `--concurrency` concurrent
+workers and reports latency percentiles and throughput as JSON, tagged
+with the git commit so runs can be compared across commits.
+
+Latency is measured until the last response body message, like a client
+would see it; background tasks (image variants) still run in the worker
+afterwards, as they would on the server.
+
+Usage (from backend/, database seeded with benchmarks.synthetic):
+    python -m benchmarks.synthetic --dogs 100000 --users 2000 --reset
+    python -m benchmarks.loadtest --concurrency 20 --requests 500 --output before.json
+    python -m benchmarks.loadtest --concurrency 20 --requests 500 --baseline before.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import math
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlencode
+
+import httpx
+from PIL import Image
+from sqlalchemy import text
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import engine
+from app.core.security import create_access_token
+from app.main import app
+from app.schemas.dog import DogBase
+from app.services.storage import LocalStorageBackend, storage_service
+from benchmarks.synthetic import PROVINCE_CENTRES, PROVINCES, SIZES, GENDERS, make_dogs
+
+API = settings.API_V1_STR
+FAVORITES_SIZE = 30
+
+
+@dataclass
+class Context:
+    dog_ids: List[str]
+    # (dog id, publisher's auth header) for dogs whose status can change
+    owned_dogs: List[Tuple[str, dict]]
+    user_headers: List[dict]
+    photo: bytes
+
+
+async def load_context(photo_size: Tuple[int, int], limit: int = 2000) -> Context:
+    async with engine.connect() as conn:
+        rows = (await conn.execute(
+            text("SELECT id, publisher_id FROM dogs WHERE status = 'disponible' ORDER BY random() LIMIT :limit"),
+            {"limit": limit}
+        )).all()
+        user_ids = (await conn.execute(text("SELECT id FROM users LIMIT :limit"), {"limit": limit})).scalars().all()
+    if not rows:
+        raise SystemExit("No available dogs found; seed the database with benchmarks.synthetic first")
+
+    def auth(user_id) -> dict:
+        return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+    return Context(
+        dog_ids=[str(row.id) for row in rows],
+        owned_dogs=[(str(row.id), auth(row.publisher_id)) for row in rows],
+        user_headers=[auth(user_id) for user_id in user_ids],
+        photo=make_photo(*photo_size),
+    )
+
+
+def make_photo(width: int, height: int) -> bytes:
+    image = Image.effect_noise((width, height), 40).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+# Scenarios build one request each; they get the shared context and the worker's rng
+
+def listing_params(rng: random.Random) -> dict:
+    params = {"limit": 20}
+    if rng.random() < 0.5:
+        params["province"] = rng.choice(PROVINCES)
+    if rng.random() < 0.4:
+        params["size"] = rng.choice(SIZES)
+    if rng.random() < 0.3:
+        params["gender"] = rng.choice(GENDERS)
+    if rng.random() < 0.2:
+        age_min = rng.randint(0, 6)
+        params.update(age_min=age_min, age_max=age_min + rng.randint(1, 4))
+    return params
+
+
+def list_filtered(ctx: Context, rng: random.Random) -> httpx.Request:
+    return httpx.Request("GET", f"{API}/dogs/?{urlencode(listing_params(rng))}")
+
+
+def list_cards(ctx: Context, rng: random.Random) -> httpx.Request:
+    # The same listings as compact cards from dog_cards
+    return httpx.Request("GET", f"{API}/dogs/?{urlencode({**listing_params(rng), 'view': 'card'})}")
+
+
+def radius_search(ctx: Context, rng: random.Random) -> httpx.Request:
+    lat, lon, spread = rng.choice(PROVINCE_CENTRES[rng.choice(PROVINCES)][1])
+    params = {
+        "latitude": round(rng.gauss(lat, spread), 4),
+        "longitude": round(rng.gauss(lon, spread), 4),
+        "radius_km": rng.choice([5, 10, 25, 50]),
+        "limit": 20,
+    }
+    return httpx.Request("GET", f"{API}/dogs/?{urlencode(params)}")
+
+
+def dog_detail(ctx: Context, rng: random.Random) -> httpx.Request:
+    return httpx.Request("GET", f"{API}/dogs/{rng.choice(ctx.dog_ids)}")
+
+
+def favorites_batch(ctx: Context, rng: random.Random) -> httpx.Request:
+    # A favorites list or shared link: dogs that are not all in the detail cache yet
+    ids = rng.sample(ctx.dog_ids, FAVORITES_SIZE)
+    return httpx.Request("GET", f"{API}/dogs/batch?{urlencode({'ids': ','.join(ids)})}")
+
+
+def create_dog(ctx: Context, rng: random.Random) -> httpx.Request:
+    row = next(make_dogs(1, [None], rng))
+    payload = {field: row[field] for field in DogBase.model_fields if field in row}
+    payload["photos"] = row["photos"]
+    return httpx.Request("POST", f"{API}/dogs/", json=payload, headers=rng.choice(ctx.user_headers))
+
+
+def change_status(ctx: Context, rng: random.Random) -> httpx.Request:
+    # Only between disponible and reservado, so dogs stay usable for the next request
+    dog_id, headers = rng.choice(ctx.owned_dogs)
+    return httpx.Request(
+        "PATCH", f"{API}/dogs/{dog_id}/status",
+        json={"status": rng.choice(["disponible", "reservado"])}, headers=headers
+    )
+
+
+def upload_photo(ctx: Context, rng: random.Random) -> httpx.Request:
+    return httpx.Request(
+        "POST", f"{API}/uploads/photo",
+        files={"file": (f"photo{rng.randrange(1_000_000)}.jpg", ctx.photo, "image/jpeg")},
+        headers=rng.choice(ctx.user_headers)
+    )
+
+
+SCENARIOS: Dict[str, Callable[[Context, random.Random], httpx.Request]] = {
+    "list_filtered": list_filtered,
+    "list_cards": list_cards,
+    "radius_search": radius_search,
+    "dog_detail": dog_detail,
+    "favorites_batch": favorites_batch,
+    "create_dog": create_dog,
+    "change_status": change_status,
+    "upload_photo": upload_photo,
+}
+
+
+async def call(request: httpx.Request) -> Tuple[int, float]:
+    """Run one request through the app; returns (status, seconds until the response was complete)"""
+    body = request.read()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": request.method,
+        "scheme": "http", "path": request.url.path, "raw_path": request.url.raw_path.split(b"?")[0],
+        "root_path": "", "query_string": request.url.query, "server": ("loadtest", 80),
+        "client": ("127.0.0.1", 1),
+        "headers": [(name.lower(), value) for name, value in request.headers.raw],
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    state = {"status": 500, "elapsed": None}
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            state["status"] = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            state["elapsed"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        await app(scope, receive, send)
+    finally:
+        disconnected.set()
+    return state["status"], state["elapsed"] if state["elapsed"] is not None else time.perf_counter() - start
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    return samples[max(0, math.ceil(q * len(samples)) - 1)]
+
+
+async def run_scenario(name: str, ctx: Context, requests: int, concurrency: int, warmup: int, seed: int) -> dict:
+    build = SCENARIOS[name]
+    for i in range(warmup):
+        await call(build(ctx, random.Random(seed - i - 1)))
+
+    queue = iter(range(requests))
+    samples: List[float] = []
+    statuses: Counter = Counter()
+
+    async def worker(worker_id: int):
+        rng = random.Random(seed * 1000 + worker_id)
+        for _ in queue:
+            try:
+                status_code, elapsed = await call(build(ctx, rng))
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+                continue
+            statuses[status_code] += 1
+            samples.append(elapsed * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker(i) for i in range(concurrency)])
+    wall = time.perf_counter() - start
+
+    samples.sort()
+    errors = sum(count for status_code, count in statuses.items() if not isinstance(status_code, int) or status_code >= 400)
+    result = {
+        "scenario": name,
+        "requests": requests,
+        "errors": errors,
+        "statuses": {str(status_code): count for status_code, count in sorted(statuses.items(), key=str)},
+        "rps": round(requests / wall, 1),
+    }
+    if samples:
+        result.update(
+            mean_ms=round(sum(samples) / len(samples), 2),
+            p50_ms=round(percentile(samples, 0.50), 2),
+            p95_ms=round(percentile(samples, 0.95), 2),
+            p99_ms=round(percentile(samples, 0.99), 2),
+            max_ms=round(samples[-1], 2),
+        )
+    return result
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout
+        return f"{commit}-dirty" if dirty.strip() else commit
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: List[dict], baseline: dict) -> None:
+    """Add the change against a previous run's numbers (in %) to each scenario"""
+    previous = {result["scenario"]: result for result in baseline.get("scenarios", [])}
+    for result in results:
+        before = previous.get(result["scenario"])
+        if not before:
+            continue
+        result["vs_baseline"] = {
+            key: round((result[key] - before[key]) / before[key] * 100, 1)
+            for key in ("p50_ms", "p95_ms", "p99_ms", "rps")
+            if before.get(key) and key in result
+        }
+
+
+async def run(args) -> dict:
+    response_cache.enabled = not args.no_cache
+    settings.IMAGE_VARIANTS_ENABLED = settings.IMAGE_VARIANTS_ENABLED and not args.no_variants
+
+    with tempfile.TemporaryDirectory() as media_root:
+        async with app.router.lifespan_context(app):
+            # After startup, so the lifespan's storage close doesn't matter for the swap
+            storage_service.backend = LocalStorageBackend(media_root)
+            ctx = await load_context((args.photo_width, args.photo_height))
+            async with engine.connect() as conn:
+                dogs = (await conn.execute(text("SELECT count(*) FROM dogs"))).scalar()
+
+            results = []
+            for name in args.scenarios:
+                result = await run_scenario(name, ctx, args.requests, args.concurrency, args.warmup, args.seed)
+                print(json.dumps(result, ensure_ascii=False))
+                results.append(result)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "dogs": dogs,
+        "concurrency": args.concurrency,
+        "cache": response_cache.enabled,
+        "image_variants": settings.IMAGE_VARIANTS_ENABLED,
+        "scenarios": results,
+    }
+    if args.baseline:
+        with open(args.baseline) as file:
+            compare(results, json.load(file))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests before each scenario")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-cache", action="store_true", help="Disable the response cache")
+    parser.add_argument("--no-variants", action="store_true", help="Skip image variant rendering after uploads")
+    parser.add_argument("--photo-width", type=int, default=1600)
+    parser.add_argument("--photo-height", type=int, default=1200)
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    # httpx ends multipart bodies with a CRLF that python-multipart warns about on every upload
+    logging.getLogger("python_multipart.multipart").setLevel(logging.ERROR)
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Query budgets per endpoint.
+
+Calls each key endpoint in-process against a seeded database with the
+response cache off, counts the SQL it runs with capture_queries and fails
+(exit status 1) when an endpoint goes over its budget or, with the N+1
+detector, repeats one statement shape more than SQL_REPEATED_QUERY_LIMIT
+times. Budgets are per request and include the current-user lookup; a
+write that takes fewer statements on PostgreSQL has one budget per
+dialect, picked by the dialect of DATABASE_URL.
+
+Usage (from backend/, database seeded with benchmarks.synthetic):
+    python -m benchmarks.query_budgets
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import uuid
+
+import httpx
+from sqlalchemy import text
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import engine
+from app.core.query_stats import capture_queries
+from app.core.security import create_access_token
+from app.main import app
+from app.schemas.dog import DogBase
+from benchmarks.synthetic import make_dogs
+
+API = settings.API_V1_STR
+
+# (method, path template, max queries or {dialect name: max queries, "default": ...})
+BUDGETS = [
+    # Full pages: dogs, their publishers, their photos' stored variants
+    ("GET", "/dogs/?limit=50", 3),
+    ("GET", "/dogs/?province=Cartago&size=grande&limit=50", 3),
+    ("GET", "/dogs/?latitude=9.93&longitude=-84.08&radius_km=25&limit=50", 3),
+    ("GET", "/dogs/?q=labrador", 3),
+    # Card pages carry the publisher's name, no second query
+    ("GET", "/dogs/?view=card&limit=50", 1),
+    ("GET", "/dogs/?view=card&province=Cartago&size=grande&limit=50", 1),
+    ("GET", "/dogs/?view=card&latitude=9.93&longitude=-84.08&radius_km=25&limit=50", 1),
+    ("GET", "/dogs/?view=card&q=labrador", 1),
+    ("GET", "/dogs/facets", 1),
+    ("GET", "/dogs/{dog_id}", 2),
+    ("GET", "/dogs/batch?ids={batch_ids}", 3),
+    ("GET", "/dogs/{dog_id}/history", 2),
+    ("GET", "/users/me/dogs", 2),
+    ("GET", "/users/{publisher_id}/dogs", 2),
+    ("PATCH", "/dogs/{dog_id}/status", 3),
+    # One INSERT with the history and card rows as CTEs on PostgreSQL; dog, history
+    # and card INSERTs elsewhere (app/services/dog_writes.py insert_dog)
+    ("POST", "/dogs/", {"postgresql": 1, "default": 3}),
+    # Moves the dog created above: locking select, UPDATE, history INSERT, card UPDATE
+    ("PATCH", "/dogs/status", 4),
+]
+
+
+def dialect_budget(budget) -> int:
+    if isinstance(budget, dict):
+        return budget.get(engine.dialect.name, budget["default"])
+    return budget
+
+
+def request_body(method: str, path: str, ids: dict):
+    if path == "/dogs/":
+        row = next(make_dogs(1, [None], random.Random(0)))
+        return {**{field: row[field] for field in DogBase.model_fields if field in row}, "photos": row["photos"]}
+    if path == "/dogs/status":
+        return {"ids": [ids["new_dog_id"]], "status": "reservado"}
+    if method == "PATCH":
+        return {"status": "disponible"}
+    return None
+
+
+async def run() -> list:
+    async with app.router.lifespan_context(app):
+        async with engine.connect() as conn:
+            dogs = (await conn.execute(text(
+                "SELECT id, publisher_id FROM dogs WHERE status = 'disponible' LIMIT 100"
+            ))).all()
+        if not dogs:
+            raise SystemExit("No available dogs found; seed the database with benchmarks.synthetic first")
+        dog = dogs[0]
+        ids = {
+            "dog_id": dog.id,
+            "publisher_id": dog.publisher_id,
+            # 100 dogs plus one unknown id
+            "batch_ids": ",".join([*(str(row.id) for row in dogs), str(uuid.uuid4())]),
+        }
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(dog.publisher_id)})}"}
+
+        results = []
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://budgets", headers=headers) as client:
+            # Warm the auth caches so budgets count steady-state requests
+            await client.get(f"{API}/users/me/dogs")
+            for method, path, budget in BUDGETS:
+                budget = dialect_budget(budget)
+                body = request_body(method, path, ids)
+                with capture_queries() as queries:
+                    response = await client.request(method, API + path.format(**ids), json=body)
+                if method == "POST":
+                    ids["new_dog_id"] = response.json()["id"]
+                repeated = queries.repeated(settings.SQL_REPEATED_QUERY_LIMIT)
+                results.append({
+                    "endpoint": f"{method} {path}",
+                    "status": response.status_code,
+                    "queries": queries.count,
+                    "budget": budget,
+                    "db_ms": round(queries.seconds * 1000, 2),
+                    "repeated": repeated,
+                    "ok": response.status_code < 400 and queries.count <= budget and not repeated,
+                })
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    response_cache.enabled = False
+    results = asyncio.run(run())
+    for result in results:
+        print(json.dumps(result, ensure_ascii=False))
+
+    failed = [result["endpoint"] for result in results if not result["ok"]]
+    if failed:
+        print(f"Over budget: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
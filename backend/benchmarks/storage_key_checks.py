@@ -0,0 +1,120 @@
+"""
+Storage key checks for DELETE /uploads/file.
+
+Uploads a photo as one user, with the local storage backend in a temporary
+directory, then tries to delete it through URLs that spell its key with
+dot segments, empty segments or percent-encoded dots, as another user and
+as its owner. Every attempt must be refused (400/403) and leave the photo
+in place; the check exits with status 1 otherwise. Needs two users in the
+database (seed it with benchmarks.synthetic).
+
+Usage (from backend/):
+    python -m benchmarks.storage_key_checks
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import tempfile
+
+import httpx
+from PIL import Image
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.security import create_access_token
+from app.main import app
+from app.services.storage import LocalStorageBackend, storage_service
+
+API = settings.API_V1_STR
+PHOTO_FOLDER = "dogs/photos"
+
+
+def photo_bytes() -> bytes:
+    # Random pixels, so the photo is a new object rather than a re-upload
+    image = Image.frombytes("RGB", (64, 64), os.urandom(64 * 64 * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def attack_urls(owner: str, other: str, name: str) -> dict:
+    """URLs of the owner's photo that do not start with its canonical key"""
+    return {
+        "dot_dot": f"/media/{PHOTO_FOLDER}/{other}/../{owner}/{name}",
+        "encoded_dot_dot": f"/media/{PHOTO_FOLDER}/{other}/%2E%2E/{owner}/{name}",
+        "dot": f"/media/{PHOTO_FOLDER}/{owner}/./{name}",
+        "empty_segment": f"/media/{PHOTO_FOLDER}/{owner}//{name}",
+        "certificate_dot_dot": f"/media/dogs/certificates/../photos/{owner}/{name}",
+    }
+
+
+async def run(root: str) -> list:
+    storage_service.backend = LocalStorageBackend(root, "/media")
+    settings.IMAGE_VARIANTS_ENABLED = False
+
+    async with app.router.lifespan_context(app):
+        async with engine.connect() as conn:
+            user_ids = [str(row.id) for row in (await conn.execute(text("SELECT id FROM users LIMIT 2"))).all()]
+        if len(user_ids) < 2:
+            raise SystemExit("Two users needed; seed the database with benchmarks.synthetic first")
+        owner, other = user_ids
+        headers = {user_id: {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"} for user_id in user_ids}
+
+        results = []
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://checks") as client:
+            response = await client.post(
+                f"{API}/uploads/photo",
+                files={"file": ("photo.jpg", photo_bytes(), "image/jpeg")},
+                headers=headers[owner]
+            )
+            response.raise_for_status()
+            url = response.json()["url"]
+            path = os.path.join(root, url[len("/media/"):])
+            name = os.path.basename(url)
+
+            for user in (other, owner):
+                for attack, attack_url in attack_urls(owner, other, name).items():
+                    response = await client.delete(
+                        f"{API}/uploads/file", params={"file_url": attack_url}, headers=headers[user]
+                    )
+                    results.append({
+                        "attack": attack,
+                        "as": "owner" if user == owner else "other user",
+                        "status": response.status_code,
+                        "photo_kept": os.path.isfile(path),
+                        "ok": response.status_code in (400, 403) and os.path.isfile(path),
+                    })
+
+            response = await client.delete(f"{API}/uploads/file", params={"file_url": url}, headers=headers[owner])
+            results.append({
+                "attack": None,
+                "as": "owner",
+                "status": response.status_code,
+                "photo_kept": os.path.isfile(path),
+                "ok": response.status_code == 200 and not os.path.isfile(path),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        results = asyncio.run(run(root))
+    for result in results:
+        print(json.dumps(result))
+
+    failed = [result for result in results if not result["ok"]]
+    if failed:
+        print(f"{len(failed)} storage key checks failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Synthetic data for benchmarks.
+
+Generates users, dogs and their status history with roughly realistic
+shapes: dogs cluster around Costa Rica's population centres, provinces are
+weighted by population, most listings end up adopted, puppies and mixed
+breeds dominate. Everything, ids included, derives from one seed and
+timestamps count back from a fixed date, so runs are repeatable.
+
+Usage (from backend/, DATABASE_URL pointing to a disposable database):
+    python -m benchmarks.synthetic --dogs 100000 --users 2000 --reset
+"""
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+import argparse
+import random
+import time
+import uuid
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.core.database import Base
+from app.core.migrations import create_schema
+from app.models import User, Dog, DogCard, DogStatusHistory
+from app.services.dog_cards import card_row
+
+# Rough bounding box around Costa Rica
+CR_LAT_RANGE = (8.0, 11.2)
+CR_LON_RANGE = (-85.9, -82.5)
+
+# province: (share of listings, [(lat, lon, spread in degrees), ...] population centres)
+PROVINCE_CENTRES = {
+    "San José": (0.32, [(9.93, -84.08, 0.12), (9.37, -83.70, 0.15)]),
+    "Alajuela": (0.20, [(10.02, -84.21, 0.10), (10.33, -84.43, 0.15), (10.90, -84.70, 0.20)]),
+    "Cartago": (0.11, [(9.86, -83.92, 0.08), (9.90, -83.68, 0.08)]),
+    "Heredia": (0.10, [(10.00, -84.12, 0.06), (10.45, -84.00, 0.12)]),
+    "Guanacaste": (0.08, [(10.63, -85.44, 0.15), (10.15, -85.45, 0.15)]),
+    "Puntarenas": (0.10, [(9.98, -84.83, 0.08), (9.43, -84.16, 0.10), (8.65, -83.20, 0.20)]),
+    "Limón": (0.09, [(10.00, -83.03, 0.10), (9.65, -82.85, 0.12), (10.22, -83.78, 0.12)]),
+}
+PROVINCES = list(PROVINCE_CENTRES)
+
+SIZES = ["pequeño", "mediano", "grande"]
+SIZE_WEIGHTS = [0.35, 0.45, 0.20]
+GENDERS = ["macho", "hembra"]
+STATUSES = ["disponible", "reservado", "adoptado"]
+STATUS_WEIGHTS = [0.30, 0.10, 0.60]
+BREEDS = ["Zaguate", "Labrador", "Pastor Alemán", "Chihuahua", "Poodle", "Beagle", "Husky", "Pitbull"]
+BREED_WEIGHTS = [0.55, 0.08, 0.07, 0.08, 0.06, 0.05, 0.04, 0.07]
+COLORS = ["Negro", "Blanco", "Café", "Dorado", "Gris", "Manchado"]
+NAMES = ["Luna", "Max", "Canela", "Rocky", "Toby", "Nala", "Bruno", "Kira", "Coco", "Lola", "Firulais", "Chispa"]
+DESCRIPTIONS = [
+    "Perro muy cariñoso buscando un hogar.",
+    "Rescatado de la calle, muy juguetón y sociable con otros perros.",
+    "Tranquila, ideal para apartamento. Se lleva bien con gatos.",
+    "Necesita patio grande, le encanta correr y nadar.",
+    "Cachorro lleno de energía, aprende rápido.",
+    "Adulto mayor, dócil y muy agradecido.",
+]
+
+DAY = 24 * 3600
+# Timestamps count back from here rather than from now, so a seed gives the same rows every run
+REFERENCE_TIME = datetime(2026, 1, 1)
+
+
+def weighted_location(rng: random.Random) -> Tuple[str, float, float]:
+    """A province and a point near one of its population centres"""
+    province = rng.choices(PROVINCES, weights=[share for share, _ in PROVINCE_CENTRES.values()])[0]
+    lat, lon, spread = rng.choice(PROVINCE_CENTRES[province][1])
+    latitude = min(max(rng.gauss(lat, spread), CR_LAT_RANGE[0]), CR_LAT_RANGE[1])
+    longitude = min(max(rng.gauss(lon, spread), CR_LON_RANGE[0]), CR_LON_RANGE[1])
+    return province, latitude, longitude
+
+
+def seeded_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def make_users(count: int, rng: random.Random) -> List[dict]:
+    return [
+        {
+            "id": seeded_uuid(rng),
+            "email": f"user{i}-{rng.getrandbits(32):08x}@example.com",
+            "name": f"Usuario {i}",
+            "phone": f"8{rng.randint(0, 9999999):07d}",
+            "location": weighted_location(rng)[0],
+            "created_at": REFERENCE_TIME - timedelta(seconds=rng.randint(365 * DAY, 2 * 365 * DAY)),
+        }
+        for i in range(count)
+    ]
+
+
+def publisher_weights(count: int) -> List[float]:
+    # A few shelters publish most listings; most users publish one or two
+    return [1 / (rank + 1) for rank in range(count)]
+
+
+def make_dogs(count: int, publisher_ids: List[uuid.UUID], rng: random.Random) -> Iterator[dict]:
+    weights = publisher_weights(len(publisher_ids))
+    for i in range(count):
+        created_at = REFERENCE_TIME - timedelta(seconds=rng.randint(0, 365 * DAY))
+        status = rng.choices(STATUSES, weights=STATUS_WEIGHTS)[0]
+        age_since = (REFERENCE_TIME - created_at).total_seconds()
+        adopted_at = created_at + timedelta(seconds=rng.uniform(0, age_since)) if status == "adoptado" else None
+        province, latitude, longitude = weighted_location(rng)
+        yield {
+            "id": seeded_uuid(rng),
+            "name": f"{rng.choice(NAMES)} {i}",
+            "age_years": min(15, int(rng.expovariate(1 / 3.0))),
+            "age_months": rng.randint(0, 11),
+            "breed": rng.choices(BREEDS, weights=BREED_WEIGHTS)[0],
+            "size": rng.choices(SIZES, weights=SIZE_WEIGHTS)[0],
+            "gender": rng.choice(GENDERS),
+            "color": rng.choice(COLORS),
+            "description": rng.choice(DESCRIPTIONS),
+            "vaccinated": rng.random() < 0.7,
+            "sterilized": rng.random() < 0.5,
+            "dewormed": rng.random() < 0.8,
+            "latitude": latitude,
+            "longitude": longitude,
+            "province": province,
+            "contact_phone": "88888888",
+            "photos": ["https://example.com/dogs/photos/sample.jpg"],
+            "status": status,
+            "publisher_id": rng.choices(publisher_ids, weights=weights)[0],
+            "created_at": created_at,
+            "updated_at": adopted_at or created_at,
+            "adopted_at": adopted_at,
+        }
+
+
+def make_history(dog: dict, rng: random.Random) -> List[dict]:
+    """Status changes that lead to the dog's current status"""
+    steps = [(None, "disponible", dog["created_at"])]
+    status = dog["status"]
+    end = dog["adopted_at"] or REFERENCE_TIME
+    if status == "reservado" or (status == "adoptado" and rng.random() < 0.5):
+        reserved_at = dog["created_at"] + (end - dog["created_at"]) * rng.uniform(0.3, 0.9)
+        steps.append(("disponible", "reservado", reserved_at))
+    if status == "adoptado":
+        steps.append((steps[-1][1], "adoptado", dog["adopted_at"]))
+
+    return [
+        {"id": seeded_uuid(rng), "dog_id": dog["id"], "old_status": old, "new_status": new, "changed_at": changed_at}
+        for old, new, changed_at in steps
+    ]
+
+
+def seed(
+    conn: Connection,
+    dogs: int,
+    users: int = 100,
+    seed_value: int = 42,
+    batch_size: int = 5000,
+    history: bool = True
+) -> None:
+    """
+    Insert `users` users, `dogs` dogs with their listing cards and (optionally)
+    their status history using multi-row inserts
+    """
+    rng = random.Random(seed_value)
+
+    user_rows = make_users(users, rng)
+    conn.execute(insert(User), user_rows)
+    publisher_ids = [u["id"] for u in user_rows]
+    publisher_names = {u["id"]: u["name"] for u in user_rows}
+
+    batch, history_batch = [], []
+
+    def flush():
+        conn.execute(insert(Dog), batch)
+        conn.execute(insert(DogCard), [card_row(row, publisher_names[row["publisher_id"]]) for row in batch])
+        if history_batch:
+            conn.execute(insert(DogStatusHistory), history_batch)
+        batch.clear()
+        history_batch.clear()
+
+    for row in make_dogs(dogs, publisher_ids, rng):
+        batch.append(row)
+        if history:
+            history_batch.extend(make_history(row, rng))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dogs", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-history", action="store_true", help="Skip dog_status_history rows")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    if args.reset:
+        Base.metadata.drop_all(engine)
+        with engine.begin() as conn:
+            # Stamped at the Alembic head, so the app's boot-time schema check passes
+            create_schema(conn)
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        seed(conn, dogs=args.dogs, users=args.users, seed_value=args.seed, history=not args.no_history)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+    print(f"Seeded {args.users} users and {args.dogs} dogs in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
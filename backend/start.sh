@@ -11,6 +11,10 @@ python check_env.py || exit 1
 # Run healthcheck
 python healthcheck.py || exit 1
 
+# Migrate once per deploy; workers only check the revision at boot
+echo "Running database migrations..."
+alembic upgrade head || exit 1
+
 # Set default port if not provided
 PORT=${PORT:-8000}
 
@@ -4,6 +4,9 @@
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Trigram matching for misspelled breeds in text search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Enable PostGIS for location queries (optional, for advanced geo queries)
 -- CREATE EXTENSION IF NOT EXISTS postgis;
 
@@ -66,10 +69,26 @@ CREATE TABLE IF NOT EXISTS dogs (
 );
 
 -- Indexes for dogs table
-CREATE INDEX IF NOT EXISTS idx_dogs_status ON dogs(status);
-CREATE INDEX IF NOT EXISTS idx_dogs_publisher ON dogs(publisher_id);
-CREATE INDEX IF NOT EXISTS idx_dogs_province ON dogs(province);
-CREATE INDEX IF NOT EXISTS idx_dogs_created_at ON dogs(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_dogs_location ON dogs(latitude, longitude);
+CREATE INDEX IF NOT EXISTS idx_dogs_available_location ON dogs(latitude, longitude) WHERE status = 'disponible';
+
+-- Keyset pagination indexes: (created_at, id) after each filter combination.
+-- Their prefixes also serve plain status / publisher lookups.
+CREATE INDEX IF NOT EXISTS idx_dogs_created_id ON dogs(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_dogs_status_created_id ON dogs(status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_dogs_status_province_created_id ON dogs(status, province, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_dogs_publisher_created_id ON dogs(publisher_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_dogs_publisher_status_created_id ON dogs(publisher_id, status, created_at, id);
+
+-- Text search (q): weighted Spanish tsvector plus trigrams on breed
+ALTER TABLE dogs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+  setweight(to_tsvector('spanish', coalesce(name, '')), 'A') ||
+  setweight(to_tsvector('spanish', coalesce(breed, '')), 'A') ||
+  setweight(to_tsvector('spanish', coalesce(color, '')), 'B') ||
+  setweight(to_tsvector('spanish', coalesce(description, '')), 'C')
+) STORED;
+CREATE INDEX IF NOT EXISTS idx_dogs_search_vector ON dogs USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS idx_dogs_breed_trgm ON dogs USING gin (breed gin_trgm_ops);
 
 -- Dog status history table
 CREATE TABLE IF NOT EXISTS dog_status_history (
@@ -80,7 +99,46 @@ CREATE TABLE IF NOT EXISTS dog_status_history (
   changed_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_status_history_dog ON dog_status_history(dog_id);
+CREATE INDEX IF NOT EXISTS idx_status_history_dog_changed ON dog_status_history(dog_id, changed_at);
+
+-- Listing read model: what a listing card shows, the publisher's name and
+-- precomputed haversine inputs. The API updates it with every dog write.
+CREATE TABLE IF NOT EXISTS dog_cards (
+  id UUID PRIMARY KEY REFERENCES dogs(id) ON DELETE CASCADE,
+  publisher_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  publisher_name VARCHAR(255) NOT NULL,
+  name VARCHAR(100) NOT NULL,
+  breed VARCHAR(100) NOT NULL,
+  size VARCHAR(20) NOT NULL,
+  gender VARCHAR(10) NOT NULL,
+  age_years INTEGER NOT NULL,
+  age_months INTEGER,
+  province VARCHAR(50),
+  status VARCHAR(20) NOT NULL,
+  photo TEXT,
+  summary VARCHAR(160),
+  latitude FLOAT NOT NULL,
+  longitude FLOAT NOT NULL,
+  lat_rad FLOAT NOT NULL,
+  lon_rad FLOAT NOT NULL,
+  cos_lat FLOAT NOT NULL,
+  created_at TIMESTAMP NOT NULL,
+  updated_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_dog_cards_status_created_id ON dog_cards(status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_dog_cards_status_province_created_id ON dog_cards(status, province, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_dog_cards_available_location ON dog_cards(latitude, longitude) WHERE status = 'disponible';
+CREATE INDEX IF NOT EXISTS idx_dog_cards_publisher ON dog_cards(publisher_id);
+
+-- Rendered variants of uploaded photos; photos without a row are served as is
+CREATE TABLE IF NOT EXISTS photo_variants (
+  photo_url TEXT PRIMARY KEY,
+  thumb TEXT NOT NULL,
+  card TEXT NOT NULL,
+  "full" TEXT NOT NULL,
+  created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
 
 -- Function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -95,26 +153,16 @@ $$ language 'plpgsql';
 CREATE TRIGGER update_dogs_updated_at BEFORE UPDATE ON dogs
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
--- Function to log status changes
-CREATE OR REPLACE FUNCTION log_dog_status_change()
-RETURNS TRIGGER AS $$
-BEGIN
-    IF OLD.status IS DISTINCT FROM NEW.status THEN
-        INSERT INTO dog_status_history (dog_id, old_status, new_status)
-        VALUES (NEW.id, OLD.status, NEW.status);
-
-        -- Set adopted_at when status changes to adoptado
-        IF NEW.status = 'adoptado' AND OLD.status != 'adoptado' THEN
-            NEW.adopted_at = NOW();
-        END IF;
-    END IF;
-    RETURN NEW;
-END;
-$$ language 'plpgsql';
-
--- Trigger to log status changes
-CREATE TRIGGER log_status_change BEFORE UPDATE ON dogs
-    FOR EACH ROW EXECUTE FUNCTION log_dog_status_change();
+-- Status history is written by the API in the same transaction as each change
+-- (no trigger), so bulk updates can log many rows with one INSERT
 
 -- Sample provinces in Costa Rica
 COMMENT ON COLUMN dogs.province IS 'Provincias: San José, Alajuela, Cartago, Heredia, Guanacaste, Puntarenas, Limón';
+
+-- This schema matches the latest Alembic migration; API workers check the
+-- recorded revision at boot instead of creating tables
+CREATE TABLE IF NOT EXISTS alembic_version (
+  version_num VARCHAR(32) NOT NULL,
+  CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num)
+);
+INSERT INTO alembic_version (version_num) VALUES ('b7c2d9e4f1a6') ON CONFLICT DO NOTHING;